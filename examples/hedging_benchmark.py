@@ -0,0 +1,111 @@
+"""
+Tail-latency benchmark of hedged Perplexity queries against the provider stub
+
+Runs the same batch of distinct queries through PerplexityClient with
+hedging off and at each hedge budget, against an in-process stub server
+with log-normal latency, and reports latency percentiles per run:
+
+    python examples/hedging_benchmark.py
+    python examples/hedging_benchmark.py --queries 400 --sigma 1.0 --budgets 0.05 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Every query must reach the stub, without client-side throttling
+os.environ.setdefault("OPENAI_API_KEY", "sk-stub")
+os.environ.setdefault("PERPLEXITY_API_KEY", "pplx-stub")
+os.environ.setdefault("PERPLEXITY_BASE_URL", "http://stub")
+os.environ.setdefault("PERPLEXITY_RPM", "1000000")
+os.environ.setdefault("MAX_CONCURRENT_REQUESTS", "1000")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import httpx
+
+from src.config import settings
+from src.data import http
+from src.data.hedging import HedgePolicy, hedge_budget, hedge_policies
+from src.data.perplexity import PerplexityClient
+from src.data.stub_server import StubConfig, create_app
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def reset_hedging(budget_ratio):
+    """Fresh hedge state so every run warms up from the same point"""
+    settings.hedging_enabled = budget_ratio is not None
+    hedge_budget.ratio = budget_ratio or 0.0
+    hedge_budget.tokens = 1.0
+    hedge_budget.exhausted = 0
+    hedge_policies["perplexity"] = HedgePolicy(
+        "perplexity",
+        hedge_budget,
+        percentile=settings.hedge_percentile,
+        min_samples=settings.hedge_min_samples,
+        window=settings.hedge_latency_window
+    )
+
+
+async def run(args, budget_ratio, run_index):
+    """Send every query once and return per-query latencies in seconds"""
+    reset_hedging(budget_ratio)
+    app = create_app(StubConfig(
+        seed=args.seed, latency_median_ms=args.latency_median_ms, latency_sigma=args.sigma
+    ))
+    # Route the shared HTTP client to the stub without opening a socket
+    http._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+    client = PerplexityClient()
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(i):
+        async with gate:
+            start = time.perf_counter()
+            await client.search(f"best crm software variant {run_index}-{i}", fresh=True)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(args.queries)))
+    await http.close_http_client()
+    return latencies
+
+
+async def main(args):
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{args.queries} queries, median {args.latency_median_ms:.0f}ms, sigma {args.sigma}, "
+          f"concurrency {args.concurrency}")
+    print("=" * 60)
+    print(f"{'hedging':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'hedges':>9}{'wins':>8}")
+    print("-" * 60)
+    for run_index, budget_ratio in enumerate([None] + args.budgets):
+        latencies = await run(args, budget_ratio, run_index)
+        stats = hedge_policies["perplexity"].stats()
+        label = "off" if budget_ratio is None else f"budget {budget_ratio:.0%}"
+        print(
+            f"{label:<16}"
+            + "".join(f"{percentile(latencies, q):>8.2f}s" for q in (0.5, 0.95, 0.99))
+            + f"{stats['hedges']:>9}{stats['hedge_wins']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-median-ms", type=float, default=300.0)
+    parser.add_argument("--sigma", type=float, default=1.0, help="Log-normal latency shape")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[0.05, 0.1],
+                        help="Hedge budget ratios to compare against no hedging")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+"""
+Offline benchmark of the full analysis pipeline using recorded responses
+
+Record once with real API keys:
+    CASSETTE_MODE=record python examples/replay_benchmark.py --runs 1
+
+Replay anywhere, no network or keys needed:
+    CASSETTE_MODE=replay python examples/replay_benchmark.py --runs 5
+    CASSETTE_MODE=replay CASSETTE_REPLAY_TIMING=true python examples/replay_benchmark.py
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Every run must hit the cassette rather than the local response cache
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+os.environ.setdefault("CASSETTE_MODE", "replay")
+if os.environ["CASSETTE_MODE"] == "replay":
+    os.environ.setdefault("OPENAI_API_KEY", "sk-replay")
+    os.environ.setdefault("PERPLEXITY_API_KEY", "pplx-replay")
+
+from src.models.schemas import AnalysisRequest, Platform
+from src.agents.graph_orchestrator import graph_orchestrator
+
+
+async def main(runs: int):
+    """Run the pipeline several times and report per-step timings"""
+    request = AnalysisRequest(
+        query="best crm software",
+        brand_domain="hubspot.com",
+        competitors=["salesforce.com", "pipedrive.com"],
+        platforms=[Platform.CHATGPT, Platform.PERPLEXITY],
+        num_queries=5
+    )
+    
+    totals = []
+    step_samples = {}
+    for run in range(1, runs + 1):
+        start = time.perf_counter()
+        result = await graph_orchestrator.run_analysis(request)
+        elapsed = time.perf_counter() - start
+        totals.append(elapsed)
+        for step, duration in result.step_timings.items():
+            step_samples.setdefault(step, []).append(duration)
+        print(f"Run {run}: {elapsed:.3f}s ({len(result.citations)} citations, {len(result.errors)} errors)")
+    
+    print()
+    print("=" * 60)
+    print(f"{'step':<28}{'median':>10}{'max':>10}")
+    print("-" * 60)
+    for step, samples in step_samples.items():
+        print(f"{step:<28}{statistics.median(samples):>9.3f}s{max(samples):>9.3f}s")
+    print("-" * 60)
+    print(f"{'end-to-end':<28}{statistics.median(totals):>9.3f}s{max(totals):>9.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Number of pipeline runs")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -154,6 +154,7 @@ function AnalysisPage() {
     // Map backend steps to frontend step IDs
     const stepMapping = {
       'planning': 'planning',
+      'planner_reasoning': 'planning',
       'data_collection': 'data_collection',
       'analysis': 'analysis',
       'hypothesis_generation': 'hypothesis',
@@ -167,6 +168,12 @@ function AnalysisPage() {
       data.reasoning_trace.forEach(trace => {
         const stepId = stepMapping[trace.step] || trace.step
         
+        // The planner LLM text arrives after the plan itself; only merge the text
+        if (trace.step === 'planner_reasoning') {
+          updateStep(stepId, { llm_output: trace.llm_output })
+          return
+        }
+        
         const updates = {
           status: trace.status || 'completed',
           duration: trace.duration,
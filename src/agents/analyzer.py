@@ -1,20 +1,45 @@
 """Analyzer agent - analyzes visibility patterns"""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
+import numpy as np
+from src.config import settings
+from src.data.citation_matrix import PLATFORMS, CitationMatrix, first_span_ranks
+from src.data.context_selector import context_selector
+from src.data.sampling import wilson_interval
 from src.models.schemas import (
-    CitationData, VisibilityScore, CompetitorComparison, Platform
+    CitationData, VisibilityScore, CompetitorComparison
 )
 
 
 class AnalyzerAgent:
     """Agent that analyzes visibility patterns"""
     
+    @staticmethod
+    def build_matrix(
+        citations: List[CitationData],
+        brand_domain: str,
+        competitors: List[str]
+    ) -> CitationMatrix:
+        """
+        Citation x domain matrix shared by analyze_visibility and extract_patterns
+        
+        Args:
+            citations: List of citation data
+            brand_domain: Brand domain
+            competitors: Competitor domains
+            
+        Returns:
+            Matrix with the brand column first, then the competitors
+        """
+        return CitationMatrix(citations, [brand_domain] + list(competitors))
+    
     def analyze_visibility(
         self,
         citations: List[CitationData],
         brand_domain: str,
-        competitors: List[str]
+        competitors: List[str],
+        matrix: Optional[CitationMatrix] = None
     ) -> CompetitorComparison:
         """
         Analyze visibility from citations
@@ -23,23 +48,42 @@ class AnalyzerAgent:
             citations: List of citation data
             brand_domain: Brand domain
             competitors: Competitor domains
+            matrix: Matrix from build_matrix for the same inputs (built if omitted)
             
         Returns:
             Competitor comparison analysis
         """
-        # Calculate brand score
-        brand_score = self._calculate_visibility_score(
-            citations, brand_domain
-        )
+        # One columnar pass over the citations, then vectorized scores
+        if matrix is None:
+            matrix = self.build_matrix(citations, brand_domain, competitors)
+        scores = self._visibility_scores(matrix)
+        brand_score = scores[matrix.domain_index[brand_domain]]
         
         # Calculate competitor scores
         competitor_scores = [
-            self._calculate_visibility_score(citations, comp)
-            for comp in competitors
+            scores[matrix.domain_index[comp]]
+            for comp in dict.fromkeys(competitors) if comp != brand_domain
         ]
         
+        return self.compare(brand_score, competitor_scores)
+    
+    @staticmethod
+    def compare(
+        brand_score: VisibilityScore,
+        competitor_scores: List[VisibilityScore]
+    ) -> CompetitorComparison:
+        """
+        Rank competitors and compute the visibility gap
+        
+        Args:
+            brand_score: Brand visibility score
+            competitor_scores: Competitor visibility scores
+            
+        Returns:
+            Competitor comparison analysis
+        """
         # Sort by mention rate
-        competitor_scores.sort(key=lambda x: x.mention_rate, reverse=True)
+        competitor_scores = sorted(competitor_scores, key=lambda x: x.mention_rate, reverse=True)
         
         # Calculate visibility gap
         top_competitor_rate = competitor_scores[0].mention_rate if competitor_scores else 0
@@ -52,66 +96,54 @@ class AnalyzerAgent:
             top_competitor=competitor_scores[0].domain if competitor_scores else None
         )
     
-    def _calculate_visibility_score(
-        self,
-        citations: List[CitationData],
-        domain: str
-    ) -> VisibilityScore:
+    def _visibility_scores(self, matrix: CitationMatrix) -> List[VisibilityScore]:
         """
-        Calculate visibility score for a domain
+        Calculate visibility scores for every domain column of the matrix
+        
+        A domain counts as mentioned in a citation if it has a mention span,
+        is listed in competitors_mentioned, or is the brand of a citation
+        whose query is the brand itself. Positions are list ranks of the
+        first ranked span, falling back to the citation's own position for
+        mentions without a span. When responses were clustered, the dedup
+        rate counts each near-duplicate cluster once (its first response).
         
         Args:
-            citations: List of citations
-            domain: Domain to analyze
+            matrix: Citation x domain matrix
             
         Returns:
-            VisibilityScore
+            VisibilityScore per domain, in matrix column order
         """
-        total_citations = len(citations)
-        mentions = 0
-        positions = []
-        platform_mentions = defaultdict(int)
+        counts = matrix.mention_counts()
+        rates = matrix.mention_rates()
+        intervals = [
+            wilson_interval(int(count), len(matrix), settings.visibility_confidence) for count in counts
+        ]
+        avg_positions = matrix.avg_positions()
+        by_platform = matrix.platform_mentions()
+        dedup_rates = matrix.dedup_mention_rates()
         
-        for citation in citations:
-            # Check if this specific domain is mentioned in the response
-            domain_lower = domain.lower()
-            response_lower = citation.raw_response.lower() if citation.raw_response else ""
-            
-            is_mentioned = (
-                domain_lower in response_lower or
-                domain in citation.competitors_mentioned or
-                (citation.brand_mentioned and domain_lower == citation.query.lower())
+        return [
+            VisibilityScore(
+                domain=domain,
+                total_mentions=int(counts[col]),
+                mention_rate=float(rates[col]),
+                avg_position=avg_positions[col],
+                platforms={
+                    PLATFORMS[code].value: int(by_platform[code, col])
+                    for code in np.flatnonzero(by_platform[:, col])
+                },
+                mention_rate_low=intervals[col][0],
+                mention_rate_high=intervals[col][1],
+                dedup_mention_rate=float(dedup_rates[col]) if dedup_rates is not None else None
             )
-            
-            if is_mentioned:
-                mentions += 1
-                platform_mentions[citation.platform.value] += 1
-                
-                # Try to find position in response
-                if domain_lower in response_lower:
-                    # Calculate approximate position based on where domain appears
-                    position_in_text = response_lower.find(domain_lower)
-                    words_before = response_lower[:position_in_text].split()
-                    estimated_position = len(words_before) // 50 + 1  # Rough estimate
-                    positions.append(estimated_position)
-                elif citation.citation_position:
-                    positions.append(citation.citation_position)
-        
-        mention_rate = mentions / total_citations if total_citations > 0 else 0
-        avg_position = sum(positions) / len(positions) if positions else None
-        
-        return VisibilityScore(
-            domain=domain,
-            total_mentions=mentions,
-            mention_rate=mention_rate,
-            avg_position=avg_position,
-            platforms=dict(platform_mentions)
-        )
+            for col, domain in enumerate(matrix.domains)
+        ]
     
     def extract_patterns(
         self,
         citations: List[CitationData],
-        comparison: CompetitorComparison
+        comparison: CompetitorComparison,
+        matrix: Optional[CitationMatrix] = None
     ) -> Dict[str, Any]:
         """
         Extract patterns from citations
@@ -119,61 +151,89 @@ class AnalyzerAgent:
         Args:
             citations: Citation data
             comparison: Competitor comparison
+            matrix: Matrix from build_matrix for the same citations (built if omitted)
             
         Returns:
             Pattern analysis
         """
+        competitor_domains = [score.domain for score in comparison.competitor_scores]
+        if matrix is None:
+            matrix = self.build_matrix(citations, comparison.brand_score.domain, competitor_domains)
         patterns = {
-            "platform_bias": self._analyze_platform_bias(citations),
-            "position_patterns": self._analyze_positions(citations),
-            "context_patterns": self._analyze_contexts(citations),
-            "competitor_strengths": self._analyze_competitor_strengths(comparison)
+            "platform_bias": self._analyze_platform_bias(matrix),
+            "position_patterns": self._analyze_positions(matrix),
+            "context_patterns": self._analyze_contexts(citations, comparison.brand_score.domain),
+            "competitor_strengths": self._analyze_competitor_strengths(comparison),
+            "prompt_mention_frequency": self._analyze_prompt_frequencies(matrix, competitor_domains)
         }
         
         return patterns
     
-    def _analyze_platform_bias(self, citations: List[CitationData]) -> Dict[str, float]:
+    def _analyze_platform_bias(self, matrix: CitationMatrix) -> Dict[str, float]:
         """Analyze if certain platforms favor certain domains"""
-        platform_stats = defaultdict(lambda: {"total": 0, "mentions": 0})
+        return matrix.platform_brand_rates()
+    
+    def _analyze_prompt_frequencies(
+        self,
+        matrix: CitationMatrix,
+        competitor_domains: List[str]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Mention frequency per prompt and platform across samples
         
-        for citation in citations:
-            platform = citation.platform.value
-            platform_stats[platform]["total"] += 1
-            if citation.brand_mentioned:
-                platform_stats[platform]["mentions"] += 1
+        With samples_per_query > 1 each prompt yields several responses, so
+        visibility becomes a per-prompt probability instead of a boolean.
+        """
+        # One group per (query, platform) pair
+        keys = matrix.query_ids.astype(np.int64) * len(PLATFORMS) + matrix.platform_codes
+        columns = [matrix.domain_index[domain] for domain in competitor_domains]
+        values = np.column_stack([matrix.brand_mentioned, matrix.mentioned[:, columns]])
+        groups, sizes, rates = matrix.group_rates(keys, values)
         
-        return {
-            platform: stats["mentions"] / stats["total"] if stats["total"] > 0 else 0
-            for platform, stats in platform_stats.items()
-        }
+        frequencies = defaultdict(dict)
+        for group, total, row in zip(groups, sizes, rates):
+            query_id, code = divmod(int(group), len(PLATFORMS))
+            frequencies[matrix.queries[query_id]][PLATFORMS[code].value] = {
+                "samples": int(total),
+                "brand_frequency": float(row[0]),
+                "competitor_frequency": {
+                    domain: float(rate) for domain, rate in zip(competitor_domains, row[1:])
+                }
+            }
+        
+        return dict(frequencies)
     
-    def _analyze_positions(self, citations: List[CitationData]) -> Dict[str, Any]:
+    def _analyze_positions(self, matrix: CitationMatrix) -> Dict[str, Any]:
         """Analyze citation positions"""
-        positions = [c.citation_position for c in citations if c.citation_position]
+        positions = matrix.citation_position[~np.isnan(matrix.citation_position)]
         
-        if not positions:
+        if not positions.size:
             return {"average": None, "best": None, "worst": None}
         
         return {
-            "average": sum(positions) / len(positions),
-            "best": min(positions),
-            "worst": max(positions),
+            "average": float(positions.mean()),
+            "best": int(positions.min()),
+            "worst": int(positions.max()),
             "distribution": {
-                "top_3": sum(1 for p in positions if p <= 3),
-                "top_5": sum(1 for p in positions if p <= 5),
-                "beyond_5": sum(1 for p in positions if p > 5)
+                "top_3": int((positions <= 3).sum()),
+                "top_5": int((positions <= 5).sum()),
+                "beyond_5": int((positions > 5).sum())
             }
         }
     
-    def _analyze_contexts(self, citations: List[CitationData]) -> List[str]:
-        """Extract common contexts where brand appears"""
-        contexts = []
-        
-        for citation in citations:
-            if citation.brand_mentioned and citation.context:
-                contexts.append(citation.context)
+    def _analyze_contexts(
+        self,
+        citations: List[CitationData],
+        brand_domain: str
+    ) -> List[str]:
+        """
+        Representative contexts where the brand appears
         
-        return contexts
+        A bounded, deduplicated and diverse sample (see ContextSelector), so
+        the hypothesis prompt stays the same size however many responses
+        were collected.
+        """
+        return [snippet.text for snippet in context_selector.select(citations, brand_domain)]
     
     def _analyze_competitor_strengths(
         self,
@@ -197,4 +257,95 @@ class AnalyzerAgent:
         return strengths
 
 
-
+class VisibilityAggregator:
+    """
+    Running visibility scores, updated as each citation arrives
+    
+    Applies the same mention and position rules as
+    AnalyzerAgent.analyze_visibility, one citation at a time, so a
+    snapshot taken after the last citation equals the batch result.
+    Used during data collection to keep live numbers and to take the
+    visibility computation off the critical path.
+    """
+    
+    def __init__(self, brand_domain: str, competitors: List[str]):
+        """
+        Args:
+            brand_domain: Brand domain
+            competitors: Competitor domains
+        """
+        self.brand_domain = brand_domain
+        self.competitors = [comp for comp in dict.fromkeys(competitors) if comp != brand_domain]
+        self.domains = [brand_domain] + self.competitors
+        self.total = 0
+        self.distinct = 0
+        self.clustered = False
+        self._mentions = dict.fromkeys(self.domains, 0)
+        self._distinct_mentions = dict.fromkeys(self.domains, 0)
+        self._position_sum = dict.fromkeys(self.domains, 0)
+        self._position_count = dict.fromkeys(self.domains, 0)
+        self._platforms = {domain: defaultdict(int) for domain in self.domains}
+    
+    def add(self, citation: CitationData) -> None:
+        """Fold one citation into the running scores"""
+        self.total += 1
+        self.clustered = self.clustered or citation.duplicate_cluster is not None
+        if not citation.near_duplicate:
+            self.distinct += 1
+        span_ranks = first_span_ranks(citation.mentions)
+        query = citation.query.lower()
+        
+        for domain in self.domains:
+            has_span = domain in span_ranks
+            if not (
+                has_span or
+                domain in citation.competitors_mentioned or
+                (citation.brand_mentioned and domain.lower() == query)
+            ):
+                continue
+            
+            self._mentions[domain] += 1
+            if not citation.near_duplicate:
+                self._distinct_mentions[domain] += 1
+            self._platforms[domain][citation.platform] += 1
+            position = span_ranks[domain] if has_span else citation.citation_position
+            if position:
+                self._position_sum[domain] += position
+                self._position_count[domain] += 1
+    
+    def add_many(self, citations: List[CitationData]) -> None:
+        for citation in citations:
+            self.add(citation)
+    
+    def score(self, domain: str) -> VisibilityScore:
+        """Current visibility score for one tracked domain"""
+        mentions = self._mentions[domain]
+        count = self._position_count[domain]
+        low, high = wilson_interval(mentions, self.total, settings.visibility_confidence)
+        return VisibilityScore(
+            domain=domain,
+            total_mentions=mentions,
+            mention_rate=mentions / self.total if self.total else 0.0,
+            avg_position=self._position_sum[domain] / count if count else None,
+            platforms={
+                platform.value: self._platforms[domain][platform]
+                for platform in PLATFORMS if self._platforms[domain][platform]
+            },
+            mention_rate_low=low,
+            mention_rate_high=high,
+            dedup_mention_rate=(
+                self._distinct_mentions[domain] / self.distinct
+                if self.clustered and self.distinct else None
+            )
+        )
+    
+    def counts(self) -> Dict[str, int]:
+        """Citations mentioning each tracked domain so far"""
+        return dict(self._mentions)
+    
+    def snapshot(self) -> CompetitorComparison:
+        """Competitor comparison over the citations seen so far"""
+        return AnalyzerAgent.compare(
+            self.score(self.brand_domain),
+            [self.score(comp) for comp in self.competitors]
+        )
@@ -0,0 +1,254 @@
+"""
+Batch tracking runs - scheduled ChatGPT visibility collection via batch jobs
+
+Writes every distinct prompt of a tracking run to one JSONL batch job,
+submits it, polls for completion and feeds the answers through the usual
+citation extraction and AnalyzerAgent. Prompts do not depend on the brand,
+so targets sharing a query variation share one batch line. Only ChatGPT is collected
+this way; Perplexity has no batch endpoint.
+
+    python -m src.agents.batch_tracker run targets.json --backend local
+    python -m src.agents.batch_tracker submit targets.json
+    python -m src.agents.batch_tracker collect <run_id>
+
+`targets.json` is a list of AnalysisRequest objects
+(query, brand_domain, competitors, num_queries, samples_per_query).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.agents.analyzer import AnalyzerAgent
+from src.agents.planner import PlannerAgent
+from src.config import settings
+from src.data.batch import build_chat_request, get_batch_backend, write_batch_file
+from src.data.cache import make_cache_key, response_cache
+from src.data.openai_client import OpenAIClient
+from src.models.schemas import AnalysisRequest, CitationData
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTracker:
+    """Runs tracking analyses for many targets as a single batch job"""
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend_name = backend or settings.batch_backend
+        self.backend = get_batch_backend(self.backend_name)
+        self.openai_client = OpenAIClient()
+        self.analyzer = AnalyzerAgent()
+
+    def _run_dir(self, run_id: str) -> str:
+        return os.path.join(settings.batch_dir, run_id)
+
+    def _load_manifest(self, run_id: str) -> Dict[str, Any]:
+        with open(os.path.join(self._run_dir(run_id), "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        with open(os.path.join(self._run_dir(manifest["run_id"]), "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    async def submit(self, targets: List[AnalysisRequest]) -> str:
+        """
+        Write the batch input for all targets and submit it
+
+        Args:
+            targets: Tracking targets (query, brand, competitors, num_queries, samples)
+
+        Returns:
+            Run ID used to collect the results later
+        """
+        run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        run_dir = self._run_dir(run_id)
+
+        requests = []
+        items: Dict[str, Dict[str, Any]] = {}
+        # One line per (query, samples); the model is fixed for the whole run
+        custom_ids: Dict[Tuple[str, int], str] = {}
+        for target_idx, target in enumerate(targets):
+            queries = PlannerAgent._generate_query_variations(target.query)[:target.num_queries]
+            for query in queries:
+                key = (query, target.samples_per_query)
+                custom_id = custom_ids.get(key)
+                if custom_id is None:
+                    custom_id = custom_ids[key] = f"p{len(custom_ids)}"
+                    requests.append(build_chat_request(
+                        custom_id,
+                        self.openai_client.model,
+                        self.openai_client.SEARCH_SYSTEM_PROMPT,
+                        query,
+                        self.openai_client.SEARCH_TEMPERATURE,
+                        self.openai_client.SEARCH_MAX_TOKENS,
+                        samples=target.samples_per_query
+                    ))
+                    items[custom_id] = {"query": query, "samples": target.samples_per_query, "targets": []}
+                items[custom_id]["targets"].append(target_idx)
+
+        input_path = write_batch_file(os.path.join(run_dir, "input.jsonl"), requests)
+        batch_id = await self.backend.submit(input_path, metadata={"run_id": run_id})
+
+        self._save_manifest({
+            "run_id": run_id,
+            "backend": self.backend_name,
+            "batch_id": batch_id,
+            "model": self.openai_client.model,
+            "created_at": datetime.now().isoformat(),
+            "targets": [target.model_dump(mode="json") for target in targets],
+            "items": items
+        })
+
+        logger.info(f"📦 Tracking run {run_id}: {len(requests)} prompts for {len(targets)} targets")
+        return run_id
+
+    async def collect(
+        self,
+        run_id: str,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Wait for a submitted run and analyze its results
+
+        Args:
+            run_id: Run ID returned by submit()
+            poll_interval: Seconds between status polls
+            timeout: Give up waiting after this many seconds
+
+        Returns:
+            Run report with per-target comparison, patterns and errors
+        """
+        manifest = self._load_manifest(run_id)
+        status = await self.backend.wait(manifest["batch_id"], poll_interval, timeout)
+        results = await self.backend.results(manifest["batch_id"]) if status["status"] == "completed" else {}
+
+        targets = [AnalysisRequest(**target) for target in manifest["targets"]]
+        citations: Dict[int, List[CitationData]] = {idx: [] for idx in range(len(targets))}
+        errors: Dict[int, List[Dict[str, Any]]] = {idx: [] for idx in range(len(targets))}
+
+        for custom_id, item in manifest["items"].items():
+            result = results.get(custom_id)
+            if result is None or "error" in result:
+                for target_idx in item["targets"]:
+                    errors[target_idx].append({
+                        "query": item["query"],
+                        "error": (result or {}).get("error") or f"batch {status['status']}: no result"
+                    })
+                continue
+
+            contents = result["contents"]
+            if settings.response_cache_enabled and any(contents):
+                # Warm the interactive path with the batch answers
+                cache_key = make_cache_key(
+                    "chatgpt", manifest["model"], self.openai_client.SEARCH_SYSTEM_PROMPT, item["query"],
+                    self.openai_client.SEARCH_TEMPERATURE, self.openai_client.SEARCH_MAX_TOKENS,
+                    n=item["samples"]
+                )
+                await response_cache.set(cache_key, contents)
+
+            # The same answers are scored for every target that asked this prompt
+            for target_idx in item["targets"]:
+                target = targets[target_idx]
+                citations[target_idx].extend(
+                    self.openai_client.extract_citations(
+                        content, item["query"], target.brand_domain, target.competitors, sample_index=idx
+                    )
+                    for idx, content in enumerate(contents)
+                )
+
+        report_targets = []
+        for idx, target in enumerate(targets):
+            target_citations = citations[idx]
+            entry: Dict[str, Any] = {
+                "query": target.query,
+                "brand_domain": target.brand_domain,
+                "competitors": target.competitors,
+                "citations_collected": len(target_citations),
+                "errors": errors[idx]
+            }
+            if target_citations:
+                matrix = self.analyzer.build_matrix(target_citations, target.brand_domain, target.competitors)
+                comparison = self.analyzer.analyze_visibility(
+                    target_citations, target.brand_domain, target.competitors, matrix=matrix
+                )
+                entry["comparison"] = comparison.model_dump(mode="json")
+                entry["patterns"] = self.analyzer.extract_patterns(target_citations, comparison, matrix=matrix)
+            report_targets.append(entry)
+
+        report = {
+            "run_id": run_id,
+            "batch_id": manifest["batch_id"],
+            "backend": manifest["backend"],
+            "batch_status": status["status"],
+            "request_counts": status.get("request_counts"),
+            "completed_at": datetime.now().isoformat(),
+            "targets": report_targets
+        }
+        with open(os.path.join(self._run_dir(run_id), "report.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+
+        logger.info(
+            f"✅ Tracking run {run_id} collected: "
+            f"{sum(len(c) for c in citations.values())} citations, "
+            f"{sum(len(e) for e in errors.values())} failed prompts"
+        )
+        return report
+
+    async def run(
+        self,
+        targets: List[AnalysisRequest],
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Submit a tracking run and wait for its report"""
+        run_id = await self.submit(targets)
+        return await self.collect(run_id, poll_interval, timeout)
+
+
+def _load_targets(path: str) -> List[AnalysisRequest]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [AnalysisRequest(**target) for target in json.load(f)]
+
+
+async def _main(args: argparse.Namespace) -> None:
+    tracker = BatchTracker(backend=args.backend)
+    if args.command == "submit":
+        run_id = await tracker.submit(_load_targets(args.path))
+        print(run_id)
+        return
+
+    if args.command == "collect":
+        report = await tracker.collect(args.path, args.poll_interval, args.timeout)
+    else:
+        report = await tracker.run(_load_targets(args.path), args.poll_interval, args.timeout)
+
+    print(f"\n📦 Run {report['run_id']} ({report['batch_status']})")
+    for target in report["targets"]:
+        brand = target.get("comparison", {}).get("brand_score", {})
+        print(
+            f"   {target['brand_domain']:<25} '{target['query']}': "
+            f"mention rate {brand.get('mention_rate', 0.0):.0%} "
+            f"({target['citations_collected']} responses, {len(target['errors'])} errors)"
+        )
+    print(f"   Report: {os.path.join(settings.batch_dir, report['run_id'], 'report.json')}")
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Batch ChatGPT tracking runs")
+    parser.add_argument("command", choices=["run", "submit", "collect"])
+    parser.add_argument("path", help="targets.json for run/submit, run ID for collect")
+    parser.add_argument("--backend", choices=["openai", "local"], default=None)
+    parser.add_argument("--poll-interval", type=float, default=None)
+    parser.add_argument("--timeout", type=float, default=None, help="Max seconds to wait")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,8 @@ Implements Reflexion pattern for multi-agent system improvement
 
 from typing import List, Dict, Any
 import logging
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from src.config import settings
+from src.agents.llm import create_chat_llm
 from src.models.schemas import Hypothesis, Recommendation, CitationData
 import json
 
@@ -29,11 +28,7 @@ class EvaluatorAgent:
     """
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.default_model,
-            temperature=0.3,  # Lower for evaluation
-            api_key=settings.openai_api_key
-        )
+        self.llm = create_chat_llm(temperature=0.3)  # Lower for evaluation
         
         self.hypothesis_evaluator_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a critical evaluator of AI-generated hypotheses.
@@ -390,6 +385,15 @@ Expected Outcome: {expected_outcome}""")
         summary += f"- Brand mentions: {sum(1 for c in citations if c.brand_mentioned)}\n"
         summary += f"- Competitor mentions: {sum(len(c.competitors_mentioned) for c in citations)}"
         
+        # Responses mentioning each domain, from the spans extracted at collection
+        domain_counts = {}
+        for c in citations:
+            for domain in {span.domain for span in c.mentions}:
+                domain_counts[domain] = domain_counts.get(domain, 0) + 1
+        if domain_counts:
+            ranked = sorted(domain_counts.items(), key=lambda item: item[1], reverse=True)
+            summary += f"\n- Responses mentioning: {', '.join(f'{k}: {v}' for k, v in ranked)}"
+        
         return summary
     
     def _generate_critique(self, hypotheses: List[Hypothesis]) -> str:
@@ -3,13 +3,13 @@ Multi-Agent Orchestrator using LangGraph for Parallel Execution
 This module implements a transparent, parallel multi-agent system
 """
 
-from typing import Dict, Any, List, TypedDict, Annotated
+from typing import Dict, Any, List, Optional, TypedDict, Annotated
 from datetime import datetime
 import uuid
 import asyncio
 import logging
 import time
-from operator import add
+from operator import add, or_
 
 from langgraph.graph import StateGraph, END
 
@@ -20,16 +20,22 @@ def merge_dicts(left: Dict, right: Dict) -> Dict:
     if right:
         result.update(right)
     return result
+from src.config import settings
 from src.models.schemas import (
     AnalysisRequest, AnalysisResult, CitationData
 )
 from src.agents.planner import PlannerAgent
-from src.agents.analyzer import AnalyzerAgent
-from src.agents.hypothesis import HypothesisAgent
+from src.agents.analyzer import AnalyzerAgent, VisibilityAggregator
+from src.agents.hypothesis import HypothesisAgent, HypothesisStream
 from src.agents.recommender import RecommenderAgent
 from src.agents.evaluator import EvaluatorAgent, ReflexionMetrics
-from src.data.openai_client import OpenAIClient
-from src.data.perplexity import PerplexityClient
+from src.data.collectors import collector_registry
+from src.data.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.data.discovery import discovery_tracker
+from src.data.near_duplicates import new_duplicate_clusters
+from src.data.resilience import describe_error
+from src.data.sampling import SequentialSampler
+from src.data.source_index import source_index
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,7 @@ class AgentState(TypedDict):
     request: AnalysisRequest
     analysis_id: str
     start_time: float
+    deadline: Optional[Deadline]  # Time budget for the whole analysis (None = unbounded)
     
     # Intermediate results
     plan: Dict[str, Any]
@@ -66,6 +73,11 @@ class AgentState(TypedDict):
     
     # Evaluation results (Reflexion)
     evaluation_metrics: Dict[str, Any]  # Quality scores and improvements
+    
+    # Deadline outcome
+    coverage: Dict[str, Any]  # Planned vs completed platform queries
+    partial: Annotated[bool, or_]  # Set by any step cut short by the deadline
+    skipped_steps: Annotated[List[str], add]  # Steps skipped or cut off by the deadline
 
 
 class MultiAgentOrchestrator:
@@ -80,16 +92,17 @@ class MultiAgentOrchestrator:
                           ▼
     ┌─────────────────────────────────────────────────────────┐
     │              STEP 1: PLANNING                           │
-    │  PlannerAgent: Create analysis strategy                 │
+    │  PlannerAgent: Deterministic plan; the LLM rationale    │
+    │  runs in the background until synthesis                 │
     └─────────────────────┬───────────────────────────────────┘
                           │
                           ▼
     ┌─────────────────────────────────────────────────────────┐
     │         STEP 2: PARALLEL DATA COLLECTION                │
     │  ┌──────────────┐  ┌──────────────┐                    │
-    │  │  ChatGPT     │  │  Perplexity  │  (Parallel)        │
-    │  │  Collector   │  │  Collector   │                    │
-    │  └──────────────┘  └──────────────┘                    │
+    │  │  ChatGPT     │  │  Perplexity  │  (Parallel, one    │
+    │  │  Collector   │  │  Collector   │   per registered   │
+    │  └──────────────┘  └──────────────┘   platform)        │
     └─────────────────────┬───────────────────────────────────┘
                           │
                           ▼
@@ -118,8 +131,16 @@ class MultiAgentOrchestrator:
         self.hypothesis_agent = HypothesisAgent()
         self.recommender = RecommenderAgent()
         self.evaluator = EvaluatorAgent()  # NEW: Self-critique agent
-        self.openai_client = OpenAIClient()
-        self.perplexity_client = PerplexityClient()
+        self.collectors = collector_registry
+        
+        # Running visibility scores of analyses currently collecting data
+        self.live_analyses: Dict[str, VisibilityAggregator] = {}
+        
+        # Planner LLM calls running alongside the rest of the graph, joined at synthesis
+        self.planner_reasoning: Dict[str, asyncio.Task] = {}
+        
+        # Hypotheses streamed to the recommender in pipelined mode
+        self.hypothesis_streams: Dict[str, HypothesisStream] = {}
         
         # Build the graph
         self.graph = self._build_graph()
@@ -150,6 +171,8 @@ class MultiAgentOrchestrator:
         workflow.add_node("synthesis", self._synthesis_node)
         
         # Define edges (execution order)
+        # Planning returns the deterministic plan at once; its LLM rationale
+        # runs as a background task joined in synthesis, off the critical path
         workflow.set_entry_point("planning")
         workflow.add_edge("planning", "data_collection")
         workflow.add_edge("data_collection", "analysis")
@@ -187,6 +210,8 @@ class MultiAgentOrchestrator:
         """
         analysis_id = str(uuid.uuid4())
         start_time = time.time()
+        deadline_ms = request.deadline_ms or settings.default_deadline_ms
+        deadline = Deadline(deadline_ms) if deadline_ms else None
         
         logger.info("="*80)
         logger.info(f"STARTING PARALLEL MULTI-AGENT ANALYSIS | ID: {analysis_id}")
@@ -194,6 +219,8 @@ class MultiAgentOrchestrator:
         logger.info(f"Brand: {request.brand_domain}")
         logger.info(f"Competitors: {', '.join(request.competitors)}")
         logger.info(f"Platforms: {', '.join([p.value for p in request.platforms])}")
+        if deadline:
+            logger.info(f"Deadline: {deadline_ms}ms")
         logger.info("="*80)
         
         # Initialize state
@@ -201,6 +228,7 @@ class MultiAgentOrchestrator:
             "request": request,
             "analysis_id": analysis_id,
             "start_time": start_time,
+            "deadline": deadline,
             "plan": {},
             "citations": [],
             "comparison": None,
@@ -213,12 +241,16 @@ class MultiAgentOrchestrator:
             "data_flow": [],
             "step_timings": {},
             "errors": [],
-            "evaluation_metrics": {}
+            "evaluation_metrics": {},
+            "coverage": {},
+            "partial": False,
+            "skipped_steps": []
         }
         
-        # Execute the graph
+        # Execute the graph; upstream calls see the deadline through the context
         try:
-            final_state = await self.graph.ainvoke(initial_state)
+            with deadline_scope(deadline):
+                final_state = await self.graph.ainvoke(initial_state)
             
             total_time = time.time() - start_time
             logger.info("="*80)
@@ -246,12 +278,55 @@ class MultiAgentOrchestrator:
             result.step_timings = final_state["step_timings"]
             result.errors = final_state["errors"]
             result.evaluation_metrics = final_state.get("evaluation_metrics", {})
+            result.partial = final_state.get("partial", False)
+            result.coverage = {
+                **final_state.get("coverage", {}),
+                "skipped_steps": final_state.get("skipped_steps", [])
+            }
+            if result.partial:
+                logger.warning(f"⏱️  Analysis {analysis_id} returned a partial result (deadline)")
+            
+            # Feed the discovery sketches and report untracked frequent entities
+            if settings.discovery_enabled:
+                discovery_tracker.observe(request.query, result.citations)
+                result.discovered_competitors = discovery_tracker.discovered(
+                    request.query,
+                    tracked=[request.brand_domain] + request.competitors,
+                    limit=settings.discovery_results
+                )
+                await discovery_tracker.save()
+            
+            # Index which source domains each platform cited for this query
+            if settings.source_index_enabled:
+                await source_index.record(result.citations)
             
             return result
             
         except Exception as e:
             logger.error(f"Analysis failed: {str(e)}", exc_info=True)
             raise
+        finally:
+            self.live_analyses.pop(analysis_id, None)
+            reasoning_task = self.planner_reasoning.pop(analysis_id, None)
+            if reasoning_task is not None:
+                reasoning_task.cancel()
+            self.hypothesis_streams.pop(analysis_id, None)
+    
+    def live_snapshots(self) -> Dict[str, Any]:
+        """
+        Visibility so far for every analysis still in progress
+        
+        Returns:
+            Analysis ID -> citations seen and current competitor comparison
+        """
+        return {
+            analysis_id: {
+                "brand": aggregator.brand_domain,
+                "citations_seen": aggregator.total,
+                "comparison": aggregator.snapshot().model_dump()
+            }
+            for analysis_id, aggregator in list(self.live_analyses.items())
+        }
     
     async def _planning_node(self, state: AgentState) -> Dict[str, Any]:
         """
@@ -263,7 +338,9 @@ class MultiAgentOrchestrator:
         3. Selects platforms to query
         4. Creates execution plan
         
-        This node is SEQUENTIAL (must complete before data collection)
+        The plan itself is deterministic, so data collection starts right
+        away; the planner LLM rationale runs as a background task and is
+        merged into the trace at synthesis.
         """
         step_start = time.time()
         analysis_id = state["analysis_id"]
@@ -290,8 +367,13 @@ class MultiAgentOrchestrator:
             ]
         }
         
-        # Execute planning
-        plan = await self.planner.create_plan(state["request"])
+        # Planner LLM in the background, bounded by its share of the deadline
+        deadline = state.get("deadline")
+        self.planner_reasoning[analysis_id] = asyncio.ensure_future(self._within_deadline(
+            self.planner.reason(state["request"]),
+            deadline.share(settings.deadline_planning_share) if deadline else None
+        ))
+        plan = self.planner.build_plan(state["request"], "Planner reasoning in progress")
         
         duration = time.time() - step_start
         reasoning["output"] = {
@@ -299,11 +381,11 @@ class MultiAgentOrchestrator:
             "platforms": [p.value for p in plan["platforms"]],
             "estimated_queries": plan["num_queries"]
         }
-        reasoning["llm_output"] = plan.get("reasoning", "Planning complete")  # Include LLM output
+        reasoning["llm_output"] = plan["reasoning"]
         reasoning["duration"] = duration
         reasoning["status"] = "completed"
         
-        logger.info(f"[{analysis_id}] ✓ Plan created in {duration:.2f}s")
+        logger.info(f"[{analysis_id}] ✓ Plan created in {duration:.2f}s (LLM reasoning running concurrently)")
         logger.info(f"[{analysis_id}]   - Query variations: {len(plan['query_variations'])}")
         logger.info(f"[{analysis_id}]   - Platforms: {len(plan['platforms'])}")
         
@@ -322,6 +404,66 @@ class MultiAgentOrchestrator:
             "step_timings": {"planning": duration}
         }
     
+    async def _join_planner_reasoning(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Wait for the background planner LLM call and merge its output
+        
+        Args:
+            state: Graph state
+            
+        Returns:
+            State update with the plan's reasoning and a planner_reasoning trace entry
+        """
+        analysis_id = state["analysis_id"]
+        task = self.planner_reasoning.pop(analysis_id, None)
+        if task is None:
+            return {}
+        
+        step_start = time.time()
+        remaining = self._remaining(state)
+        error = None
+        try:
+            if task.done():
+                text, cut_off = task.result()
+            elif remaining is not None and remaining <= 0:
+                task.cancel()
+                text, cut_off = None, True
+            else:
+                # wait_for cancels the task if the remaining budget runs out
+                text, cut_off = await asyncio.wait_for(task, timeout=remaining)
+        except asyncio.TimeoutError:
+            text, cut_off = None, True
+        except Exception as e:
+            logger.warning(f"[{analysis_id}] Planner reasoning failed: {e}")
+            text, cut_off, error = None, False, e
+        
+        if cut_off:
+            logger.warning(f"[{analysis_id}] ⏱️  Planner reasoning cut off by deadline")
+            text = "Planning skipped (deadline)"
+        elif error is not None:
+            text = "Planner reasoning unavailable"
+        
+        update: Dict[str, Any] = {
+            "plan": {**state["plan"], "reasoning": text},
+            "reasoning_trace": [{
+                "step": "planner_reasoning",
+                "agent": "PlannerAgent",
+                "timestamp": datetime.now().isoformat(),
+                "process": "Planner LLM rationale, generated concurrently with data collection",
+                "llm_output": text,
+                "waited": time.time() - step_start,
+                "status": "deadline_exceeded" if cut_off else ("failed" if error else "completed")
+            }],
+            **self._deadline_outcome("planning", cut_off)
+        }
+        if error is not None:
+            update["errors"] = [{
+                "step": "planning",
+                **describe_error(error),
+                "timestamp": datetime.now().isoformat()
+            }]
+        return update
+    
     async def _data_collection_node(self, state: AgentState) -> Dict[str, Any]:
         """
         Data Collection Node - Parallel query execution
@@ -366,44 +508,180 @@ class MultiAgentOrchestrator:
             "concurrency_level": total_queries
         }
         
-        # Create parallel tasks
-        tasks = []
+        # Registered, configured collector per platform
+        collectors = {}
+        unavailable = []
+        for platform in plan["platforms"]:
+            collector = collector_registry.get(platform)
+            if collector is None or not collector.available():
+                unavailable.append(platform.value)
+                logger.warning(f"[{analysis_id}]   - No configured collector for {platform.value}, skipping")
+                continue
+            collectors[platform] = collector
+        
+        running = []
         task_metadata = []
-        
-        for query in queries_to_test:
-            for platform in plan["platforms"]:
-                if platform.value == "chatgpt":
-                    tasks.append(self._query_chatgpt(
-                        query, plan["brand"], plan["competitors"]
-                    ))
-                    task_metadata.append({"platform": "chatgpt", "query": query})
-                elif platform.value == "perplexity":
-                    tasks.append(self._query_perplexity(
-                        query, plan["brand"], plan["competitors"]
-                    ))
-                    task_metadata.append({"platform": "perplexity", "query": query})
-        
-        # Execute all in parallel (with semaphore to limit concurrency)
-        logger.info(f"[{analysis_id}]   - Parallel execution started with concurrency limit...")
-        
-        # Limit concurrent requests to avoid rate limiting
-        semaphore = asyncio.Semaphore(5)  # Max 5 concurrent requests
-        
-        async def limited_task(task):
-            async with semaphore:
-                return await task
-        
-        limited_tasks = [limited_task(task) for task in tasks]
-        results = await asyncio.gather(*limited_tasks, return_exceptions=True)
+        task_platform = {}
+        
+        def launch(platform, query, fresh):
+            collector = collectors[platform]
+            running.append(asyncio.ensure_future(collector.collect(
+                query, plan["brand"], plan["competitors"],
+                fresh=fresh,
+                samples=plan.get("samples_per_query", 1)
+            )))
+            task_platform[running[-1]] = platform
+            task_metadata.append({
+                "platform": platform.value,
+                "query": query,
+                "cost": collector.COST_PER_CALL
+            })
+        
+        # Near-duplicate clusters of the responses (effective sample size)
+        clusters = new_duplicate_clusters() if settings.dedup_enabled else None
+        
+        # Adaptive mode issues (query, platform) calls in waves until the
+        # mention-rate intervals converge; saturation mode starts a few
+        # variations per platform and queues the rest until answers repeat;
+        # otherwise every call starts at once
+        request = state["request"]
+        sampler = None
+        saturating = request.skip_saturated_variations and clusters is not None and not request.adaptive_sampling
+        remaining_variations = {}
+        duplicate_runs = {}
+        saturated = []
+        if request.adaptive_sampling:
+            sampler = SequentialSampler(
+                [(platform, query) for query in queries_to_test for platform in collectors],
+                wave_size=settings.adaptive_wave_size,
+                max_calls=request.max_platform_calls or settings.adaptive_max_calls,
+                target_width=request.target_interval_width or settings.adaptive_target_width,
+                confidence=settings.visibility_confidence
+            )
+            for (platform, query), repeat in sampler.next_wave():
+                # Repeats bypass the cache and single-flight to draw a new sample
+                launch(platform, query, plan.get("fresh", False) or repeat)
+        elif saturating:
+            for platform in collectors:
+                remaining_variations[platform] = list(queries_to_test)
+                duplicate_runs[platform] = 0
+                for _ in range(max(1, settings.dedup_initial_variations)):
+                    if remaining_variations[platform]:
+                        launch(platform, remaining_variations[platform].pop(0), plan.get("fresh", False))
+        else:
+            for platform in collectors:
+                for query in queries_to_test:
+                    launch(platform, query, plan.get("fresh", False))
+        
+        # Execute all in parallel; concurrency and RPM/TPM budgets are enforced
+        # by the process-wide per-provider rate limiters shared across analyses
+        logger.info(f"[{analysis_id}]   - Parallel execution started (provider rate limits apply)...")
+        
+        # With a deadline, stop waiting once collection has used its share of the
+        # budget, cancel whatever is still outstanding and continue with what we have
+        deadline = state.get("deadline")
+        collection_timeout = deadline.share(settings.deadline_collection_share) if deadline else None
+        cancelled = 0
+        
+        # Fold citations into the running visibility scores as each task finishes
+        aggregator = VisibilityAggregator(plan["brand"], plan["competitors"])
+        self.live_analyses[analysis_id] = aggregator
+        if running:
+            stop_at = time.monotonic() + collection_timeout if collection_timeout is not None else None
+            pending = set(running)
+            while pending:
+                wait_for = max(0.0, stop_at - time.monotonic()) if stop_at is not None else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                launched = len(running)
+                for task in done:
+                    succeeded = not task.cancelled() and task.exception() is None
+                    if succeeded:
+                        new_citations = task.result()
+                        if clusters is not None:
+                            duplicates = [clusters.add(citation) for citation in new_citations]
+                            platform = task_platform[task]
+                            if platform in duplicate_runs:
+                                duplicate_runs[platform] = (
+                                    duplicate_runs[platform] + 1 if duplicates and all(duplicates) else 0
+                                )
+                        aggregator.add_many(new_citations)
+                    
+                    # Saturation mode: the next variation, unless answers keep repeating
+                    platform = task_platform[task]
+                    if saturating and remaining_variations.get(platform):
+                        if duplicate_runs[platform] >= settings.dedup_saturation_run:
+                            saturated.append({
+                                "platform": platform.value,
+                                "variations_skipped": remaining_variations.pop(platform)
+                            })
+                            logger.info(
+                                f"[{analysis_id}]   - {platform.value} answers saturated, "
+                                f"skipping {len(saturated[-1]['variations_skipped'])} variations"
+                            )
+                        else:
+                            launch(platform, remaining_variations[platform].pop(0), plan.get("fresh", False))
+                pending |= set(running[launched:])
+                logger.debug(
+                    f"[{analysis_id}]   - {len(running) - len(pending)}/{len(running)} queries done, "
+                    f"brand visibility so far {aggregator.score(plan['brand']).mention_rate*100:.1f}%"
+                )
+                
+                # Wave finished: sample more unless every interval is narrow enough
+                if not pending and sampler is not None and not sampler.converged(
+                    aggregator.counts(), aggregator.total
+                ):
+                    launched = len(running)
+                    for (platform, query), repeat in sampler.next_wave():
+                        launch(platform, query, plan.get("fresh", False) or repeat)
+                    pending = set(running[launched:])
+                    if pending:
+                        logger.info(
+                            f"[{analysis_id}]   - Wave {sampler.waves}: {len(pending)} more calls "
+                            f"({aggregator.total} responses so far)"
+                        )
+            if pending:
+                cancelled = len(pending)
+                logger.warning(
+                    f"[{analysis_id}] ⏱️  Deadline reached - cancelling {cancelled} outstanding queries"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        results = [
+            DeadlineExceeded("cancelled at analysis deadline") if task.cancelled()
+            else task.exception() or task.result()
+            for task in running
+        ]
         
         # Process results
         citations = []
         successful = 0
-        failed = 0
-        errors = []
+        failed = len(unavailable) * len(queries_to_test)
+        errors = [
+            {
+                "step": "data_collection",
+                "platform": platform,
+                "query": None,
+                "error": f"No collector configured for {platform} (missing API key?)",
+                "error_type": "CollectorUnavailable",
+                "retryable": False,
+                "attempts": 0,
+                "circuit_open": False,
+                "timestamp": datetime.now().isoformat()
+            }
+            for platform in unavailable
+        ]
         
         for idx, (result, metadata) in enumerate(zip(results, task_metadata)):
-            if isinstance(result, CitationData):
+            if isinstance(result, list):
+                # Multi-sample queries fan out into one citation per sample
+                citations.extend(result)
+                successful += 1
+            elif isinstance(result, CitationData):
                 citations.append(result)
                 successful += 1
             else:
@@ -412,7 +690,7 @@ class MultiAgentOrchestrator:
                     "step": "data_collection",
                     "platform": metadata["platform"],
                     "query": metadata["query"],
-                    "error": str(result) if isinstance(result, Exception) else "Unknown error",
+                    **(describe_error(result) if isinstance(result, Exception) else {"error": "Unknown error"}),
                     "timestamp": datetime.now().isoformat()
                 }
                 errors.append(error_detail)
@@ -420,32 +698,73 @@ class MultiAgentOrchestrator:
         
         duration = time.time() - step_start
         
+        if sampler is not None or saturating:
+            # Planned calls are whatever the waves (or unsaturated variations) actually issued
+            total_queries = len(running) + len(unavailable) * len(queries_to_test)
+        
+        if sampler is not None:
+            reasoning["adaptive_sampling"] = sampler.stats(aggregator.counts(), aggregator.total)
+            logger.info(
+                f"[{analysis_id}]   - Adaptive sampling: {sampler.calls} calls in {sampler.waves} waves "
+                f"(converged: {reasoning['adaptive_sampling']['converged']})"
+            )
+        
+        if clusters is not None:
+            clusters.flush_history()
+            reasoning["near_duplicates"] = {
+                **clusters.stats(),
+                "saturated_platforms": saturated
+            }
+            logger.info(
+                f"[{analysis_id}]   - Effective sample size: {clusters.effective_sample_size} "
+                f"distinct answers out of {len(citations)}"
+            )
+        
         reasoning["output"] = {
             "total_queries": total_queries,
             "successful": successful,
             "failed": failed,
             "citations_collected": len(citations),
-            "success_rate": f"{(successful/total_queries*100):.1f}%"
+            "success_rate": f"{(successful/total_queries*100):.1f}%" if total_queries else "n/a",
+            "circuit_open_failures": sum(1 for e in errors if e.get("circuit_open")),
+            "cancelled_at_deadline": cancelled,
+            "platforms_unavailable": unavailable,
+            "estimated_max_cost_usd": round(sum(m["cost"] for m in task_metadata), 4)
         }
         reasoning["queries_detail"] = [
             {
                 "platform": c.platform.value,
                 "query": c.query,
                 "response": c.raw_response,
+                "sample_index": c.sample_index,
                 "brand_mentioned": c.brand_mentioned,
                 "competitors_mentioned": c.competitors_mentioned,
-                "citations": c.context if c.platform.value == "perplexity" else None
+                "mentions": [span.model_dump() for span in c.mentions],
+                "duplicate_cluster": c.duplicate_cluster,
+                "citations": c.sources or None
             }
             for c in citations
         ]
         reasoning["duration"] = duration
         reasoning["status"] = "completed" if successful > 0 else "partial_failure"
+        if cancelled:
+            reasoning["status"] = "deadline_exceeded"
+        
+        coverage = {
+            "queries_planned": total_queries,
+            "queries_completed": successful,
+            "queries_failed": failed - cancelled,
+            "queries_cancelled": cancelled,
+            "query_coverage": successful / total_queries if total_queries else 0.0,
+            "effective_sample_size": clusters.effective_sample_size if clusters is not None else len(citations)
+        }
         
         logger.info(f"[{analysis_id}] ✓ Collected {len(citations)} citations in {duration:.2f}s")
-        logger.info(f"[{analysis_id}]   - Success rate: {successful}/{total_queries} ({successful/total_queries*100:.1f}%)")
+        logger.info(f"[{analysis_id}]   - Success rate: {successful}/{total_queries} ({coverage['query_coverage']*100:.1f}%)")
         
         return {
             "citations": citations,
+            "comparison": aggregator.snapshot(),
             "reasoning_trace": [reasoning],
             "data_flow": [{
                 "from": "Data Collection",
@@ -453,7 +772,9 @@ class MultiAgentOrchestrator:
                 "data": f"{len(citations)} citations from {len(set([c.platform.value for c in citations]))} platforms"
             }],
             "step_timings": {"data_collection": duration},
-            "errors": errors
+            "errors": errors,
+            "coverage": coverage,
+            **self._deadline_outcome("data_collection", cancelled > 0)
         }
     
     async def _analysis_node(self, state: AgentState) -> Dict[str, Any]:
@@ -491,16 +812,25 @@ class MultiAgentOrchestrator:
             ]
         }
         
-        # Execute analysis
-        comparison = self.analyzer.analyze_visibility(
+        # One matrix serves both the scores and the patterns
+        matrix = self.analyzer.build_matrix(
             state["citations"],
             state["request"].brand_domain,
             state["request"].competitors
         )
         
+        # Visibility scores were aggregated while the citations streamed in
+        comparison = state.get("comparison") or self.analyzer.analyze_visibility(
+            state["citations"],
+            state["request"].brand_domain,
+            state["request"].competitors,
+            matrix=matrix
+        )
+        
         patterns = self.analyzer.extract_patterns(
             state["citations"],
-            comparison
+            comparison,
+            matrix=matrix
         )
         
         duration = time.time() - step_start
@@ -541,7 +871,9 @@ class MultiAgentOrchestrator:
         3. Generates causal hypotheses
         4. Ranks by confidence
         
-        This node can run IN PARALLEL with recommendation generation
+        This node can run IN PARALLEL with recommendation generation. In
+        pipelined mode it streams the LLM output and publishes each
+        hypothesis to the recommender as soon as it is parsed.
         """
         step_start = time.time()
         analysis_id = state["analysis_id"]
@@ -570,11 +902,37 @@ class MultiAgentOrchestrator:
         }
         
         # Generate hypotheses
-        hypotheses = await self.hypothesis_agent.generate_hypotheses(
-            state["request"].query,
-            state["comparison"],
-            state["patterns"]
-        )
+        pipelined = settings.hypothesis_pipeline_enabled
+        if pipelined:
+            reasoning["execution_mode"] = "PIPELINED into Recommender (streamed)"
+            stream = self._hypothesis_stream(analysis_id)
+            
+            async def produce():
+                try:
+                    async for hypothesis in self.hypothesis_agent.stream_hypotheses(
+                        state["request"].query,
+                        state["comparison"],
+                        state["patterns"]
+                    ):
+                        stream.publish(hypothesis)
+                finally:
+                    stream.close()
+                return list(stream.items)
+            
+            step = produce()
+        else:
+            step = self.hypothesis_agent.generate_hypotheses(
+                state["request"].query,
+                state["comparison"],
+                state["patterns"]
+            )
+        hypotheses, cut_off = await self._within_deadline(step, self._remaining(state))
+        if cut_off:
+            logger.warning(f"[{analysis_id}] ⏱️  Hypothesis generation cut off by deadline")
+            # Streamed hypotheses completed before the cut-off are kept
+            hypotheses = list(stream.items) if pipelined else []
+            if pipelined:
+                stream.close()
         
         duration = time.time() - step_start
         
@@ -596,7 +954,7 @@ class MultiAgentOrchestrator:
             for h in hypotheses
         ]
         reasoning["duration"] = duration
-        reasoning["status"] = "completed"
+        reasoning["status"] = "deadline_exceeded" if cut_off else "completed"
         
         logger.info(f"[{analysis_id}] ✓ Generated {len(hypotheses)} hypotheses in {duration:.2f}s")
         for i, h in enumerate(hypotheses[:3], 1):
@@ -605,7 +963,8 @@ class MultiAgentOrchestrator:
         return {
             "hypotheses": hypotheses,
             "reasoning_trace": [reasoning],
-            "step_timings": {"hypothesis_generation": duration}
+            "step_timings": {"hypothesis_generation": duration},
+            **self._deadline_outcome("hypothesis_generation", cut_off)
         }
     
     async def _recommendation_node(self, state: AgentState) -> Dict[str, Any]:
@@ -618,7 +977,9 @@ class MultiAgentOrchestrator:
         3. Prioritizes by impact/effort ratio
         4. Creates implementation roadmap
         
-        This node can run IN PARALLEL with hypothesis generation
+        This node can run IN PARALLEL with hypothesis generation. In
+        pipelined mode it waits for the first streamed hypotheses
+        (hypothesis_pipeline_min) and grounds its recommendations on them.
         """
         step_start = time.time()
         analysis_id = state["analysis_id"]
@@ -648,17 +1009,38 @@ class MultiAgentOrchestrator:
         }
         
         # Generate recommendations
-        recommendations = await self.recommender.generate_recommendations(
-            state["request"].query,
-            state["comparison"],
-            state.get("hypotheses", []),  # May not be ready yet (parallel)
-            state["patterns"]
-        )
+        grounding = []
+        
+        async def recommend():
+            if settings.hypothesis_pipeline_enabled:
+                grounding.extend(await self._hypothesis_stream(analysis_id).wait_for(
+                    settings.hypothesis_pipeline_min
+                ))
+                logger.info(
+                    f"[{analysis_id}]   - Starting recommendations from {len(grounding)} streamed hypotheses "
+                    f"after {time.time() - step_start:.2f}s"
+                )
+            else:
+                grounding.extend(state.get("hypotheses", []))  # May not be ready yet (parallel)
+            return await self.recommender.generate_recommendations(
+                state["request"].query,
+                state["comparison"],
+                list(grounding),
+                state["patterns"]
+            )
+        
+        if settings.hypothesis_pipeline_enabled:
+            reasoning["execution_mode"] = "PIPELINED after streamed hypotheses"
+        recommendations, cut_off = await self._within_deadline(recommend(), self._remaining(state))
+        if cut_off:
+            logger.warning(f"[{analysis_id}] ⏱️  Recommendation generation cut off by deadline")
+            recommendations = []
         
         duration = time.time() - step_start
         
         reasoning["output"] = {
             "recommendations_generated": len(recommendations),
+            "grounding_hypotheses": len(grounding),
             "top_recommendations": [
                 {
                     "title": r.title,
@@ -684,7 +1066,7 @@ class MultiAgentOrchestrator:
             for r in recommendations
         ]
         reasoning["duration"] = duration
-        reasoning["status"] = "completed"
+        reasoning["status"] = "deadline_exceeded" if cut_off else "completed"
         
         logger.info(f"[{analysis_id}] ✓ Generated {len(recommendations)} recommendations in {duration:.2f}s")
         for i, r in enumerate(recommendations[:3], 1):
@@ -694,7 +1076,8 @@ class MultiAgentOrchestrator:
         return {
             "recommendations": recommendations,
             "reasoning_trace": [reasoning],
-            "step_timings": {"recommendation_generation": duration}
+            "step_timings": {"recommendation_generation": duration},
+            **self._deadline_outcome("recommendation_generation", cut_off)
         }
     
     async def _evaluation_node(self, state: AgentState) -> Dict[str, Any]:
@@ -740,20 +1123,36 @@ class MultiAgentOrchestrator:
             "quality_threshold": 0.7
         }
         
-        # Evaluate and improve hypotheses
+        # Evaluate and improve hypotheses, then recommendations. Reflexion is an
+        # optional refinement: if the deadline cuts it off, keep the unevaluated outputs
         brand_visibility = state["comparison"].brand_score.mention_rate
-        hypothesis_eval = await self.evaluator.evaluate_hypotheses(
-            state["hypotheses"],
-            state["citations"],
-            brand_visibility,
-            threshold=0.7
-        )
         
-        # Evaluate recommendations
-        recommendation_eval = await self.evaluator.evaluate_recommendations(
-            state["recommendations"],
-            threshold=0.7
-        )
+        async def evaluate():
+            hypothesis_eval = await self.evaluator.evaluate_hypotheses(
+                state["hypotheses"],
+                state["citations"],
+                brand_visibility,
+                threshold=0.7
+            )
+            recommendation_eval = await self.evaluator.evaluate_recommendations(
+                state["recommendations"],
+                threshold=0.7
+            )
+            return hypothesis_eval, recommendation_eval
+        
+        evaluations, cut_off = await self._within_deadline(evaluate(), self._remaining(state))
+        if cut_off:
+            duration = time.time() - step_start
+            logger.warning(f"[{analysis_id}] ⏱️  Evaluation skipped by deadline - keeping unevaluated outputs")
+            reasoning["output"] = {"skipped": "analysis deadline reached"}
+            reasoning["duration"] = duration
+            reasoning["status"] = "deadline_exceeded"
+            return {
+                "reasoning_trace": [reasoning],
+                "step_timings": {"evaluation": duration},
+                **self._deadline_outcome("evaluation", True)
+            }
+        hypothesis_eval, recommendation_eval = evaluations
         
         duration = time.time() - step_start
         
@@ -797,7 +1196,8 @@ class MultiAgentOrchestrator:
         Synthesis Node - Combines all insights into final result
         
         Reasoning Process:
-        1. Waits for both hypothesis and recommendation nodes
+        1. Waits for both hypothesis and recommendation nodes, and joins
+           the planner LLM call started at planning
         2. Generates executive summary
         3. Compiles all transparency data
         4. Creates final structured output
@@ -808,6 +1208,8 @@ class MultiAgentOrchestrator:
         logger.info(f"[{analysis_id}] NODE: Synthesis")
         logger.info(f"[{analysis_id}] STEP 6/6: Generating executive summary...")
         
+        planner_update = await self._join_planner_reasoning(state)
+        
         reasoning = {
             "step": "synthesis",
             "agent": "SynthesisAgent",
@@ -848,8 +1250,9 @@ class MultiAgentOrchestrator:
         logger.info("="*80)
         
         return {
+            **planner_update,
             "summary": summary,
-            "reasoning_trace": [reasoning],
+            "reasoning_trace": planner_update.get("reasoning_trace", []) + [reasoning],
             "data_flow": [{
                 "from": "Synthesis",
                 "to": "Frontend",
@@ -858,31 +1261,47 @@ class MultiAgentOrchestrator:
             "step_timings": {"synthesis": duration, "total": total_time}
         }
     
-    async def _query_chatgpt(
-        self, query: str, brand: str, competitors: List[str]
-    ) -> CitationData:
-        """Query ChatGPT and extract citations"""
-        try:
-            response = await self.openai_client.search(query)
-            return self.openai_client.extract_citations(
-                response, query, brand, competitors
-            )
-        except Exception as e:
-            logger.error(f"ChatGPT query failed for '{query}': {str(e)}")
-            raise
+    def _hypothesis_stream(self, analysis_id: str) -> HypothesisStream:
+        """Hypothesis stream of an analysis, created by whichever node asks first"""
+        stream = self.hypothesis_streams.get(analysis_id)
+        if stream is None:
+            stream = self.hypothesis_streams[analysis_id] = HypothesisStream()
+        return stream
+    
+    @staticmethod
+    def _remaining(state: AgentState) -> Optional[float]:
+        """Seconds left in the analysis budget, or None without a deadline"""
+        deadline = state.get("deadline")
+        return deadline.remaining() if deadline else None
     
-    async def _query_perplexity(
-        self, query: str, brand: str, competitors: List[str]
-    ) -> CitationData:
-        """Query Perplexity and extract citations"""
+    @staticmethod
+    async def _within_deadline(coro, timeout: Optional[float]):
+        """
+        Await a step, giving up after `timeout` seconds
+        
+        Args:
+            coro: Step coroutine
+            timeout: Seconds allowed (None waits indefinitely)
+            
+        Returns:
+            (result, cut_off) - result is None when the step was cut off
+        """
+        if timeout is None:
+            return await coro, False
+        if timeout <= 0:
+            coro.close()
+            return None, True
         try:
-            response = await self.perplexity_client.search(query)
-            return self.perplexity_client.extract_citations(
-                response, query, brand, competitors
-            )
-        except Exception as e:
-            logger.error(f"Perplexity query failed for '{query}': {str(e)}")
-            raise
+            return await asyncio.wait_for(coro, timeout=timeout), False
+        except asyncio.TimeoutError:
+            return None, True
+    
+    @staticmethod
+    def _deadline_outcome(step: str, cut_off: bool) -> Dict[str, Any]:
+        """State update marking the result partial when a step was cut off"""
+        if not cut_off:
+            return {}
+        return {"partial": True, "skipped_steps": [step]}
     
     def _generate_summary(self, state: AgentState) -> str:
         """Generate executive summary from all agent outputs"""
@@ -957,10 +1376,18 @@ Analysis Method:
                     "role": "Data Gathering",
                     "inputs": ["Query Variations", "Platforms"],
                     "outputs": ["Citations", "Raw Responses"],
-                    "platforms": ["ChatGPT", "Perplexity"],
+                    "platforms": [
+                        platform.value for platform in collector_registry.platforms()
+                        if collector_registry.get(platform).available()
+                    ],
                     "execution": "Parallel (all queries concurrent)",
                     "purpose": "Collects visibility data from AI platforms",
-                    "concurrency": "Up to 50 parallel requests"
+                    "concurrency": {
+                        platform.value: f"Up to {collector.max_concurrency} in-flight requests (shared pool)"
+                        for platform, collector in (
+                            (p, collector_registry.get(p)) for p in collector_registry.platforms()
+                        )
+                    }
                 },
                 "AnalyzerAgent": {
                     "role": "Pattern Analysis",
@@ -1,10 +1,11 @@
 """Hypothesis generator agent - explains visibility patterns"""
 
-from typing import List, Dict, Any
+import asyncio
+from typing import AsyncIterator, List, Dict, Any
 import logging
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from src.config import settings
+from src.agents.json_stream import JSONArrayStream
+from src.agents.llm import create_chat_llm
 from src.models.schemas import Hypothesis, CompetitorComparison
 import json
 
@@ -15,11 +16,7 @@ class HypothesisAgent:
     """Agent that generates hypotheses explaining visibility patterns"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.default_model,
-            temperature=0.7,
-            api_key=settings.openai_api_key
-        )
+        self.llm = create_chat_llm(temperature=0.7)
         
         self.hypothesis_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert GEO analyst who explains why brands 
@@ -74,33 +71,10 @@ Generate hypotheses explaining these patterns.""")
         Returns:
             List of hypotheses
         """
-        brand_rate = comparison.brand_score.mention_rate * 100
-        
-        top_comp_rate = 0
-        top_comp_name = "N/A"
-        if comparison.competitor_scores:
-            top_comp_rate = comparison.competitor_scores[0].mention_rate * 100
-            top_comp_name = comparison.competitor_scores[0].domain
-        
-        gap = comparison.visibility_gap * 100
-        
-        # Format platform data
-        platform_data = json.dumps(comparison.brand_score.platforms, indent=2)
-        patterns_str = json.dumps(patterns, indent=2, default=str)
-        
         chain = self.hypothesis_prompt | self.llm
         
         try:
-            response = await chain.ainvoke({
-                "query": query,
-                "brand": comparison.brand_score.domain,
-                "brand_rate": f"{brand_rate:.1f}",
-                "top_competitor": top_comp_name,
-                "competitor_rate": f"{top_comp_rate:.1f}",
-                "gap": f"{gap:.1f}",
-                "platform_data": platform_data,
-                "patterns": patterns_str
-            })
+            response = await chain.ainvoke(self._prompt_inputs(query, comparison, patterns))
             
             # Parse JSON response
             content = response.content
@@ -120,15 +94,7 @@ Generate hypotheses explaining these patterns.""")
             hypotheses_data = json.loads(content.strip())
             
             # Convert to Hypothesis objects
-            hypotheses = [
-                Hypothesis(
-                    title=h["title"],
-                    explanation=h["explanation"],
-                    confidence=h["confidence"],
-                    supporting_evidence=h["supporting_evidence"]
-                )
-                for h in hypotheses_data
-            ]
+            hypotheses = [self._to_hypothesis(h) for h in hypotheses_data]
             
             logger.info(f"✅ Parsed {len(hypotheses)} hypotheses from LLM")
             
@@ -139,6 +105,100 @@ Generate hypotheses explaining these patterns.""")
             # Return fallback hypotheses
             return self._generate_fallback_hypotheses(comparison, patterns)
     
+    async def stream_hypotheses(
+        self,
+        query: str,
+        comparison: CompetitorComparison,
+        patterns: Dict[str, Any]
+    ) -> AsyncIterator[Hypothesis]:
+        """
+        Generate hypotheses, yielding each as soon as the LLM has finished it
+        
+        The response is streamed and its JSON array parsed incrementally, so
+        consumers can start on the first hypotheses while later ones are
+        still being written. Falls back like generate_hypotheses when the
+        LLM produces none.
+        
+        Args:
+            query: Original query
+            comparison: Competitor comparison data
+            patterns: Pattern analysis
+            
+        Yields:
+            Hypotheses in the order the LLM wrote them
+        """
+        chain = self.hypothesis_prompt | self.llm
+        parser = JSONArrayStream()
+        produced = 0
+        
+        try:
+            async for chunk in chain.astream(self._prompt_inputs(query, comparison, patterns)):
+                for item in parser.feed(chunk.content):
+                    try:
+                        hypothesis = self._to_hypothesis(item)
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.warning(f"⚠️  Skipping malformed hypothesis: {e}")
+                        continue
+                    produced += 1
+                    yield hypothesis
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️  Hypothesis stream failed after {produced} hypotheses: {e}")
+        
+        content = parser.text
+        logger.info("="*60)
+        logger.info("💡 HYPOTHESIS LLM OUTPUT (streamed):")
+        logger.info("-"*60)
+        logger.info(content[:800] + "..." if len(content) > 800 else content)
+        logger.info("="*60)
+        logger.info(f"✅ Streamed {produced} hypotheses from LLM")
+        
+        if not produced:
+            for hypothesis in self._generate_fallback_hypotheses(comparison, patterns):
+                yield hypothesis
+    
+    def _prompt_inputs(
+        self,
+        query: str,
+        comparison: CompetitorComparison,
+        patterns: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Template variables for the hypothesis prompt"""
+        brand_rate = comparison.brand_score.mention_rate * 100
+        
+        top_comp_rate = 0
+        top_comp_name = "N/A"
+        if comparison.competitor_scores:
+            top_comp_rate = comparison.competitor_scores[0].mention_rate * 100
+            top_comp_name = comparison.competitor_scores[0].domain
+        
+        gap = comparison.visibility_gap * 100
+        
+        # Format platform data
+        platform_data = json.dumps(comparison.brand_score.platforms, indent=2)
+        patterns_str = json.dumps(patterns, indent=2, default=str)
+        
+        return {
+            "query": query,
+            "brand": comparison.brand_score.domain,
+            "brand_rate": f"{brand_rate:.1f}",
+            "top_competitor": top_comp_name,
+            "competitor_rate": f"{top_comp_rate:.1f}",
+            "gap": f"{gap:.1f}",
+            "platform_data": platform_data,
+            "patterns": patterns_str
+        }
+    
+    @staticmethod
+    def _to_hypothesis(data: Dict[str, Any]) -> Hypothesis:
+        return Hypothesis(
+            title=data["title"],
+            explanation=data["explanation"],
+            confidence=data["confidence"],
+            supporting_evidence=data["supporting_evidence"]
+        )
+    
     def _generate_fallback_hypotheses(
         self,
         comparison: CompetitorComparison,
@@ -194,4 +254,38 @@ Generate hypotheses explaining these patterns.""")
         ]
 
 
-
+class HypothesisStream:
+    """
+    Hypotheses of one analysis as they are produced, for pipelined consumers
+    
+    The hypothesis node publishes each hypothesis and closes the stream
+    when done; the recommendation node waits until enough have arrived.
+    """
+    
+    def __init__(self):
+        self.items: List[Hypothesis] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+    
+    def publish(self, hypothesis: Hypothesis) -> None:
+        self.items.append(hypothesis)
+        self._changed.set()
+    
+    def close(self) -> None:
+        self.closed = True
+        self._changed.set()
+    
+    async def wait_for(self, count: int) -> List[Hypothesis]:
+        """
+        Wait until `count` hypotheses are available or the stream closes
+        
+        Args:
+            count: Hypotheses needed
+            
+        Returns:
+            Hypotheses published so far
+        """
+        while len(self.items) < count and not self.closed:
+            self._changed.clear()
+            await self._changed.wait()
+        return list(self.items)
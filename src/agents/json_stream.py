@@ -0,0 +1,130 @@
+"""Incremental parsing of a JSON array of objects streamed by an LLM"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_FENCE = "```json"
+# How far back from a bracket a ```json fence is looked for
+_FENCE_LOOKBACK = 64
+
+
+class JSONArrayStream:
+    """
+    Yields each object of a top-level JSON array as soon as it is complete
+
+    Text before the opening bracket (prose, a ```json fence) is skipped.
+    A bracket opens the array only right after a ```json fence or when its
+    next non-space character is `{`, so brackets in prose ("[3] ideas") are
+    ignored; a bracketed span that closes without yielding an object is
+    treated as prose and scanning resumes after it. Characters are scanned
+    once, tracking nesting depth and string state. Each feed scans only the
+    new chunk plus a short carried-over tail (the fence look-behind, or an
+    undecided bracket); the object being read is kept as a list of parts
+    and joined once it closes. Feeding n characters costs O(n) overall
+    regardless of chunk sizes.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []  # Full output, joined only for `text`
+        self._carry = ""  # Scanned tail kept for bracket look-behind/ahead
+        self._pos = 0  # Next character to scan in carry + chunk
+        self._object_parts: List[str] = []  # Earlier chunks of the open object
+        self._depth = 0  # 0 = outside the array, 1 = between elements
+        self._in_string = False
+        self._escaped = False
+        self._object_start: Optional[int] = None
+        self._array_count = 0  # Objects yielded since the array opened
+        self.finished = False
+        self.count = 0
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Add streamed text
+
+        Args:
+            chunk: Next piece of the LLM output
+
+        Returns:
+            Objects completed by this chunk, in order
+        """
+        self._chunks.append(chunk)
+        completed = []
+        text = self._carry + chunk
+        while self._pos < len(text) and not self.finished:
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "[":
+                    opens = self._opens_array(text, self._pos)
+                    if opens is None:
+                        break  # Wait for the character after the bracket
+                    if opens:
+                        self._depth = 1
+                        self._array_count = 0
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1 and char == "{":
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and char == "}" and self._object_start is not None:
+                    self._object_parts.append(text[self._object_start:self._pos + 1])
+                    item = self._decode("".join(self._object_parts))
+                    if item is not None:
+                        completed.append(item)
+                        self._array_count += 1
+                    self._object_start = None
+                    self._object_parts = []
+                elif self._depth == 0:
+                    # An empty "array" was prose after all; keep looking
+                    self.finished = self._array_count > 0
+            self._pos += 1
+
+        # Drop what has been consumed before the next chunk arrives
+        if self._object_start is not None:
+            self._object_parts.append(text[self._object_start:])
+            self._object_start = 0
+            self._carry = ""
+            self._pos = 0
+        else:
+            start = max(0, min(self._pos, len(text)) - _FENCE_LOOKBACK)
+            self._carry = text[start:]
+            self._pos -= start
+        self.count += len(completed)
+        return completed
+
+    @staticmethod
+    def _opens_array(text: str, pos: int) -> Optional[bool]:
+        """Whether the bracket at `pos` opens the array (None: not decidable yet)"""
+        if text[max(0, pos - _FENCE_LOOKBACK):pos].rstrip().lower().endswith(_FENCE):
+            return True
+        for char in text[pos + 1:pos + 1 + _FENCE_LOOKBACK]:
+            if not char.isspace():
+                return char == "{"
+        return None if len(text) - pos - 1 < _FENCE_LOOKBACK else False
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            logger.warning(f"⚠️  Skipping malformed streamed JSON object: {e}")
+            return None
@@ -0,0 +1,27 @@
+"""Shared chat model construction for LLM-backed agents"""
+
+from langchain_openai import ChatOpenAI
+from src.config import settings
+from src.data.http import openai_http_client
+
+
+def create_chat_llm(temperature: float) -> ChatOpenAI:
+    """
+    Create the ChatOpenAI model used by an agent
+    
+    All agents build their model here so transport-level settings
+    (base URL, record/replay cassettes) apply to every LLM call uniformly.
+    
+    Args:
+        temperature: Sampling temperature for this agent
+        
+    Returns:
+        Configured ChatOpenAI instance
+    """
+    return ChatOpenAI(
+        model=settings.default_model,
+        temperature=temperature,
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url,
+        http_async_client=openai_http_client()
+    )
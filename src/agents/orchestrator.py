@@ -79,12 +79,14 @@ class GEOOrchestrator:
         # Step 3: Analysis
         step_start = time.time()
         logger.info(f"[{analysis_id}] STEP 3/6: Analyzing visibility patterns...")
+        matrix = self.analyzer.build_matrix(citations, request.brand_domain, request.competitors)
         comparison = self.analyzer.analyze_visibility(
             citations,
             request.brand_domain,
-            request.competitors
+            request.competitors,
+            matrix=matrix
         )
-        patterns = self.analyzer.extract_patterns(citations, comparison)
+        patterns = self.analyzer.extract_patterns(citations, comparison, matrix=matrix)
         logger.info(f"[{analysis_id}] ✓ Analysis complete in {time.time() - step_start:.2f}s")
         logger.info(f"[{analysis_id}] - Brand visibility: {comparison.brand_score.mention_rate*100:.1f}%")
         logger.info(f"[{analysis_id}] - Patterns identified: {len(patterns)}")
@@ -166,14 +168,16 @@ class GEOOrchestrator:
                     tasks.append(self._query_chatgpt(
                         query,
                         plan["brand"],
-                        plan["competitors"]
+                        plan["competitors"],
+                        fresh=plan.get("fresh", False)
                     ))
                 elif platform.value == "perplexity":
                     logger.debug(f"Queuing Perplexity query: '{query}'")
                     tasks.append(self._query_perplexity(
                         query,
                         plan["brand"],
-                        plan["competitors"]
+                        plan["competitors"],
+                        fresh=plan.get("fresh", False)
                     ))
         
         logger.info(f"Executing {len(tasks)} concurrent queries...")
@@ -201,13 +205,14 @@ class GEOOrchestrator:
         self,
         query: str,
         brand: str,
-        competitors: List[str]
+        competitors: List[str],
+        fresh: bool = False
     ) -> CitationData:
         """Query ChatGPT and extract citations"""
         logger.debug(f"Querying ChatGPT: '{query}'")
         start = time.time()
         try:
-            response = await self.openai_client.search(query)
+            response = await self.openai_client.search(query, fresh=fresh)
             citation_data = self.openai_client.extract_citations(
                 response,
                 query,
@@ -224,13 +229,14 @@ class GEOOrchestrator:
         self,
         query: str,
         brand: str,
-        competitors: List[str]
+        competitors: List[str],
+        fresh: bool = False
     ) -> CitationData:
         """Query Perplexity and extract citations"""
         logger.debug(f"Querying Perplexity: '{query}'")
         start = time.time()
         try:
-            response = await self.perplexity_client.search(query)
+            response = await self.perplexity_client.search(query, fresh=fresh)
             citation_data = self.perplexity_client.extract_citations(
                 response,
                 query,
@@ -2,9 +2,8 @@
 
 from typing import Dict, List, Any
 import logging
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from src.config import settings
+from src.agents.llm import create_chat_llm
 from src.models.schemas import AnalysisRequest, Platform
 
 logger = logging.getLogger(__name__)
@@ -14,11 +13,7 @@ class PlannerAgent:
     """Agent that plans the investigation strategy"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.default_model,
-            temperature=0.3,  # Lower temperature for planning
-            api_key=settings.openai_api_key
-        )
+        self.llm = create_chat_llm(temperature=0.3)  # Lower temperature for planning
         
         self.planning_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a strategic planner for GEO (Generative Engine Optimization) analysis.
@@ -45,6 +40,25 @@ class PlannerAgent:
         Returns:
             Structured plan with steps
         """
+        plan = self.build_plan(request, await self.reason(request))
+        
+        logger.info(f"📊 Plan generated: {len(plan['query_variations'])} variations, {len(plan['platforms'])} platforms")
+        
+        return plan
+    
+    async def reason(self, request: AnalysisRequest) -> str:
+        """
+        LLM planning rationale for a request
+        
+        The structured plan does not depend on it (see build_plan), so it can
+        run concurrently with data collection.
+        
+        Args:
+            request: Analysis request
+            
+        Returns:
+            Planner LLM output
+        """
         chain = self.planning_prompt | self.llm
         
         response = await chain.ainvoke({
@@ -60,28 +74,39 @@ class PlannerAgent:
         logger.info(response.content[:500] + "..." if len(response.content) > 500 else response.content)
         logger.info("="*60)
         
-        # Parse response into structured plan
-        plan = {
+        return response.content
+    
+    def build_plan(self, request: AnalysisRequest, reasoning: str) -> Dict[str, Any]:
+        """
+        Build the structured plan for a request
+        
+        Args:
+            request: Analysis request
+            reasoning: LLM planning output to attach (may be a placeholder)
+            
+        Returns:
+            Structured plan with steps
+        """
+        return {
             "original_query": request.query,
             "query_variations": self._generate_query_variations(request.query),
             "platforms": request.platforms,
             "brand": request.brand_domain,
             "competitors": request.competitors,
             "num_queries": request.num_queries,
+            "fresh": request.fresh,
+            "samples_per_query": request.samples_per_query,
             "steps": [
                 "collect_visibility_data",
                 "analyze_patterns",
                 "generate_hypotheses",
                 "create_recommendations"
             ],
-            "reasoning": response.content
+            "reasoning": reasoning
         }
-        
-        logger.info(f"📊 Plan generated: {len(plan['query_variations'])} variations, {len(plan['platforms'])} platforms")
-        
-        return plan
     
-    def _generate_query_variations(self, query: str) -> List[str]:
+    @staticmethod
+    def _generate_query_variations(query: str) -> List[str]:
         """
         Generate variations of the query
         
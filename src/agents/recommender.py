@@ -2,9 +2,8 @@
 
 from typing import List, Dict, Any
 import logging
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from src.config import settings
+from src.agents.llm import create_chat_llm
 from src.models.schemas import Recommendation, Hypothesis, CompetitorComparison
 import json
 
@@ -15,11 +14,7 @@ class RecommenderAgent:
     """Agent that creates actionable recommendations"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.default_model,
-            temperature=0.7,
-            api_key=settings.openai_api_key
-        )
+        self.llm = create_chat_llm(temperature=0.7)
         
         self.recommendation_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a GEO optimization strategist who creates actionable 
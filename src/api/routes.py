@@ -8,11 +8,21 @@ import logging
 from src.models.schemas import (
     AnalysisRequest,
     AnalysisResult,
+    BrandAliases,
     CompareRequest,
     HealthResponse
 )
 from src.agents.graph_orchestrator import graph_orchestrator
 from src.memory.store import MemoryStore
+from src.memory.aliases import alias_registry
+from src.data.cache import response_cache
+from src.data.singleflight import platform_flights
+from src.data.rate_limiter import rate_limiters
+from src.data.resilience import resilience_policies
+from src.data.hedging import hedging_stats
+from src.data.collectors import collector_registry
+from src.data.discovery import discovery_tracker
+from src.data.source_index import source_index
 from src import __version__
 
 
@@ -37,6 +47,154 @@ async def health_check():
     )
 
 
+@router.get("/api/metrics")
+async def get_metrics():
+    """
+    Runtime metrics for the data collection layer
+    
+    Returns:
+        Response cache, request coalescing, rate limiter, circuit breaker and hedging metrics
+    """
+    return {
+        "response_cache": response_cache.stats(),
+        "request_coalescing": platform_flights.stats(),
+        "rate_limits": {
+            name: limiter.stats() for name, limiter in rate_limiters.items()
+        },
+        "resilience": {
+            name: policy.stats() for name, policy in resilience_policies.items()
+        },
+        "hedging": hedging_stats(),
+        "collectors": collector_registry.stats()
+    }
+
+
+@router.get("/api/analyses/live")
+async def get_live_analyses():
+    """
+    Running visibility scores of analyses still collecting data
+    
+    Returns:
+        Analysis ID -> citations seen so far and the current comparison
+    """
+    return orchestrator.live_snapshots()
+
+
+@router.get("/api/discovery")
+async def get_discovery(
+    query: Optional[str] = None,
+    exclude: Optional[str] = None,
+    limit: int = 20
+):
+    """
+    Frequently mentioned domains and brands found in AI answers
+    
+    Args:
+        query: Restrict to answers for this query (default: whole history)
+        exclude: Comma-separated domains to leave out (e.g. already tracked ones)
+        limit: Maximum entities returned
+        
+    Returns:
+        Discovered entities with estimated mention counts
+    """
+    tracked = [domain.strip() for domain in (exclude or "").split(",") if domain.strip()]
+    return {
+        "query": query,
+        "discovered": [
+            entity.model_dump()
+            for entity in discovery_tracker.discovered(query, tracked=tracked, limit=limit)
+        ],
+        "stats": discovery_tracker.stats()
+    }
+
+
+@router.get("/api/sources")
+async def get_sources(
+    query: Optional[str] = None,
+    platform: Optional[str] = None,
+    days: int = 30,
+    limit: int = 20
+):
+    """
+    Source domains AI platforms cite most, from the source index
+    
+    Args:
+        query: Restrict to one query (default: all queries)
+        platform: Restrict to one platform (e.g. "perplexity")
+        days: Look-back window in days
+        limit: Maximum domains returned
+        
+    Returns:
+        Top cited domains with per-platform counts and example URLs
+    """
+    return {
+        "query": query,
+        "platform": platform,
+        "days": days,
+        "domains": await source_index.top_domains(query, platform, days=days, limit=limit),
+        "stats": source_index.stats()
+    }
+
+
+@router.get("/api/aliases")
+async def list_aliases():
+    """
+    Registered brand aliases
+    
+    Returns:
+        Names, products and misspellings per domain
+    """
+    return {"aliases": [entry.model_dump() for entry in alias_registry.all()]}
+
+
+@router.get("/api/aliases/{domain}", response_model=BrandAliases)
+async def get_aliases(domain: str):
+    """
+    Aliases registered for one domain
+    
+    Args:
+        domain: Tracked domain
+        
+    Returns:
+        BrandAliases (empty lists when none are registered)
+    """
+    return alias_registry.get(domain)
+
+
+@router.put("/api/aliases/{domain}", response_model=BrandAliases)
+async def set_aliases(domain: str, aliases: BrandAliases):
+    """
+    Replace the aliases of a domain
+    
+    Matching picks the new aliases up on the next analysis; compiled
+    matchers for the old set are no longer used.
+    
+    Args:
+        domain: Tracked domain
+        aliases: Names, products and misspellings
+        
+    Returns:
+        Stored aliases (lowercased, deduplicated)
+    """
+    try:
+        return await alias_registry.set(aliases.model_copy(update={"domain": domain}))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save aliases: {str(e)}")
+
+
+@router.delete("/api/aliases/{domain}")
+async def delete_aliases(domain: str):
+    """
+    Remove the aliases of a domain
+    
+    Args:
+        domain: Tracked domain
+    """
+    if not await alias_registry.delete(domain):
+        raise HTTPException(status_code=404, detail="No aliases registered for this domain")
+    return {"message": f"Aliases for {domain} removed"}
+
+
 @router.post("/api/analyze", response_model=AnalysisResult)
 async def analyze_visibility(
     request: AnalysisRequest,
@@ -92,7 +250,8 @@ async def compare_brands(request: CompareRequest):
             brand_domain=primary_domain,
             competitors=other_domains,
             platforms=request.platforms,
-            num_queries=5  # Reasonable number for comparison
+            num_queries=5,  # Reasonable number for comparison
+            fresh=request.fresh
         )
         
         logger.info(f"Running single optimized analysis for all domains")
@@ -3,7 +3,7 @@
 import logging
 import sys
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     openai_api_key: str
     perplexity_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
+    google_ai_api_key: Optional[str] = None
+    
+    # Provider Endpoints (point at `python -m src.data.stub_server` for load tests)
+    openai_base_url: Optional[str] = None  # None uses the SDK default
+    perplexity_base_url: str = "https://api.perplexity.ai"
+    anthropic_base_url: str = "https://api.anthropic.com"
+    google_ai_base_url: str = "https://generativelanguage.googleapis.com"
     
     # Server
     host: str = "0.0.0.0"
@@ -24,16 +31,126 @@ class Settings(BaseSettings):
     
     # Vector Store
     chroma_db_path: str = "./chroma_db"
+    alias_registry_path: Optional[str] = None  # Brand alias SQLite file; <chroma_db_path>/aliases.sqlite when unset
     
     # LLM Settings
     default_model: str = "gpt-4-turbo-preview"
     embedding_model: str = "text-embedding-3-small"
     max_tokens: int = 4000
     temperature: float = 0.7
+    claude_model: str = "claude-3-5-sonnet-latest"
+    google_ai_model: str = "gemini-1.5-flash"
     
     # Agent Settings
     max_iterations: int = 10
-    max_concurrent_requests: int = 5
+    max_concurrent_requests: int = 5  # Per provider, shared by all analyses
+    # Per-provider concurrency pools, e.g. {"anthropic": 10}
+    collector_concurrency: Dict[str, int] = {}
+    default_deadline_ms: Optional[int] = None  # Used when a request sets no deadline_ms
+    deadline_planning_share: float = 0.2  # Share of the budget for the planning LLM call
+    deadline_collection_share: float = 0.6  # Share of the remaining budget for data collection
+    
+    # Provider Rate Limits (per minute; 0 disables the budget)
+    openai_chat_rpm: int = 500
+    openai_chat_tpm: int = 150000
+    openai_embeddings_rpm: int = 3000
+    openai_embeddings_tpm: int = 1000000
+    perplexity_rpm: int = 50
+    perplexity_tpm: int = 0
+    anthropic_rpm: int = 50
+    anthropic_tpm: int = 40000
+    google_ai_rpm: int = 60
+    google_ai_tpm: int = 0
+    
+    # Resilience (retries and circuit breaker per provider)
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    retry_budget_ratio: float = 0.2  # Retries allowed per request made
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    # Per-provider overrides, e.g. {"perplexity": {"max_attempts": 5}}
+    resilience_overrides: Dict[str, Dict[str, float]] = {}
+    
+    # Request Hedging (duplicate slow platform queries)
+    hedging_enabled: bool = False
+    hedge_percentile: float = 0.95  # Hedge once a call outlives this latency percentile
+    hedge_min_samples: int = 20  # Latency samples needed before hedging starts
+    hedge_latency_window: int = 200
+    hedge_budget_ratio: float = 0.05  # Hedges allowed per call, shared by all providers
+    
+    # HTTP Transport (shared pooled client for Perplexity and scraping)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_timeout: float = 30.0
+    http2_enabled: bool = True
+    perplexity_timeout: float = 30.0
+    anthropic_timeout: float = 60.0
+    google_ai_timeout: float = 30.0
+    scraper_timeout: float = 10.0
+    
+    # Response Cache (platform query responses)
+    response_cache_enabled: bool = True
+    response_cache_path: str = "./cache/responses.sqlite"
+    response_cache_ttl: float = 6 * 60 * 60  # seconds
+    response_cache_max_memory_entries: int = 1000
+    response_cache_max_disk_entries: int = 50000
+
+    # Record/Replay (offline benchmarking): "off", "record" or "replay"
+    cassette_mode: str = "off"
+    cassette_path: str = "./cassettes/default.jsonl"
+    cassette_replay_timing: bool = False  # Sleep for the recorded latency on replay
+    
+    # Batch Collection (nightly tracking runs via the OpenAI Batch API)
+    batch_backend: str = "openai"  # "openai" or "local" (offline stand-in)
+    batch_dir: str = "./batches"
+    batch_poll_interval: float = 30.0
+    batch_completion_window: str = "24h"
+    
+    # Adaptive Sampling (sequential collection until mention rates converge)
+    visibility_confidence: float = 0.95  # Confidence level of mention-rate intervals
+    adaptive_wave_size: int = 4  # Platform calls per wave
+    adaptive_target_width: float = 0.3  # Stop once every interval is at most this wide
+    adaptive_max_calls: int = 30  # Call budget when the request sets none
+    
+    # Competitor Discovery (heavy-hitter sketch over response entities)
+    discovery_enabled: bool = True
+    discovery_top_k: int = 50  # Candidates kept per sketch
+    discovery_results: int = 10  # discovered_competitors returned per analysis
+    discovery_sketch_width: int = 4096
+    discovery_sketch_depth: int = 4
+    discovery_query_sketch_width: int = 512
+    discovery_max_queries: int = 256  # Per-query sketches kept (least recently seen dropped)
+    discovery_sketch_path: Optional[str] = None  # Persist sketches across restarts
+    discovery_save_interval: int = 20  # Analyses between sketch saves (also saved on shutdown)
+    
+    # Near-Duplicate Detection (MinHash/LSH over response text)
+    dedup_enabled: bool = True
+    dedup_num_perm: int = 64  # MinHash signature length
+    dedup_bands: int = 16  # LSH bands (4 rows each: candidates from ~0.5 similarity)
+    dedup_threshold: float = 0.8  # Estimated Jaccard similarity counted as duplicate
+    dedup_shingle_size: int = 3  # Words per shingle
+    dedup_history_size: int = 5000  # Recent responses kept for cross-analysis checks
+    dedup_initial_variations: int = 2  # Saturation mode: variations started per platform up front
+    dedup_saturation_run: int = 2  # Consecutive duplicates after which a platform gets no more variations
+    
+    # Context Sampling (brand-mention contexts passed to the hypothesis prompt)
+    context_max_snippets: int = 8
+    context_token_budget: int = 600  # Estimated tokens across all snippets
+    context_window_chars: int = 200  # Characters kept on each side of a mention (sentence-aligned)
+    context_dedup_threshold: float = 0.5  # Snippets at least this similar count as duplicates
+    
+    # Pipelined Hypotheses -> Recommendations
+    hypothesis_pipeline_enabled: bool = False  # Stream hypotheses; needs an LLM endpoint that supports streaming
+    hypothesis_pipeline_min: int = 2  # Hypotheses the recommender waits for before starting
+    
+    # Source Index (domains cited by platforms, per query and day)
+    source_index_enabled: bool = True
+    source_index_path: str = "./cache/sources.sqlite"
+    source_index_retention_days: int = 365
+    public_suffix_list_path: Optional[str] = None  # public_suffix_list.dat; built-in rules when unset
     
     # Logging Settings
     log_level: str = "INFO"
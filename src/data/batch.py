@@ -0,0 +1,321 @@
+"""Batch job backends for large non-interactive ChatGPT collection runs"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which polling stops
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_chat_request(
+    custom_id: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: int,
+    samples: int = 1
+) -> Dict[str, Any]:
+    """
+    Build one line of a chat completions batch input file
+
+    Args:
+        custom_id: Caller-chosen ID used to match the result to its prompt
+        model: Model name
+        system_prompt: System message
+        user_prompt: User message
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        samples: Completions per prompt (n)
+
+    Returns:
+        Batch request line as a dict
+    """
+    body: Dict[str, Any] = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if samples > 1:
+        body["n"] = samples
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def write_batch_file(path: str, requests: List[Dict[str, Any]]) -> str:
+    """
+    Write batch request lines as JSONL
+
+    Args:
+        path: Output file path
+        requests: Lines from build_chat_request
+
+    Returns:
+        The path written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request) + "\n")
+    logger.info(f"📝 Wrote {len(requests)} batch requests to {path}")
+    return path
+
+
+def parse_batch_output(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a batch output (or error) file
+
+    Args:
+        text: JSONL content of the output file
+
+    Returns:
+        custom_id -> {"contents": [...]} on success or {"error": "..."} on failure
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        entry = json.loads(line)
+        custom_id = entry.get("custom_id")
+        response = entry.get("response") or {}
+        error = entry.get("error")
+
+        if error or response.get("status_code", 200) >= 400:
+            message = (error or {}).get("message") or json.dumps(response.get("body", {}))[:200]
+            results[custom_id] = {"error": f"status {response.get('status_code')}: {message}"}
+            continue
+
+        choices = sorted(response.get("body", {}).get("choices", []), key=lambda c: c.get("index", 0))
+        results[custom_id] = {
+            "contents": [(c.get("message") or {}).get("content") or "" for c in choices]
+        }
+    return results
+
+
+class BatchBackend(ABC):
+    """Interface for submitting and polling batch jobs"""
+
+    name = "base"
+
+    @abstractmethod
+    async def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Submit a JSONL input file and return the batch ID"""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        """Current status dict with at least a "status" key"""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Parsed results of a completed batch, keyed by custom_id"""
+
+    async def wait(
+        self,
+        batch_id: str,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Poll until the batch reaches a terminal status
+
+        Args:
+            batch_id: Batch ID returned by submit()
+            poll_interval: Seconds between polls (default settings.batch_poll_interval)
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            Final status dict
+
+        Raises:
+            TimeoutError: The batch did not finish within `timeout`
+        """
+        poll_interval = poll_interval if poll_interval is not None else settings.batch_poll_interval
+        start = time.monotonic()
+        last_status = None
+        while True:
+            status = await self.status(batch_id)
+            if status["status"] != last_status:
+                logger.info(f"📦 Batch {batch_id}: {status['status']} {status.get('request_counts', '')}")
+                last_status = status["status"]
+            if status["status"] in TERMINAL_STATUSES:
+                return status
+            if timeout is not None and time.monotonic() - start > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {status['status']} after {timeout:.0f}s")
+            await asyncio.sleep(poll_interval)
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API (24h completion window, discounted pricing)"""
+
+    name = "openai"
+
+    def __init__(self, client=None):
+        if client is None:
+            from openai import AsyncOpenAI
+            from src.data.http import openai_http_client
+
+            client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
+                http_client=openai_http_client()
+            )
+        self.client = client
+
+    async def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        with open(input_path, "rb") as f:
+            batch_file = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=settings.batch_completion_window,
+            metadata=metadata
+        )
+        logger.info(f"📦 Submitted OpenAI batch {batch.id} ({input_path})")
+        return batch.id
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        batch = await self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            "id": batch.id,
+            "status": batch.status,
+            "output_file_id": batch.output_file_id,
+            "error_file_id": batch.error_file_id,
+            "request_counts": counts.model_dump() if counts is not None else None
+        }
+
+    async def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        status = await self.status(batch_id)
+        results: Dict[str, Dict[str, Any]] = {}
+        for file_id in (status["error_file_id"], status["output_file_id"]):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                results.update(parse_batch_output(content.text))
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for the Batch API
+
+    Each batch is a directory holding input.jsonl and, once processed,
+    output.jsonl in the Batch API output format. Answers come from the
+    seeded stub corpus, so runs are free, offline and deterministic.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: Optional[str] = None, seed: int = 42):
+        self.directory = directory or os.path.join(settings.batch_dir, "local")
+        self.seed = seed
+
+    def _batch_dir(self, batch_id: str) -> str:
+        return os.path.join(self.directory, batch_id)
+
+    async def submit(self, input_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        batch_dir = self._batch_dir(batch_id)
+        os.makedirs(batch_dir, exist_ok=True)
+        with open(input_path, "r", encoding="utf-8") as src, \
+                open(os.path.join(batch_dir, "input.jsonl"), "w", encoding="utf-8") as dst:
+            dst.write(src.read())
+        with open(os.path.join(batch_dir, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(metadata or {}, f)
+        logger.info(f"📦 Submitted local batch {batch_id} ({input_path})")
+        return batch_id
+
+    def _process(self, batch_id: str) -> None:
+        """Answer every request in the batch and write output.jsonl"""
+        from src.data.stub_server import ResponseGenerator, StubConfig
+
+        generator = ResponseGenerator(StubConfig(seed=self.seed))
+        batch_dir = self._batch_dir(batch_id)
+        lines = []
+        with open(os.path.join(batch_dir, "input.jsonl"), "r", encoding="utf-8") as f:
+            for index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                body = request["body"]
+                prompt = next(
+                    (m["content"] for m in reversed(body["messages"]) if m["role"] == "user"), ""
+                )
+                choices = [
+                    {
+                        "index": i,
+                        "message": {"role": "assistant", "content": generator.answer(prompt, i)["content"]},
+                        "finish_reason": "stop"
+                    }
+                    for i in range(body.get("n", 1))
+                ]
+                lines.append({
+                    "id": f"{batch_id}_req_{index}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "request_id": f"{batch_id}_{index}",
+                        "body": {"object": "chat.completion", "model": body["model"], "choices": choices}
+                    },
+                    "error": None
+                })
+        with open(os.path.join(batch_dir, "output.jsonl"), "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        batch_dir = self._batch_dir(batch_id)
+        if not os.path.isdir(batch_dir):
+            raise FileNotFoundError(f"Unknown local batch: {batch_id}")
+        output_path = os.path.join(batch_dir, "output.jsonl")
+        if not os.path.exists(output_path):
+            self._process(batch_id)
+        with open(output_path, "r", encoding="utf-8") as f:
+            completed = sum(1 for line in f if line.strip())
+        return {
+            "id": batch_id,
+            "status": "completed",
+            "output_file_id": output_path,
+            "error_file_id": None,
+            "request_counts": {"total": completed, "completed": completed, "failed": 0}
+        }
+
+    async def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        status = await self.status(batch_id)
+        with open(status["output_file_id"], "r", encoding="utf-8") as f:
+            return parse_batch_output(f.read())
+
+
+def get_batch_backend(name: Optional[str] = None) -> BatchBackend:
+    """
+    Create a batch backend
+
+    Args:
+        name: "openai" or "local" (default settings.batch_backend)
+
+    Returns:
+        BatchBackend instance
+    """
+    name = name or settings.batch_backend
+    if name == "openai":
+        return OpenAIBatchBackend()
+    if name == "local":
+        return LocalBatchBackend()
+    raise ValueError(f"Unknown batch backend: {name}")
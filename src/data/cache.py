@@ -0,0 +1,233 @@
+"""Persistent response cache for AI platform queries"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    platform: str,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    **params: Any
+) -> str:
+    """
+    Build a stable cache key for a platform query
+
+    Args:
+        platform: Platform name (e.g. "chatgpt")
+        model: Model identifier
+        system_prompt: System prompt sent with the query
+        user_prompt: User prompt (the search query)
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        **params: Any further request parameters that change the response
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps(
+        {
+            "platform": platform,
+            "model": model,
+            "system": system_prompt,
+            "user": user_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **params
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier TTL cache for raw platform responses
+
+    An in-memory LRU tier serves hot keys; an SQLite tier keeps responses
+    across restarts. Entries older than the TTL are treated as misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_memory_entries: int,
+        max_disk_entries: int
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite tier on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: Any, created_at: float) -> None:
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._expired(created_at):
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+            return json.loads(value), created_at
+
+    def _disk_set(self, key: str, value: Any, created_at: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), created_at, created_at)
+            )
+            # LRU eviction on disk: drop the least recently accessed overflow
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            conn.commit()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            Cached value or None on miss
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, created_at = entry
+            if not self._expired(created_at):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return value
+            self._memory.pop(key, None)
+
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            logger.warning(f"⚠️  Response cache read failed: {e}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, created_at = entry
+        self._remember(key, value, created_at)
+        self.hits += 1
+        self.disk_hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Key from make_cache_key
+            value: JSON-serializable response
+        """
+        created_at = time.time()
+        self._remember(key, value, created_at)
+        self.writes += 1
+        try:
+            await asyncio.to_thread(self._disk_set, key, value, created_at)
+        except Exception as e:
+            logger.warning(f"⚠️  Response cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached responses from both tiers"""
+        self._memory.clear()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.response_cache_enabled,
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Global cache instance (SQLite file is opened lazily)
+response_cache = ResponseCache(
+    path=settings.response_cache_path,
+    ttl_seconds=settings.response_cache_ttl,
+    max_memory_entries=settings.response_cache_max_memory_entries,
+    max_disk_entries=settings.response_cache_max_disk_entries
+)
@@ -0,0 +1,220 @@
+"""Record/replay HTTP transport for deterministic offline runs"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the original wire framing rather than the payload
+_FRAMING_HEADERS = {"content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class CassetteMissError(Exception):
+    """Replay mode found no recorded response for a request"""
+
+
+class Cassette:
+    """
+    Append-only JSONL store of recorded HTTP exchanges
+
+    Each entry holds the request key, the response status, headers and body,
+    and the latency observed while recording. Requests with the same key are
+    replayed in recording order, cycling when the recording is exhausted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        logger.info(
+            f"📼 Loaded cassette {self.path} "
+            f"({sum(len(v) for v in self._entries.values())} recorded responses)"
+        )
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        """
+        Identify a request independently of credentials and JSON key order
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Hex digest of method, URL and canonical body
+        """
+        body = request.content or b""
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            pass
+        digest = hashlib.sha256()
+        digest.update(request.method.encode("utf-8"))
+        digest.update(str(request.url).encode("utf-8"))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: bytes,
+        latency: float
+    ) -> None:
+        """Append one exchange to the cassette"""
+        entry = {
+            "key": self.key_for(request),
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [
+                [name, value] for name, value in response.headers.items()
+                if name.lower() not in _FRAMING_HEADERS
+            ],
+            "body": base64.b64encode(body).decode("ascii"),
+            "latency": latency,
+            "recorded_at": time.time()
+        }
+        with self._lock:
+            self._entries[entry["key"]].append(entry)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def next(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        """Next recorded response for a request, or None if never recorded"""
+        key = self.key_for(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            entry = entries[self._cursor[key] % len(entries)]
+            self._cursor[key] += 1
+            return entry
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records real exchanges or replays them offline
+
+    Sits under every outbound client (OpenAI SDK, LangChain ChatOpenAI,
+    Perplexity and the scraper), so the whole pipeline can run with no
+    network once a cassette has been recorded.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str,
+        wrapped: Optional[httpx.AsyncBaseTransport] = None,
+        replay_timing: bool = False
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.wrapped = wrapped or httpx.AsyncHTTPTransport()
+        self.replay_timing = replay_timing
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            entry = self.cassette.next(request)
+            if entry is None:
+                raise CassetteMissError(
+                    f"No recorded response for {request.method} {request.url} "
+                    f"in {self.cassette.path}"
+                )
+            if self.replay_timing:
+                await asyncio.sleep(entry["latency"])
+            return httpx.Response(
+                entry["status"],
+                headers=entry["headers"],
+                content=base64.b64decode(entry["body"]),
+                request=request
+            )
+
+        start = time.monotonic()
+        response = await self.wrapped.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        latency = time.monotonic() - start
+
+        self.cassette.record(request, response, body, latency)
+
+        return httpx.Response(
+            response.status_code,
+            headers=[
+                (name, value) for name, value in response.headers.items()
+                if name.lower() not in _FRAMING_HEADERS
+            ],
+            content=body,
+            request=request,
+            extensions=response.extensions
+        )
+
+    async def aclose(self) -> None:
+        await self.wrapped.aclose()
+
+
+_cassette: Optional[Cassette] = None
+
+
+def cassette_enabled() -> bool:
+    """Whether record or replay mode is configured"""
+    return settings.cassette_mode in ("record", "replay")
+
+
+def get_cassette() -> Cassette:
+    """Process-wide cassette loaded from settings.cassette_path"""
+    global _cassette
+    if _cassette is None:
+        _cassette = Cassette(settings.cassette_path)
+        logger.info(f"📼 Cassette mode: {settings.cassette_mode} ({settings.cassette_path})")
+    return _cassette
+
+
+def wrap_transport(transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """
+    Wrap a transport with the cassette layer when record/replay is configured
+
+    Args:
+        transport: Real network transport
+
+    Returns:
+        CassetteTransport or the transport unchanged
+    """
+    if not cassette_enabled():
+        return transport
+    return CassetteTransport(
+        get_cassette(),
+        settings.cassette_mode,
+        wrapped=transport,
+        replay_timing=settings.cassette_replay_timing
+    )
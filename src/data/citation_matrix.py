@@ -0,0 +1,179 @@
+"""Columnar citation x domain representation for vectorized visibility metrics"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.ranking import first_ranks
+from src.models.schemas import CitationData, MentionSpan, Platform
+
+# Stable platform codes for the platform column
+PLATFORMS: List[Platform] = list(Platform)
+_PLATFORM_CODE = {platform: code for code, platform in enumerate(PLATFORMS)}
+
+
+def first_span_ranks(spans: Sequence[MentionSpan]) -> Dict[str, Optional[int]]:
+    """Rank per domain mentioned in a citation (see ranking.first_ranks)"""
+    return first_ranks([span.domain for span in spans], [span.rank for span in spans])
+
+
+class CitationMatrix:
+    """
+    Citations as NumPy columns plus citation x domain matrices
+
+    Built in one pass over the CitationData objects; every metric afterwards
+    is a reduction over the arrays, so scoring many domains over thousands
+    of responses does not loop in Python.
+
+    Attributes:
+        domains: Column order of the domain matrices
+        queries: Distinct queries, indexed by `query_ids`
+        platform_codes: (n,) index into PLATFORMS
+        query_ids: (n,) index into `queries`
+        brand_mentioned: (n,) the citation's brand flag
+        citation_position: (n,) the citation's position, NaN when unknown
+        distinct: (n,) False for near-duplicates of an earlier response
+        clustered: Whether near-duplicate clustering ran on the citations
+        mentioned: (n, d) whether each domain is mentioned in each citation
+        positions: (n, d) list rank of each mention, NaN when unranked
+    """
+
+    def __init__(self, citations: Sequence[CitationData], domains: Sequence[str]):
+        """
+        Args:
+            citations: Collected citations
+            domains: Domains to build columns for (brand first, then competitors)
+        """
+        self.domains = list(dict.fromkeys(domains))
+        self.domain_index = {domain: idx for idx, domain in enumerate(self.domains)}
+        n, d = len(citations), len(self.domains)
+
+        query_index: Dict[str, int] = {}
+        platform_codes: List[int] = []
+        query_ids: List[int] = []
+        brand_mentioned: List[bool] = []
+        citation_position: List[float] = []
+        distinct: List[bool] = []
+        clustered = False
+        # Sparse (row, col, position) triples, scattered into the matrices at the end
+        rows: List[int] = []
+        cols: List[int] = []
+        span_positions: List[float] = []
+        from_span: List[bool] = []
+
+        lowered_domains = {domain.lower(): idx for idx, domain in enumerate(self.domains)}
+        for row, citation in enumerate(citations):
+            platform_codes.append(_PLATFORM_CODE[citation.platform])
+            query_ids.append(query_index.setdefault(citation.query, len(query_index)))
+            brand_mentioned.append(citation.brand_mentioned)
+            citation_position.append(citation.citation_position or np.nan)
+            distinct.append(not citation.near_duplicate)
+            clustered = clustered or citation.duplicate_cluster is not None
+
+            seen = set()
+            for domain, rank in first_span_ranks(citation.mentions).items():
+                col = self.domain_index.get(domain)
+                if col is not None:
+                    seen.add(col)
+                    rows.append(row)
+                    cols.append(col)
+                    span_positions.append(np.nan if rank is None else rank)
+                    from_span.append(True)
+
+            for domain in citation.competitors_mentioned:
+                col = self.domain_index.get(domain)
+                if col is not None and col not in seen:
+                    seen.add(col)
+                    rows.append(row)
+                    cols.append(col)
+                    span_positions.append(np.nan)
+                    from_span.append(False)
+            if citation.brand_mentioned:
+                col = lowered_domains.get(citation.query.lower())
+                if col is not None and col not in seen:
+                    rows.append(row)
+                    cols.append(col)
+                    span_positions.append(np.nan)
+                    from_span.append(False)
+
+        self.platform_codes = np.array(platform_codes, dtype=np.int8)
+        self.query_ids = np.array(query_ids, dtype=np.int32)
+        self.brand_mentioned = np.array(brand_mentioned, dtype=bool)
+        self.citation_position = np.array(citation_position, dtype=np.float64)
+        self.distinct = np.array(distinct, dtype=bool)
+        self.clustered = clustered
+
+        self.mentioned = np.zeros((n, d), dtype=bool)
+        self.mentioned[rows, cols] = True
+        self.positions = np.full((n, d), np.nan)
+        self.positions[rows, cols] = span_positions
+
+        # Mentions without a span fall back to the citation's own position
+        spanned = np.zeros((n, d), dtype=bool)
+        spanned[rows, cols] = from_span
+        fallback = self.mentioned & ~spanned
+        self.positions = np.where(fallback, self.citation_position[:, None], self.positions)
+
+        self.queries = list(query_index)
+
+    def __len__(self) -> int:
+        return len(self.platform_codes)
+
+    def mention_counts(self) -> np.ndarray:
+        """(d,) citations mentioning each domain"""
+        return self.mentioned.sum(axis=0)
+
+    def mention_rates(self) -> np.ndarray:
+        """(d,) share of citations mentioning each domain"""
+        if not len(self):
+            return np.zeros(len(self.domains))
+        return self.mention_counts() / len(self)
+
+    def dedup_mention_rates(self) -> Optional[np.ndarray]:
+        """(d,) share of distinct responses mentioning each domain, None without clustering"""
+        if not self.clustered or not self.distinct.any():
+            return None
+        return self.mentioned[self.distinct].mean(axis=0)
+
+    def avg_positions(self) -> List[Optional[float]]:
+        """Mean estimated position per domain, None when never positioned"""
+        known = ~np.isnan(self.positions)
+        counts = known.sum(axis=0)
+        totals = np.where(known, self.positions, 0.0).sum(axis=0)
+        return [float(total / count) if count else None for total, count in zip(totals, counts)]
+
+    def platform_mentions(self) -> np.ndarray:
+        """(platforms, d) mention counts per platform and domain"""
+        one_hot = np.zeros((len(self), len(PLATFORMS)), dtype=np.int64)
+        one_hot[np.arange(len(self)), self.platform_codes] = 1
+        return one_hot.T @ self.mentioned.astype(np.int64)
+
+    def platform_brand_rates(self) -> Dict[str, float]:
+        """Share of citations flagged as mentioning the brand, per platform"""
+        totals = np.bincount(self.platform_codes, minlength=len(PLATFORMS))
+        hits = np.bincount(self.platform_codes, weights=self.brand_mentioned, minlength=len(PLATFORMS))
+        return {
+            PLATFORMS[code].value: float(hits[code] / totals[code])
+            for code in np.flatnonzero(totals)
+        }
+
+    def group_rates(
+        self,
+        keys: np.ndarray,
+        values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Mean of boolean columns per group
+
+        Args:
+            keys: (n,) integer group key per citation
+            values: (n,) or (n, k) booleans
+
+        Returns:
+            (group keys, group sizes, per-group means)
+        """
+        groups, inverse, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        values = (values[:, None] if values.ndim == 1 else values).astype(np.float64)
+        sums = np.zeros((len(groups), values.shape[1]))
+        np.add.at(sums, inverse, values)
+        return groups, sizes, sums / sizes[:, None]
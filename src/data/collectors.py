@@ -0,0 +1,383 @@
+"""Pluggable platform collectors and the registry the orchestrator schedules"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.data.cache import make_cache_key, response_cache
+from src.data.hedging import hedged
+from src.data.http import get_http_client, request_timeout
+from src.data.matcher import extract_mentions
+from src.data.openai_client import OpenAIClient
+from src.data.perplexity import PerplexityClient
+from src.data.rate_limiter import estimate_tokens, get_rate_limiter
+from src.data.resilience import get_resilience_policy
+from src.data.singleflight import platform_flights
+from src.models.schemas import CitationData, Platform
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformCollector(ABC):
+    """
+    Common async interface for collecting citations from one AI platform
+
+    Subclasses set the class attributes and implement `search` and `extract`.
+    Concurrency is enforced by the provider's rate limiter, which is the
+    collector's own pool; timeouts are clamped by the analysis deadline.
+    """
+
+    platform: Platform
+    provider: str  # Name of the rate limiter / resilience / hedge policy
+    COST_PER_CALL = 0.0  # Estimated USD per upstream call
+
+    @property
+    def max_concurrency(self) -> int:
+        return get_rate_limiter(self.provider).max_concurrency
+
+    @property
+    def timeout(self) -> float:
+        return settings.http_timeout
+
+    def available(self) -> bool:
+        """Whether the collector is configured (API key present)"""
+        return True
+
+    @abstractmethod
+    async def search(self, query: str, fresh: bool = False, samples: int = 1) -> Any:
+        """
+        Query the platform
+
+        Args:
+            query: User prompt
+            fresh: Bypass the response cache and request coalescing (a new upstream call)
+            samples: Completions requested per prompt (platforms without
+                native sampling return one)
+
+        Returns:
+            Raw platform response
+        """
+
+    @abstractmethod
+    def extract(
+        self,
+        response: Any,
+        query: str,
+        brand_domain: str,
+        competitors: List[str]
+    ) -> List[CitationData]:
+        """
+        Turn a platform response into citation records
+
+        Args:
+            response: Value returned by search()
+            query: Original query
+            brand_domain: Brand domain to check
+            competitors: Competitor domains
+
+        Returns:
+            One CitationData per sampled answer
+        """
+
+    async def collect(
+        self,
+        query: str,
+        brand_domain: str,
+        competitors: List[str],
+        fresh: bool = False,
+        samples: int = 1
+    ) -> List[CitationData]:
+        """Search and extract in one step"""
+        try:
+            response = await self.search(query, fresh=fresh, samples=samples)
+            return self.extract(response, query, brand_domain, competitors)
+        except Exception as e:
+            logger.error(f"{self.platform.value} query failed for '{query}': {str(e)}")
+            raise
+
+    def describe(self) -> Dict[str, Any]:
+        """Collector properties for monitoring and the reasoning trace"""
+        return {
+            "provider": self.provider,
+            "available": self.available(),
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "cost_per_call_usd": self.COST_PER_CALL
+        }
+
+
+def extract_text_citation(
+    response: str,
+    query: str,
+    platform: Platform,
+    brand_domain: str,
+    competitors: List[str],
+    sample_index: int = 0
+) -> CitationData:
+    """
+    Citation record for a plain-text answer (no source list)
+
+    Args:
+        response: Answer text
+        query: Original query
+        platform: Platform that produced the answer
+        brand_domain: Brand domain to check
+        competitors: Competitor domains
+        sample_index: Index of this answer among samples of the same prompt
+
+    Returns:
+        CitationData object
+    """
+    found = extract_mentions(response, brand_domain, competitors)
+
+    return CitationData(
+        query=query,
+        platform=platform,
+        brand_mentioned=found.brand_mentioned,
+        citation_position=found.brand_rank,  # List rank of the brand
+        context=response[:500],
+        competitors_mentioned=found.competitors_mentioned,
+        mentions=found.spans,
+        raw_response=response,
+        sample_index=sample_index
+    )
+
+
+class ChatGPTCollector(PlatformCollector):
+    """ChatGPT via the OpenAI SDK; samples use the native `n` parameter"""
+
+    platform = Platform.CHATGPT
+    provider = "openai_chat"
+    COST_PER_CALL = 0.01
+
+    def __init__(self, client: Optional[OpenAIClient] = None):
+        self.client = client or OpenAIClient()
+
+    async def search(self, query: str, fresh: bool = False, samples: int = 1) -> List[str]:
+        return await self.client.search_samples(query, samples, fresh=fresh)
+
+    def extract(self, response, query, brand_domain, competitors):
+        return [
+            self.client.extract_citations(
+                content, query, brand_domain, competitors, sample_index=idx
+            )
+            for idx, content in enumerate(response)
+        ]
+
+
+class PerplexityCollector(PlatformCollector):
+    """Perplexity Sonar (simulated responses when no API key is set)"""
+
+    platform = Platform.PERPLEXITY
+    provider = "perplexity"
+    COST_PER_CALL = 0.005
+
+    def __init__(self, client: Optional[PerplexityClient] = None):
+        self.client = client or PerplexityClient()
+
+    @property
+    def timeout(self) -> float:
+        return settings.perplexity_timeout
+
+    async def search(self, query: str, fresh: bool = False, samples: int = 1) -> Dict:
+        return await self.client.search(query, fresh=fresh)
+
+    def extract(self, response, query, brand_domain, competitors):
+        return [self.client.extract_citations(response, query, brand_domain, competitors)]
+
+
+class HTTPTextCollector(PlatformCollector):
+    """
+    Collector for chat APIs called over the shared HTTP client
+
+    Provides the standard layering (response cache, request coalescing,
+    hedging, retries, rate limiting); subclasses only describe the request
+    and how to read the answer text.
+    """
+
+    SEARCH_SYSTEM_PROMPT = OpenAIClient.SEARCH_SYSTEM_PROMPT
+    SEARCH_TEMPERATURE = OpenAIClient.SEARCH_TEMPERATURE
+    SEARCH_MAX_TOKENS = OpenAIClient.SEARCH_MAX_TOKENS
+
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Model name, part of the response cache key"""
+
+    @abstractmethod
+    def build_request(self, query: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """URL, headers and JSON payload for one query"""
+
+    @abstractmethod
+    def parse_response(self, data: Dict[str, Any]) -> str:
+        """Answer text from the decoded JSON response"""
+
+    async def search(self, query: str, fresh: bool = False, samples: int = 1) -> str:
+        cache_key = make_cache_key(
+            self.platform.value, self.model, self.SEARCH_SYSTEM_PROMPT, query,
+            self.SEARCH_TEMPERATURE, self.SEARCH_MAX_TOKENS
+        )
+        if settings.response_cache_enabled and not fresh:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"💾 Cache hit for {self.platform.value}: '{query}'")
+                return cached
+
+        if fresh:
+            # A fresh sample is its own upstream call, never a copy of a concurrent one
+            return await self._fetch(query, cache_key)
+
+        # Identical concurrent queries share one upstream request
+        return await platform_flights.do(cache_key, lambda: self._fetch(query, cache_key))
+
+    async def _fetch(self, query: str, cache_key: str) -> str:
+        """Perform the upstream request and cache the answer"""
+        url, headers, payload = self.build_request(query)
+        logger.info(f"🤖 Querying {self.platform.value}: '{query}'")
+
+        limiter = get_rate_limiter(self.provider)
+
+        async def request():
+            response = await get_http_client().post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=request_timeout(self.timeout)
+            )
+            if response.status_code == 429:
+                limiter.record_rate_limited(response.headers)
+            else:
+                limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            return self.parse_response(response.json())
+
+        async def attempt():
+            budget = estimate_tokens(self.SEARCH_SYSTEM_PROMPT + query) + self.SEARCH_MAX_TOKENS
+            async with limiter.acquire(tokens=budget):
+                # Only the request itself is hedged, once its slot is granted
+                return await hedged(self.provider, request)
+
+        content = await get_resilience_policy(self.provider).call(attempt)
+
+        logger.info("="*60)
+        logger.info(f"🤖 {self.platform.value.upper()} RESPONSE for '{query}':")
+        logger.info("-"*60)
+        logger.info(content[:500] + "..." if len(content) > 500 else content)
+        logger.info("="*60)
+
+        if settings.response_cache_enabled and content:
+            await response_cache.set(cache_key, content)
+        return content
+
+    def extract(self, response, query, brand_domain, competitors):
+        return [extract_text_citation(response, query, self.platform, brand_domain, competitors)]
+
+
+class ClaudeCollector(HTTPTextCollector):
+    """Anthropic Claude via the Messages API"""
+
+    platform = Platform.CLAUDE
+    provider = "anthropic"
+    COST_PER_CALL = 0.01
+    API_VERSION = "2023-06-01"
+
+    @property
+    def model(self) -> str:
+        return settings.claude_model
+
+    @property
+    def timeout(self) -> float:
+        return settings.anthropic_timeout
+
+    def available(self) -> bool:
+        return bool(settings.anthropic_api_key)
+
+    def build_request(self, query):
+        return (
+            f"{settings.anthropic_base_url.rstrip('/')}/v1/messages",
+            {
+                "x-api-key": settings.anthropic_api_key or "",
+                "anthropic-version": self.API_VERSION,
+                "content-type": "application/json"
+            },
+            {
+                "model": self.model,
+                "max_tokens": self.SEARCH_MAX_TOKENS,
+                "temperature": self.SEARCH_TEMPERATURE,
+                "system": self.SEARCH_SYSTEM_PROMPT,
+                "messages": [{"role": "user", "content": query}]
+            }
+        )
+
+    def parse_response(self, data):
+        return "".join(
+            block.get("text", "") for block in data.get("content", []) if block.get("type") == "text"
+        )
+
+
+class GoogleAICollector(HTTPTextCollector):
+    """Google Gemini via the Generative Language API"""
+
+    platform = Platform.GOOGLE_AI
+    provider = "google_ai"
+    COST_PER_CALL = 0.001
+
+    @property
+    def model(self) -> str:
+        return settings.google_ai_model
+
+    @property
+    def timeout(self) -> float:
+        return settings.google_ai_timeout
+
+    def available(self) -> bool:
+        return bool(settings.google_ai_api_key)
+
+    def build_request(self, query):
+        return (
+            f"{settings.google_ai_base_url.rstrip('/')}/v1beta/models/{self.model}:generateContent",
+            {
+                "x-goog-api-key": settings.google_ai_api_key or "",
+                "content-type": "application/json"
+            },
+            {
+                "systemInstruction": {"parts": [{"text": self.SEARCH_SYSTEM_PROMPT}]},
+                "contents": [{"role": "user", "parts": [{"text": query}]}],
+                "generationConfig": {
+                    "temperature": self.SEARCH_TEMPERATURE,
+                    "maxOutputTokens": self.SEARCH_MAX_TOKENS
+                }
+            }
+        )
+
+    def parse_response(self, data):
+        candidates = data.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+
+class CollectorRegistry:
+    """Platform -> collector mapping used by the orchestrator"""
+
+    def __init__(self):
+        self._collectors: Dict[Platform, PlatformCollector] = {}
+
+    def register(self, collector: PlatformCollector) -> None:
+        """Register (or replace) the collector for its platform"""
+        self._collectors[collector.platform] = collector
+
+    def get(self, platform: Platform) -> Optional[PlatformCollector]:
+        return self._collectors.get(platform)
+
+    def platforms(self) -> List[Platform]:
+        return list(self._collectors)
+
+    def stats(self) -> Dict[str, Any]:
+        return {platform.value: c.describe() for platform, c in self._collectors.items()}
+
+
+# Global registry with the built-in collectors
+collector_registry = CollectorRegistry()
+for _collector in (ChatGPTCollector(), PerplexityCollector(), ClaudeCollector(), GoogleAICollector()):
+    collector_registry.register(_collector)
@@ -0,0 +1,154 @@
+"""Bounded, diverse selection of brand-mention contexts for LLM prompts"""
+
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.data.near_duplicates import LSHIndex, MinHasher, min_hasher
+from src.data.rate_limiter import estimate_tokens
+from src.models.schemas import CitationData
+
+# Sentence boundaries a window is snapped to
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+
+
+class ContextSnippet(NamedTuple):
+    """Text around one brand mention"""
+    text: str
+    platform: str
+    query: str
+    rank: Optional[int]
+
+
+def snippet_window(text: str, start: int, end: int, window: int) -> str:
+    """
+    Sentence-aligned text around a mention
+
+    Args:
+        text: Response text
+        start: Mention start offset
+        end: Mention end offset
+        window: Maximum characters taken on each side
+
+    Returns:
+        The mention's sentence(s), clipped to `window` characters each way
+    """
+    lower = max(0, start - window)
+    upper = min(len(text), end + window)
+    # Start after the last sentence end before the mention, end at the first one after it
+    head = None
+    for head in _SENTENCE_END.finditer(text, lower, start):
+        pass
+    left = head.end() if head is not None else lower
+    tail = _SENTENCE_END.search(text, end, upper)
+    right = tail.end() if tail is not None else upper
+    return " ".join(text[left:right].split())
+
+
+class ContextSelector:
+    """
+    Picks a small, diverse set of mention contexts under a token budget
+
+    Each brand-mentioning response contributes one window around its first
+    brand mention. Windows that are near-duplicates of one already kept
+    (MinHash estimate, LSH lookup) are dropped; the rest are chosen greedily,
+    always taking the window least similar to those selected so far, until
+    the snippet count or token budget is reached. The output size is
+    bounded regardless of how many responses were collected.
+    """
+
+    def __init__(
+        self,
+        max_snippets: int,
+        token_budget: int,
+        window: int,
+        dedup_threshold: float,
+        hasher: MinHasher = min_hasher,
+        bands: int = 16
+    ):
+        self.max_snippets = max_snippets
+        self.token_budget = token_budget
+        self.window = window
+        self.dedup_threshold = dedup_threshold
+        self.hasher = hasher
+        self.bands = bands
+
+    def candidates(self, citations: Sequence[CitationData], brand_domain: str) -> List[ContextSnippet]:
+        """Windows around the first brand mention of each distinct response, best ranked first"""
+        snippets = []
+        for citation in citations:
+            if not citation.brand_mentioned or citation.near_duplicate:
+                continue
+            span = citation.first_mention(brand_domain)
+            if span is not None:
+                text = snippet_window(citation.raw_response, span.start, span.end, self.window)
+                rank = span.rank
+            elif citation.context:
+                text = " ".join(citation.context[:2 * self.window].split())
+                rank = citation.citation_position
+            else:
+                continue
+            snippets.append(ContextSnippet(text, citation.platform.value, citation.query, rank))
+        # Stable: ties keep collection order
+        return sorted(snippets, key=lambda snippet: snippet.rank if snippet.rank is not None else float("inf"))
+
+    def select(self, citations: Sequence[CitationData], brand_domain: str) -> List[ContextSnippet]:
+        """
+        Diverse top-k contexts within the token budget
+
+        Args:
+            citations: Collected citations
+            brand_domain: Brand whose mentions are extracted
+
+        Returns:
+            Selected snippets in selection order
+        """
+        index = LSHIndex(self.hasher.num_perm, self.bands)
+        unique: List[ContextSnippet] = []
+        signatures = []
+        seen_texts = set()
+        for snippet in self.candidates(citations, brand_domain):
+            # Exact repeats skip the hashing entirely
+            if snippet.text in seen_texts:
+                continue
+            seen_texts.add(snippet.text)
+            signature = self.hasher.signature(snippet.text)
+            if index.nearest(signature, self.dedup_threshold) is not None:
+                continue
+            index.insert(signature)
+            unique.append(snippet)
+            signatures.append(signature)
+        if not unique:
+            return []
+
+        matrix = np.stack(signatures)
+        # Highest similarity of each candidate to anything selected so far
+        closest = np.zeros(len(unique))
+        available = np.ones(len(unique), dtype=bool)
+        selected: List[ContextSnippet] = []
+        used = 0
+        choice = 0  # Best ranked window first
+        while len(selected) < self.max_snippets:
+            cost = estimate_tokens(unique[choice].text)
+            available[choice] = False
+            if used + cost <= self.token_budget:
+                selected.append(unique[choice])
+                used += cost
+                closest = np.maximum(closest, (matrix == matrix[choice]).mean(axis=1))
+            if not available.any():
+                break
+            # Ties go to the better ranked (earlier) candidate
+            choice = int(np.argmin(np.where(available, closest, np.inf)))
+        return selected
+
+
+# Shared selector for hypothesis prompts
+context_selector = ContextSelector(
+    max_snippets=settings.context_max_snippets,
+    token_budget=settings.context_token_budget,
+    window=settings.context_window_chars,
+    dedup_threshold=settings.context_dedup_threshold,
+    bands=settings.dedup_bands
+)
@@ -0,0 +1,95 @@
+"""Per-analysis deadlines propagated to every upstream call"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The analysis ran out of its time budget"""
+
+
+class Deadline:
+    """
+    Absolute time budget for one analysis
+
+    Created from `AnalysisRequest.deadline_ms` and carried both in the graph
+    state (for nodes) and in a context variable (for upstream calls made
+    deep inside the data clients).
+    """
+
+    def __init__(self, budget_ms: float):
+        self.budget = budget_ms / 1000.0
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + self.budget
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def share(self, fraction: float) -> float:
+        """Seconds a step may use if it takes `fraction` of what is left"""
+        return self.remaining() * fraction
+
+    def timeout(self, default: float) -> float:
+        """
+        Clamp an upstream timeout to the remaining budget
+
+        Args:
+            default: Timeout the call would use without a deadline
+
+        Returns:
+            The smaller of `default` and the remaining budget
+        """
+        return min(default, self.remaining())
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the analysis the current task belongs to, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Make `deadline` visible to upstream calls made within the block
+
+    Tasks created inside the block (graph nodes, gathered queries) inherit
+    the deadline through the copied context.
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def upstream_timeout(default: float) -> float:
+    """
+    Timeout for an upstream request under the current deadline
+
+    Args:
+        default: Timeout the call would use without a deadline
+
+    Returns:
+        Timeout in seconds
+
+    Raises:
+        DeadlineExceeded: The deadline has already passed
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    if deadline.expired():
+        raise DeadlineExceeded("analysis deadline exceeded before upstream call")
+    return deadline.timeout(default)
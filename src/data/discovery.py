@@ -0,0 +1,337 @@
+"""
+Competitor auto-discovery - heavy hitters among entities in AI answers
+
+Every response (and every Perplexity source URL) is scanned once for
+domains, URLs and capitalized brand-like names. Entity counts go into
+bounded-memory count-min sketches with a top-k candidate set, one across
+the whole history and one per query, so frequently cited domains the user
+is not tracking surface without keeping exact counts of every entity ever
+seen.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.data.matcher import domain_aliases
+from src.data.public_suffix import registrable_domain
+from src.models.schemas import CitationData, DiscoveredCompetitor
+
+logger = logging.getLogger(__name__)
+
+# Domains (optionally as URLs) or runs of up to three capitalized words
+_ENTITY = re.compile(
+    r"(?P<domain>(?i:\b(?:https?://)?(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,24})\b)"
+    r"|(?P<name>\b[A-Z][A-Za-z0-9]*[a-z][A-Za-z0-9]*(?:[ ][A-Z][A-Za-z0-9]*[a-z][A-Za-z0-9]*){0,2}\b)"
+)
+
+# Capitalized words that start sentences or list items rather than name a product
+_STOPWORDS = {
+    "a", "about", "additionally", "all", "also", "an", "and", "another", "any", "are", "as",
+    "at", "based", "be", "best", "both", "but", "by", "can", "choose", "choosing", "consider",
+    "considerations", "conclusion", "each", "either", "ensure", "even", "every", "features",
+    "finally", "first", "for", "from", "further", "here", "however", "if", "in", "it", "its",
+    "key", "many", "more", "most", "my", "no", "not", "note", "of", "on", "one", "or",
+    "other", "others", "our", "overall", "pricing", "pros", "cons", "second", "see", "so",
+    "some", "such", "summary", "that", "the", "their", "then", "there", "these", "they",
+    "third", "this", "those", "to", "top", "ultimately", "use", "used", "using", "we",
+    "what", "when", "where", "whether", "which", "while", "why", "with", "you", "your"
+}
+
+
+def extract_entities(text: str) -> Set[str]:
+    """
+    Domains and brand-like names in a text, in one regex pass
+
+    Args:
+        text: Response text or source URL
+
+    Returns:
+        Normalized entity keys: registrable domains and lowercased names
+    """
+    entities: Set[str] = set()
+    if not text:
+        return entities
+    for match in _ENTITY.finditer(text):
+        domain = match.group("domain")
+        if domain:
+            registrable = registrable_domain(domain)
+            if registrable:
+                entities.add(registrable)
+            continue
+        words = match.group("name").split(" ")
+        # Drop sentence-opening words ("The", "Overall") in front of a name
+        while words and words[0].lower() in _STOPWORDS:
+            words = words[1:]
+        if words and len(words[0]) > 2:
+            entities.add(" ".join(words).lower())
+    return entities
+
+
+class CountMinSketch:
+    """Count-min sketch: overestimating counts in fixed memory"""
+
+    def __init__(self, width: int, depth: int):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    def _indices(self, item: str) -> np.ndarray:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype="<u4").astype(np.int64) % self.width
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Add to an item's count and return its new estimate"""
+        idx = self._indices(item)
+        self.table[self._rows, idx] += count
+        return int(self.table[self._rows, idx].min())
+
+    def estimate(self, item: str) -> int:
+        return int(self.table[self._rows, self._indices(item)].min())
+
+
+class HeavyHitters:
+    """
+    Top-k frequent items over a stream
+
+    A count-min sketch estimates every item's count; only the k items with
+    the largest estimates are kept as candidates.
+    """
+
+    def __init__(self, k: int, width: int, depth: int):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates: Dict[str, int] = {}
+        self.observations = 0
+
+    def add(self, item: str) -> None:
+        estimate = self.sketch.add(item)
+        if item in self.candidates or len(self.candidates) < self.k:
+            self.candidates[item] = estimate
+            return
+        weakest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[weakest]:
+            del self.candidates[weakest]
+            self.candidates[item] = estimate
+
+    def add_document(self, entities: Iterable[str]) -> None:
+        """Count each entity of one response once"""
+        self.observations += 1
+        for entity in entities:
+            self.add(entity)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(item, estimated count) pairs, most frequent first"""
+        ranked = sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:n] if n else ranked
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "width": self.sketch.width,
+            "depth": self.sketch.depth,
+            "table": self.sketch.table.tolist(),
+            "candidates": self.candidates,
+            "observations": self.observations
+        }
+
+    def copy(self) -> "HeavyHitters":
+        """Independent copy, e.g. to serialize while counting continues"""
+        hitters = HeavyHitters(self.k, self.sketch.width, self.sketch.depth)
+        hitters.sketch.table = self.sketch.table.copy()
+        hitters.candidates = dict(self.candidates)
+        hitters.observations = self.observations
+        return hitters
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HeavyHitters":
+        hitters = cls(data["k"], data["width"], data["depth"])
+        hitters.sketch.table = np.array(data["table"], dtype=np.int64)
+        hitters.candidates = {item: int(count) for item, count in data["candidates"].items()}
+        hitters.observations = data["observations"]
+        return hitters
+
+
+class DiscoveryTracker:
+    """
+    Heavy hitters across all responses and per query
+
+    Per-query sketches are smaller and kept for the most recently seen
+    queries only, so memory stays bounded regardless of history size.
+    With a `path`, sketches are written every `save_interval` analyses (and
+    on shutdown) from a worker thread, never on the event loop.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        width: int,
+        depth: int,
+        query_width: int,
+        max_queries: int,
+        path: Optional[str] = None,
+        save_interval: int = 1
+    ):
+        self.k = k
+        self.depth = depth
+        self.query_width = query_width
+        self.max_queries = max_queries
+        self.path = path
+        self.save_interval = save_interval
+        self.unsaved = 0  # Analyses observed since the last save
+        self._save_lock = threading.Lock()
+        self.overall = HeavyHitters(k, width, depth)
+        self.queries: "OrderedDict[str, HeavyHitters]" = OrderedDict()
+        if path and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _for_query(self, query: str) -> HeavyHitters:
+        key = self._query_key(query)
+        hitters = self.queries.get(key)
+        if hitters is None:
+            hitters = HeavyHitters(self.k, self.query_width, self.depth)
+            self.queries[key] = hitters
+            while len(self.queries) > self.max_queries:
+                self.queries.popitem(last=False)
+        self.queries.move_to_end(key)
+        return hitters
+
+    def observe(self, query: str, citations: Sequence[CitationData]) -> None:
+        """
+        Count the entities of an analysis' responses and source URLs
+
+        Args:
+            query: Analysis query (the per-query sketch key)
+            citations: Collected citations
+        """
+        per_query = self._for_query(query)
+        for citation in citations:
+            entities = extract_entities(citation.raw_response)
+            for source in citation.sources:
+                entities |= extract_entities(source)
+            self.overall.add_document(entities)
+            per_query.add_document(entities)
+        self.unsaved += 1
+
+    async def save(self, force: bool = False) -> bool:
+        """
+        Persist the sketches once `save_interval` analyses are unsaved
+
+        Args:
+            force: Save any unsaved analyses regardless of the interval (shutdown)
+
+        Returns:
+            Whether the sketches were written
+        """
+        if not self.path or not self.unsaved or (not force and self.unsaved < self.save_interval):
+            return False
+        # Copied on the loop so the thread serializes a consistent state
+        overall = self.overall.copy()
+        queries = {key: hitters.copy() for key, hitters in self.queries.items()}
+        pending, self.unsaved = self.unsaved, 0
+        saved = await asyncio.to_thread(self._save, overall, queries)
+        if not saved:
+            self.unsaved += pending
+        return saved
+
+    def discovered(
+        self,
+        query: Optional[str] = None,
+        tracked: Sequence[str] = (),
+        limit: Optional[int] = None
+    ) -> List[DiscoveredCompetitor]:
+        """
+        Most frequent entities the user does not track yet
+
+        Args:
+            query: Restrict to one query's sketch (None = whole history)
+            tracked: Brand and competitor domains to leave out
+            limit: Maximum entities returned
+
+        Returns:
+            Discovered entities, most frequent first
+        """
+        hitters = self.queries.get(self._query_key(query)) if query else self.overall
+        if hitters is None or not hitters.observations:
+            return []
+
+        known = {alias for forms in domain_aliases(tracked).values() for alias in forms}
+        ranked = hitters.top()
+        domain_names = {item.split(".")[0] for item, _ in ranked if "." in item}
+
+        results = []
+        for item, count in ranked:
+            is_domain = "." in item
+            if item in known or (not is_domain and item in domain_names):
+                # Tracked already, or a bare name whose domain is listed too
+                continue
+            results.append(DiscoveredCompetitor(
+                entity=item,
+                kind="domain" if is_domain else "name",
+                estimated_mentions=count,
+                response_share=min(1.0, count / hitters.observations)
+            ))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "responses_observed": self.overall.observations,
+            "queries_tracked": len(self.queries),
+            "candidates": len(self.overall.candidates)
+        }
+
+    def _save(self, overall: HeavyHitters, queries: Dict[str, HeavyHitters]) -> bool:
+        temp_path = f"{self.path}.tmp"
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "overall": overall.to_dict(),
+                        "queries": {key: hitters.to_dict() for key, hitters in queries.items()}
+                    }, f)
+                os.replace(temp_path, self.path)
+                return True
+            except OSError as e:
+                logger.warning(f"⚠️  Could not save discovery sketch: {e}")
+                return False
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.overall = HeavyHitters.from_dict(data["overall"])
+            self.queries = OrderedDict(
+                (key, HeavyHitters.from_dict(value)) for key, value in data["queries"].items()
+            )
+            logger.info(f"🔭 Loaded discovery sketch ({self.overall.observations} responses)")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️  Could not load discovery sketch: {e}")
+
+
+# Global discovery tracker shared by all analyses
+discovery_tracker = DiscoveryTracker(
+    k=settings.discovery_top_k,
+    width=settings.discovery_sketch_width,
+    depth=settings.discovery_sketch_depth,
+    query_width=settings.discovery_query_sketch_width,
+    max_queries=settings.discovery_max_queries,
+    path=settings.discovery_sketch_path,
+    save_interval=settings.discovery_save_interval
+)
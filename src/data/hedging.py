@@ -0,0 +1,212 @@
+"""Hedged requests to cut tail latency on platform queries"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider"""
+
+    def __init__(self, window: int):
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None with no samples
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class HedgeBudget:
+    """
+    Global cap on duplicate requests
+
+    Every hedgeable call deposits `ratio` tokens and every hedge spends one,
+    so hedges stay a bounded fraction of traffic across all providers.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+
+class HedgePolicy:
+    """
+    Fire one duplicate of a slow call and keep whichever finishes first
+
+    The hedge delay is the provider's rolling latency percentile. Until
+    enough samples exist, calls run unhedged. The policy wraps one upstream
+    request made inside an already granted rate-limiter slot, so the
+    timer and the latency samples cover the same span: neither includes
+    limiter waits or retry backoff, and a hedge never starts a second
+    retry loop. The duplicate shares the original's slot; the hedge
+    budget bounds that extra load.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        budget: HedgeBudget,
+        percentile: float,
+        min_samples: int,
+        window: int
+    ):
+        self.provider = provider
+        self.budget = budget
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while still warming up"""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.percentile)
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        result = await fn()
+        self.latencies.record(time.monotonic() - start)
+        return result
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, hedging it if it outlives the latency threshold
+
+        Args:
+            fn: Zero-argument coroutine factory; called twice when hedging
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            Exception: The first error, if every attempt failed
+        """
+        self.calls += 1
+        self.budget.deposit()
+        delay = self.hedge_delay()
+        tasks = [asyncio.ensure_future(self._timed(fn))]
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    if self.budget.withdraw():
+                        self.hedges += 1
+                        logger.debug(f"🪞 {self.provider}: hedging call after {delay:.2f}s")
+                        tasks.append(asyncio.ensure_future(self._timed(fn)))
+                    else:
+                        logger.debug(f"🪞 {self.provider}: hedge budget exhausted")
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # Cancel the loser; retrieve finished errors so they are not logged as unhandled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge counters and the current threshold"""
+        delay = self.hedge_delay()
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "latency_samples": len(self.latencies),
+            "hedge_delay_seconds": round(delay, 3) if delay is not None else None
+        }
+
+
+# Global hedge budget shared by all providers
+hedge_budget = HedgeBudget(ratio=settings.hedge_budget_ratio)
+
+# Global policies for the platform query providers
+hedge_policies: Dict[str, HedgePolicy] = {
+    provider: HedgePolicy(
+        provider,
+        hedge_budget,
+        percentile=settings.hedge_percentile,
+        min_samples=settings.hedge_min_samples,
+        window=settings.hedge_latency_window
+    )
+    for provider in ("openai_chat", "perplexity", "anthropic", "google_ai")
+}
+
+
+async def hedged(provider: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run a platform call under the provider's hedge policy when hedging is enabled
+
+    Args:
+        provider: Provider name ("openai_chat", "perplexity", "anthropic", "google_ai")
+        fn: Zero-argument coroutine factory sending one upstream request,
+            called inside the caller's rate-limiter slot
+
+    Returns:
+        Result of the call
+    """
+    if not settings.hedging_enabled:
+        return await fn()
+    return await hedge_policies[provider].call(fn)
+
+
+def hedging_stats() -> Dict[str, Any]:
+    """Per-provider hedge metrics plus the shared budget"""
+    return {
+        "enabled": settings.hedging_enabled,
+        "budget_tokens": round(hedge_budget.tokens, 2),
+        "budget_exhausted": hedge_budget.exhausted,
+        "providers": {name: policy.stats() for name, policy in hedge_policies.items()}
+    }
@@ -0,0 +1,132 @@
+"""Shared pooled HTTP transport for outbound API calls"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from src.config import settings
+from src.data.cassette import cassette_enabled, wrap_transport
+from src.data.deadline import upstream_timeout
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_openai_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Create the pooled client from settings"""
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry
+    )
+    timeout = httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout)
+
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        logger.warning("⚠️  HTTP/2 requested but 'h2' is not installed - falling back to HTTP/1.1")
+        http2 = False
+
+    logger.debug(
+        f"Creating pooled HTTP client (max_connections={settings.http_max_connections}, "
+        f"keepalive={settings.http_max_keepalive_connections}, http2={http2})"
+    )
+
+    transport = wrap_transport(httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """
+    Create the process-wide HTTP client
+
+    Called from the FastAPI lifespan hook on startup.
+
+    Returns:
+        The shared AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+        logger.info("🌐 Shared HTTP transport started")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide HTTP client and release pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("🌐 Shared HTTP transport closed")
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client
+
+    Outside the FastAPI app (scripts, examples) the client is created lazily
+    on first use so callers never need to manage its lifecycle.
+
+    Returns:
+        The shared AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def request_timeout(default: float) -> httpx.Timeout:
+    """
+    Per-request timeout under the current deadline
+
+    A bare number passed as `timeout=` replaces every phase of the client's
+    timeout, including its short connect timeout; this keeps the connect
+    limit and clamps both to the remaining analysis budget.
+
+    Args:
+        default: Read/write/pool timeout the call would use without a deadline
+
+    Returns:
+        httpx.Timeout for the request
+
+    Raises:
+        DeadlineExceeded: The deadline has already passed
+    """
+    timeout = upstream_timeout(default)
+    return httpx.Timeout(timeout, connect=min(settings.http_connect_timeout, timeout))
+
+
+def openai_http_client() -> Optional[httpx.AsyncClient]:
+    """
+    HTTP client for the OpenAI SDK and LangChain ChatOpenAI
+
+    Returns None (use the SDK's own client) unless record/replay is
+    configured, in which case OpenAI traffic goes through the cassette too.
+    The client lives for the whole process because SDK clients are created
+    once at import time.
+
+    Returns:
+        AsyncClient with the cassette transport, or None
+    """
+    global _openai_client
+    if not cassette_enabled():
+        return None
+    if _openai_client is None:
+        _openai_client = httpx.AsyncClient(
+            transport=wrap_transport(httpx.AsyncHTTPTransport()),
+            timeout=httpx.Timeout(600.0, connect=settings.http_connect_timeout)
+        )
+    return _openai_client
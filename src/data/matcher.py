@@ -0,0 +1,250 @@
+"""Single-pass multi-domain mention matching"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.data.ranking import assign_ranks, first_ranks
+from src.memory.aliases import alias_registry
+from src.models.schemas import MentionSpan
+
+
+class MentionMatch(NamedTuple):
+    """One occurrence of a tracked domain (or one of its aliases) in a response"""
+    domain: str
+    alias: str
+    start: int  # Character offset in the response
+    end: int  # Character offset one past the match
+    word_index: int  # Number of words before the match
+
+
+def default_aliases(domain: str) -> List[str]:
+    """
+    Surface forms a domain is recognised by
+
+    The domain itself and its bare name ("hubspot" for "hubspot.com"), the
+    same rule the platform extractors already apply.
+
+    Args:
+        domain: Tracked domain
+
+    Returns:
+        Lowercased aliases, domain first
+    """
+    domain = domain.lower().strip()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    aliases = [domain]
+    name = domain.split(".")[0]
+    if name and name != domain:
+        aliases.append(name)
+    return aliases
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _trie_pattern(aliases: Iterable[str]) -> str:
+    """
+    Regular expression for a set of literals, structured as their trie
+
+    Shared prefixes are factored out ("hubspot(?:\\.com)?"), so the regex
+    engine follows one branch per character like a keyword automaton.
+    """
+    trie: Dict[str, dict] = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class MentionMatcher:
+    """
+    Multi-pattern automaton over the aliases of a set of domains
+
+    The alias trie is compiled once per domain set into a single regular
+    expression, so each response is lowercased once and walked once by the
+    C regex engine regardless of how many domains and aliases are tracked.
+    Matches must be whole words; the longest alias at a position wins.
+    """
+
+    def __init__(self, aliases: Dict[str, Sequence[str]]):
+        """
+        Args:
+            aliases: domain -> aliases to match for it
+        """
+        self.domains = list(aliases)
+        self._domains_for: Dict[str, List[str]] = {}
+        for domain, forms in aliases.items():
+            for alias in {form.lower().strip() for form in forms if form and form.strip()}:
+                self._domains_for.setdefault(alias, []).append(domain)
+
+        pattern = _trie_pattern(self._domains_for)
+        # Reject matches followed by more of the same word or hostname
+        self._regex = re.compile(f"(?:{pattern})(?![\\w-]|[.-]\\w)") if pattern else None
+
+    def _iter_matches(self, text: str) -> Iterator[MentionMatch]:
+        if not text or self._regex is None:
+            return
+
+        lowered = text.lower()
+        search = self._regex.search
+        pos = 0
+        counted_to = 0
+        words_before = 0
+
+        while True:
+            found = search(lowered, pos)
+            if found is None:
+                break
+            start, end = found.span()
+            if start > 0 and (_is_word_char(lowered[start - 1]) or lowered[start - 1] == "-"):
+                # Starts mid-word; an alias may still begin inside this match
+                pos = start + 1
+                continue
+
+            # Words before the match, counted incrementally (same as len(text[:start].split()))
+            segment = lowered[counted_to:start]
+            words_before += len(segment.split())
+            if counted_to and segment[:1] and not segment[0].isspace() and not lowered[counted_to - 1].isspace():
+                words_before -= 1  # Word straddles the previous boundary
+            counted_to = start
+
+            alias = found.group()
+            for domain in self._domains_for[alias]:
+                yield MentionMatch(domain, alias, start, end, words_before)
+            pos = end
+
+    def scan(self, text: str) -> List[MentionMatch]:
+        """
+        Find every whole-word alias occurrence in one pass
+
+        Args:
+            text: Response text
+
+        Returns:
+            Matches ordered by position, with character and word offsets
+        """
+        return list(self._iter_matches(text))
+
+    def first_mentions(self, text: str) -> Dict[str, MentionMatch]:
+        """First match per domain in a response; stops once every domain is found"""
+        first: Dict[str, MentionMatch] = {}
+        for match in self._iter_matches(text):
+            first.setdefault(match.domain, match)
+            if len(first) == len(self.domains):
+                break
+        return first
+
+
+@lru_cache(maxsize=256)
+def _compiled(key: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> MentionMatcher:
+    return MentionMatcher({domain: aliases for domain, aliases in key})
+
+
+def domain_aliases(
+    domains: Iterable[str],
+    aliases: Optional[Dict[str, Sequence[str]]] = None
+) -> Dict[str, List[str]]:
+    """
+    Every alias per domain: default_aliases() plus extra aliases
+
+    Args:
+        domains: Tracked domains
+        aliases: Extra aliases per domain (default: the brand alias registry)
+
+    Returns:
+        domain -> sorted, lowercased aliases
+    """
+    if aliases is None:
+        aliases = alias_registry.aliases_for(domains)
+    return {
+        domain: sorted(set(default_aliases(domain)) | {a.lower() for a in aliases.get(domain, [])})
+        for domain in dict.fromkeys(domains)
+    }
+
+
+@lru_cache(maxsize=256)
+def _registry_matcher(domains: Tuple[str, ...], version: int) -> MentionMatcher:
+    # `version` only keys the cache: a registry change makes every entry stale
+    return _compiled(tuple((domain, tuple(forms)) for domain, forms in domain_aliases(domains).items()))
+
+
+def get_matcher(
+    domains: Iterable[str],
+    aliases: Optional[Dict[str, Sequence[str]]] = None
+) -> MentionMatcher:
+    """
+    Compiled matcher for a set of domains, reused across identical requests
+
+    Without explicit aliases the brand alias registry supplies them; the
+    matcher is then cached per domain tuple and registry version, so the
+    common path is a single dictionary lookup.
+
+    Args:
+        domains: Tracked domains (brand and competitors)
+        aliases: Extra aliases per domain, added to default_aliases()
+            (default: the brand alias registry)
+
+    Returns:
+        MentionMatcher instance
+    """
+    if aliases is None:
+        return _registry_matcher(tuple(domains), alias_registry.version)
+    key = tuple((domain, tuple(forms)) for domain, forms in domain_aliases(domains, aliases).items())
+    return _compiled(key)
+
+
+class MentionExtraction(NamedTuple):
+    """Mention fields shared by every platform's CitationData"""
+    spans: List[MentionSpan]
+    brand_mentioned: bool
+    brand_rank: Optional[int]  # Rank of the brand's first ranked mention
+    competitors_mentioned: List[str]
+
+
+def extract_mentions(
+    text: str,
+    brand_domain: str,
+    competitors: Sequence[str],
+    aliases: Optional[Dict[str, Sequence[str]]] = None
+) -> MentionExtraction:
+    """
+    Scan a response once for the brand and all competitors
+
+    The single extraction engine behind every platform extractor; later
+    stages read the spans stored on CitationData instead of the text. Each
+    span is ranked by the response's list structure (src.data.ranking).
+
+    Args:
+        text: Response text
+        brand_domain: Brand domain
+        competitors: Competitor domains
+        aliases: Extra aliases per domain (default: the brand alias registry)
+
+    Returns:
+        MentionExtraction with spans in text order
+    """
+    matcher = get_matcher([brand_domain] + list(competitors), aliases)
+    matches = matcher.scan(text)
+    ranks = assign_ranks(text, [m.start for m in matches], [m.domain for m in matches])
+    spans = [MentionSpan(**match._asdict(), rank=rank) for match, rank in zip(matches, ranks)]
+    found = {span.domain for span in spans}
+
+    return MentionExtraction(
+        spans=spans,
+        brand_mentioned=brand_domain in found,
+        brand_rank=first_ranks([m.domain for m in matches], ranks).get(brand_domain),
+        competitors_mentioned=[comp for comp in competitors if comp in found]
+    )
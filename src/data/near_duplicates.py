@@ -0,0 +1,242 @@
+"""
+Near-duplicate response detection - MinHash signatures with LSH bucketing
+
+Query variations ("best X", "top X", "X comparison") and repeated samples
+often produce nearly the same answer. Each response is reduced once to a
+MinHash signature over word shingles; banded LSH finds candidate
+duplicates in constant time per response, both within an analysis and
+across recent history.
+"""
+
+import hashlib
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.models.schemas import CitationData
+
+_WORD = re.compile(r"\w+")
+_MAX_HASH = np.uint64(2 ** 64 - 1)
+
+
+def shingles(text: str, size: int) -> np.ndarray:
+    """
+    Hashes of the word k-grams of a text
+
+    Args:
+        text: Response text
+        size: Words per shingle
+
+    Returns:
+        Distinct 64-bit shingle hashes
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+         for gram in grams],
+        dtype=np.uint64
+    )
+
+
+class MinHasher:
+    """MinHash over shingle hashes with random multiply-add permutations"""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """(num_perm,) minimum permuted hash per permutation"""
+        hashes = shingles(text, self.shingle_size)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            permuted = hashes[:, None] * self._a + self._b  # Wraps mod 2**64
+        return permuted.min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures
+
+    Signatures are cut into bands; items sharing any band are candidates.
+    With b bands of r rows, pairs above roughly (1/b)**(1/r) similarity
+    collide with high probability. Holds at most `max_items`; the oldest
+    are dropped first.
+    """
+
+    def __init__(self, num_perm: int, bands: int, max_items: Optional[int] = None):
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._order: Deque[int] = deque()
+        self._next_id = 0
+
+    def _keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def insert(self, signature: np.ndarray) -> int:
+        """Add a signature and return its id"""
+        item = self._next_id
+        self._next_id += 1
+        for buckets, key in zip(self._buckets, self._keys(signature)):
+            buckets.setdefault(key, set()).add(item)
+        self._signatures[item] = signature
+        self._order.append(item)
+        while self.max_items is not None and len(self._order) > self.max_items:
+            self._remove(self._order.popleft())
+        return item
+
+    def _remove(self, item: int) -> None:
+        signature = self._signatures.pop(item)
+        for buckets, key in zip(self._buckets, self._keys(signature)):
+            members = buckets.get(key)
+            if members is not None:
+                members.discard(item)
+                if not members:
+                    del buckets[key]
+
+    def nearest(self, signature: np.ndarray, threshold: float) -> Optional[Tuple[int, float]]:
+        """
+        Most similar indexed item at or above a similarity threshold
+
+        Args:
+            signature: Query signature
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            (item id, similarity), or None without a near-duplicate
+        """
+        candidates: Set[int] = set()
+        for buckets, key in zip(self._buckets, self._keys(signature)):
+            candidates |= buckets.get(key, set())
+        best = None
+        for item in candidates:
+            score = similarity(signature, self._signatures[item])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (item, score)
+        return best
+
+
+class DuplicateClusters:
+    """
+    Near-duplicate clusters of one analysis' responses
+
+    Each response joins the cluster of its most similar earlier response
+    (by MinHash estimate), or founds a new one. The number of clusters is
+    the effective sample size: how many distinct answers were collected.
+    Responses without any words are left out: they carry no answer to
+    compare, and their identical signatures would otherwise form a cluster.
+    """
+
+    def __init__(self, hasher: MinHasher, bands: int, threshold: float, history: Optional[LSHIndex] = None):
+        """
+        Args:
+            hasher: Signature function
+            bands: LSH bands
+            threshold: Similarity at which two responses count as duplicates
+            history: Index of earlier analyses' responses (see flush_history)
+        """
+        self.hasher = hasher
+        self.threshold = threshold
+        self.history = history
+        self._index = LSHIndex(hasher.num_perm, bands)
+        self._cluster_of: Dict[int, int] = {}
+        self.sizes: List[int] = []
+        self.history_duplicates = 0
+        self.empty = 0
+        # Kept out of the history until the analysis finishes, so its own
+        # responses are not counted as history duplicates
+        self._pending_history: List[np.ndarray] = []
+
+    def add(self, citation: CitationData) -> bool:
+        """
+        Assign a citation to a cluster, setting `duplicate_cluster` and `near_duplicate`
+
+        Args:
+            citation: Collected citation
+
+        Returns:
+            True when the citation duplicates an earlier response of the analysis
+        """
+        if not _WORD.search(citation.raw_response or ""):
+            citation.duplicate_cluster = None
+            citation.near_duplicate = False
+            self.empty += 1
+            return False
+
+        signature = self.hasher.signature(citation.raw_response)
+        match = self._index.nearest(signature, self.threshold)
+        item = self._index.insert(signature)
+        if match is None:
+            cluster = len(self.sizes)
+            self.sizes.append(1)
+        else:
+            cluster = self._cluster_of[match[0]]
+            self.sizes[cluster] += 1
+        self._cluster_of[item] = cluster
+        citation.duplicate_cluster = cluster
+        citation.near_duplicate = match is not None
+
+        if self.history is not None:
+            if self.history.nearest(signature, self.threshold) is not None:
+                self.history_duplicates += 1
+            self._pending_history.append(signature)
+        return match is not None
+
+    def flush_history(self) -> None:
+        """Add this analysis' responses to the history index"""
+        if self.history is not None:
+            for signature in self._pending_history:
+                self.history.insert(signature)
+        self._pending_history = []
+
+    @property
+    def effective_sample_size(self) -> int:
+        return len(self.sizes)
+
+    def stats(self) -> Dict[str, object]:
+        """Summary for the reasoning trace"""
+        responses = sum(self.sizes)
+        return {
+            "responses": responses,
+            "effective_sample_size": self.effective_sample_size,
+            "duplicate_share": 1 - self.effective_sample_size / responses if responses else 0.0,
+            "largest_cluster": max(self.sizes, default=0),
+            "history_duplicates": self.history_duplicates,
+            "empty_responses": self.empty,
+            "threshold": self.threshold
+        }
+
+
+# Shared hasher and recent-history index across analyses
+min_hasher = MinHasher(settings.dedup_num_perm, settings.dedup_shingle_size)
+response_history = LSHIndex(settings.dedup_num_perm, settings.dedup_bands, settings.dedup_history_size)
+
+
+def new_duplicate_clusters() -> DuplicateClusters:
+    """Clusters for one analysis, checked against the shared history"""
+    return DuplicateClusters(min_hasher, settings.dedup_bands, settings.dedup_threshold, response_history)
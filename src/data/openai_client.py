@@ -1,9 +1,17 @@
 """OpenAI API client for ChatGPT analysis"""
 
 import logging
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, RateLimitError
 from typing import List, Dict, Optional
 from src.config import settings
+from src.data.cache import make_cache_key, response_cache
+from src.data.deadline import current_deadline
+from src.data.hedging import hedged
+from src.data.http import openai_http_client, request_timeout
+from src.data.matcher import extract_mentions
+from src.data.rate_limiter import estimate_tokens, get_rate_limiter
+from src.data.resilience import get_resilience_policy
+from src.data.singleflight import platform_flights
 from src.models.schemas import CitationData, Platform
 
 logger = logging.getLogger(__name__)
@@ -12,55 +20,152 @@ logger = logging.getLogger(__name__)
 class OpenAIClient:
     """Client for OpenAI ChatGPT API"""
     
+    SEARCH_SYSTEM_PROMPT = """You are a helpful assistant that provides comprehensive answers 
+        about products, tools, and services. When answering, mention specific brands, 
+        websites, and tools that are relevant. Include URLs when possible."""
+    SEARCH_TEMPERATURE = 0.7
+    SEARCH_MAX_TOKENS = 1000
+    
     def __init__(self, api_key: Optional[str] = None):
-        self.client = AsyncOpenAI(api_key=api_key or settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            http_client=openai_http_client()
+        )
         self.model = settings.default_model
         
-    async def search(self, query: str, context: Optional[str] = None) -> str:
+    def _request_options(self) -> Dict:
+        """Per-request SDK options: no SDK retries, timeout clamped to the deadline"""
+        options = {"max_retries": 0}
+        if current_deadline() is not None:
+            options["timeout"] = request_timeout(600.0)  # SDK default read timeout
+        return options
+    
+    async def search(
+        self,
+        query: str,
+        context: Optional[str] = None,
+        fresh: bool = False
+    ) -> str:
         """
         Query ChatGPT with web search capabilities
         
         Args:
             query: Search query
             context: Additional context for the query
+            fresh: Bypass the response cache and request coalescing (a new upstream call)
             
         Returns:
             ChatGPT response content
+            
+        Raises:
+            PlatformQueryError: The query failed after retries or the circuit is open
         """
-        system_prompt = """You are a helpful assistant that provides comprehensive answers 
-        about products, tools, and services. When answering, mention specific brands, 
-        websites, and tools that are relevant. Include URLs when possible."""
+        samples = await self.search_samples(query, 1, context=context, fresh=fresh)
+        return samples[0]
+    
+    async def search_samples(
+        self,
+        query: str,
+        samples: int,
+        context: Optional[str] = None,
+        fresh: bool = False
+    ) -> List[str]:
+        """
+        Sample several ChatGPT answers to one prompt in a single API call
         
-        if context:
-            system_prompt += f"\n\nAdditional context: {context}"
+        Uses the provider-side `n` parameter, so the prompt tokens and the
+        round trip are paid once for all samples.
         
-        try:
-            logger.info(f"💬 Querying ChatGPT: '{query}'")
-            logger.debug(f"   Model: {self.model}")
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": query}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
+        Args:
+            query: Search query
+            samples: Number of completions to request (n)
+            context: Additional context for the query
+            fresh: Bypass the response cache and request coalescing (a new upstream call)
             
-            content = response.choices[0].message.content
+        Returns:
+            One response content per sample
             
+        Raises:
+            PlatformQueryError: The query failed after retries or the circuit is open
+        """
+        system_prompt = self.SEARCH_SYSTEM_PROMPT
+        
+        if context:
+            system_prompt += f"\n\nAdditional context: {context}"
+        
+        cache_key = make_cache_key(
+            "chatgpt", self.model, system_prompt, query,
+            self.SEARCH_TEMPERATURE, self.SEARCH_MAX_TOKENS, n=samples
+        )
+        if settings.response_cache_enabled and not fresh:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"💾 Cache hit for ChatGPT: '{query}' (n={samples})")
+                return cached
+        
+        if fresh:
+            # A fresh sample is its own upstream call, never a copy of a concurrent one
+            return await self._fetch_search(query, system_prompt, samples, cache_key)
+        
+        # Identical concurrent queries share one upstream request
+        return await platform_flights.do(
+            cache_key,
+            lambda: self._fetch_search(query, system_prompt, samples, cache_key)
+        )
+    
+    async def _fetch_search(
+        self, query: str, system_prompt: str, samples: int, cache_key: str
+    ) -> List[str]:
+        """Perform the upstream ChatGPT request and cache the responses"""
+        logger.info(f"💬 Querying ChatGPT: '{query}'" + (f" (n={samples})" if samples > 1 else ""))
+        logger.debug(f"   Model: {self.model}")
+        
+        limiter = get_rate_limiter("openai_chat")
+        
+        async def request():
+            try:
+                # Retries are handled by the resilience policy, not the SDK
+                raw = await self.client.with_options(
+                    **self._request_options()
+                ).chat.completions.with_raw_response.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": query}
+                    ],
+                    temperature=self.SEARCH_TEMPERATURE,
+                    max_tokens=self.SEARCH_MAX_TOKENS,
+                    n=samples
+                )
+            except RateLimitError as e:
+                limiter.record_rate_limited(e.response.headers)
+                raise
+            limiter.update_from_headers(raw.headers)
+            return raw.parse()
+        
+        async def attempt():
+            budget = estimate_tokens(system_prompt + query) + self.SEARCH_MAX_TOKENS * samples
+            async with limiter.acquire(tokens=budget):
+                # Only the request itself is hedged, once its slot is granted
+                return await hedged("openai_chat", request)
+        
+        response = await get_resilience_policy("openai_chat").call(attempt)
+        choices = sorted(response.choices, key=lambda choice: choice.index)
+        contents = [choice.message.content or "" for choice in choices]
+        
+        for idx, content in enumerate(contents, 1):
             logger.info("="*60)
-            logger.info(f"💬 CHATGPT RESPONSE for '{query}':")
+            sample_label = f" [sample {idx}/{len(contents)}]" if len(contents) > 1 else ""
+            logger.info(f"💬 CHATGPT RESPONSE for '{query}'{sample_label}:")
             logger.info("-"*60)
             logger.info(content[:500] + "..." if len(content) > 500 else content)
             logger.info("="*60)
-            
-            return content
-            
-        except Exception as e:
-            logger.error(f"❌ OpenAI API error: {e}")
-            return ""
+        
+        if settings.response_cache_enabled and any(contents):
+            await response_cache.set(cache_key, contents)
+        
+        return contents
     
     async def analyze_with_reasoning(self, prompt: str) -> str:
         """
@@ -97,7 +202,8 @@ class OpenAIClient:
         response: str,
         query: str,
         brand_domain: str,
-        competitors: List[str]
+        competitors: List[str],
+        sample_index: int = 0
     ) -> CitationData:
         """
         Extract citation data from ChatGPT response
@@ -107,37 +213,24 @@ class OpenAIClient:
             query: Original query
             brand_domain: Brand domain to check
             competitors: Competitor domains
+            sample_index: Index of this response among samples of the same prompt
             
         Returns:
             CitationData object
         """
-        content = response.lower()
-        
-        # Check if brand is mentioned
-        brand_mentioned = brand_domain.lower() in content
-        
-        # Try to find position (approximate based on text position)
-        citation_position = None
-        if brand_mentioned:
-            position = content.find(brand_domain.lower())
-            # Estimate position based on character location
-            words_before = content[:position].split()
-            citation_position = len(words_before) // 20 + 1  # Approximate paragraph
-        
-        # Check competitor mentions
-        competitors_mentioned = [
-            comp for comp in competitors
-            if comp.lower() in content
-        ]
+        # Brand and competitor mentions in one pass
+        found = extract_mentions(response, brand_domain, competitors)
         
         return CitationData(
             query=query,
             platform=Platform.CHATGPT,
-            brand_mentioned=brand_mentioned,
-            citation_position=citation_position,
+            brand_mentioned=found.brand_mentioned,
+            citation_position=found.brand_rank,  # List rank of the brand
             context=response[:500],
-            competitors_mentioned=competitors_mentioned,
-            raw_response=response
+            competitors_mentioned=found.competitors_mentioned,
+            mentions=found.spans,
+            raw_response=response,
+            sample_index=sample_index
         )
     
     async def generate_embedding(self, text: str) -> List[float]:
@@ -150,11 +243,24 @@ class OpenAIClient:
         Returns:
             Embedding vector
         """
+        async def attempt():
+            limiter = get_rate_limiter("openai_embeddings")
+            async with limiter.acquire(tokens=estimate_tokens(text)):
+                try:
+                    raw = await self.client.with_options(
+                        **self._request_options()
+                    ).embeddings.with_raw_response.create(
+                        model=settings.embedding_model,
+                        input=text
+                    )
+                except RateLimitError as e:
+                    limiter.record_rate_limited(e.response.headers)
+                    raise
+                limiter.update_from_headers(raw.headers)
+                return raw.parse()
+        
         try:
-            response = await self.client.embeddings.create(
-                model=settings.embedding_model,
-                input=text
-            )
+            response = await get_resilience_policy("openai_embeddings").call(attempt)
             return response.data[0].embedding
             
         except Exception as e:
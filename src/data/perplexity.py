@@ -1,9 +1,16 @@
 """Perplexity AI data retrieval"""
 
-import httpx
 import logging
 from typing import List, Dict, Optional
 from src.config import settings
+from src.data.cache import make_cache_key, response_cache
+from src.data.hedging import hedged
+from src.data.http import get_http_client, request_timeout
+from src.data.matcher import extract_mentions, get_matcher
+from src.data.public_suffix import registrable_domain
+from src.data.rate_limiter import estimate_tokens, get_rate_limiter
+from src.data.resilience import PlatformQueryError, get_resilience_policy
+from src.data.singleflight import platform_flights
 from src.models.schemas import CitationData, Platform
 
 logger = logging.getLogger(__name__)
@@ -12,35 +19,63 @@ logger = logging.getLogger(__name__)
 class PerplexityClient:
     """Client for Perplexity AI API"""
     
+    SEARCH_MODEL = "sonar"
+    SEARCH_SYSTEM_PROMPT = "You are a helpful search assistant. Provide accurate information with sources."
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.perplexity_api_key
-        self.base_url = "https://api.perplexity.ai"
+        self.base_url = settings.perplexity_base_url.rstrip("/")
         
-    async def search(self, query: str) -> Dict:
+    async def search(self, query: str, fresh: bool = False) -> Dict:
         """
         Search using Perplexity AI
         
         Args:
             query: Search query
+            fresh: Bypass the response cache and request coalescing (a new upstream call)
             
         Returns:
             Response with citations and sources
+            
+        Raises:
+            PlatformQueryError: The query failed after retries or the circuit is open
         """
         if not self.api_key:
             # Simulate response if no API key
             return self._simulate_response(query)
-            
+        
+        cache_key = make_cache_key(
+            "perplexity", self.SEARCH_MODEL, self.SEARCH_SYSTEM_PROMPT, query
+        )
+        if settings.response_cache_enabled and not fresh:
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"💾 Cache hit for Perplexity: '{query}'")
+                return cached
+        
+        if fresh:
+            # A fresh sample is its own upstream call, never a copy of a concurrent one
+            return await self._fetch_search(query, cache_key)
+        
+        # Identical concurrent queries share one upstream request
+        return await platform_flights.do(
+            cache_key,
+            lambda: self._fetch_search(query, cache_key)
+        )
+    
+    async def _fetch_search(self, query: str, cache_key: str) -> Dict:
+        """Perform the upstream Perplexity request and cache the response"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
         payload = {
-            "model": "sonar",
+            "model": self.SEARCH_MODEL,
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are a helpful search assistant. Provide accurate information with sources."
+                    "content": self.SEARCH_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
@@ -49,39 +84,35 @@ class PerplexityClient:
             ]
         }
         
+        logger.info(f"🔍 Querying Perplexity: '{query}'")
+        logger.debug(f"   Model: {payload['model']}")
+        
+        limiter = get_rate_limiter("perplexity")
+        
+        async def request():
+            response = await get_http_client().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers,
+                timeout=request_timeout(settings.perplexity_timeout)
+            )
+            if response.status_code == 429:
+                limiter.record_rate_limited(response.headers)
+            else:
+                limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+            return response.json()
+        
+        async def attempt():
+            budget = estimate_tokens(self.SEARCH_SYSTEM_PROMPT + query)
+            async with limiter.acquire(tokens=budget):
+                # Only the request itself is hedged, once its slot is granted
+                return await hedged("perplexity", request)
+        
         try:
-            logger.info(f"🔍 Querying Perplexity: '{query}'")
-            logger.debug(f"   Model: {payload['model']}")
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Log response
-                if "choices" in data and len(data["choices"]) > 0:
-                    content = data["choices"][0].get("message", {}).get("content", "")
-                    logger.info("="*60)
-                    logger.info(f"🔍 PERPLEXITY RESPONSE for '{query}':")
-                    logger.info("-"*60)
-                    logger.info(content[:500] + "..." if len(content) > 500 else content)
-                    if "citations" in data:
-                        logger.info(f"\n📚 Citations: {len(data.get('citations', []))}")
-                        for i, cite in enumerate(data.get("citations", [])[:3], 1):
-                            logger.info(f"   {i}. {cite}")
-                    logger.info("="*60)
-                
-                return data
-        except Exception as e:
+            data = await get_resilience_policy("perplexity").call(attempt)
+        except PlatformQueryError as e:
             error_msg = str(e)
-            error_type = type(e).__name__
-            
-            # Log detailed error
-            logger.error(f"❌ Perplexity API error ({error_type}): {error_msg}")
             
             # Check for specific error types
             if "429" in error_msg or "rate limit" in error_msg.lower():
@@ -91,8 +122,26 @@ class PerplexityClient:
             elif "401" in error_msg or "403" in error_msg:
                 logger.error("⚠️  Authentication error - check API key")
             
-            logger.info("⚠️  Using simulated response as fallback")
-            return self._simulate_response(query)
+            # Surface the failure; never substitute simulated content
+            raise
+        
+        # Log response
+        if "choices" in data and len(data["choices"]) > 0:
+            content = data["choices"][0].get("message", {}).get("content", "")
+            logger.info("="*60)
+            logger.info(f"🔍 PERPLEXITY RESPONSE for '{query}':")
+            logger.info("-"*60)
+            logger.info(content[:500] + "..." if len(content) > 500 else content)
+            if "citations" in data:
+                logger.info(f"\n📚 Citations: {len(data.get('citations', []))}")
+                for i, cite in enumerate(data.get("citations", [])[:3], 1):
+                    logger.info(f"   {i}. {cite}")
+            logger.info("="*60)
+        
+        if settings.response_cache_enabled:
+            await response_cache.set(cache_key, data)
+        
+        return data
     
     def extract_citations(
         self,
@@ -116,48 +165,31 @@ class PerplexityClient:
         try:
             content = response.get("choices", [{}])[0].get("message", {}).get("content", "")
             citations = response.get("citations", [])
-            content_lower = content.lower()
+            sources = [str(source) for source in citations]
             
             logger.debug(f"Extracting citations for brand: {brand_domain}")
             logger.debug(f"Response has {len(citations)} source citations")
             
-            # Check if brand is mentioned (flexible matching)
-            # Match both "domain.com" and company name
-            brand_name = brand_domain.split('.')[0]  # e.g., "acme" from "acme.com"
-            brand_mentioned = (
-                brand_domain.lower() in content_lower or
-                brand_name.lower() in content_lower
-            )
+            # Brand and competitor mentions in one pass
+            # Matches both "domain.com" and company name (e.g. "acme" from "acme.com")
+            found = extract_mentions(content, brand_domain, competitors)
+            brand_mentioned = found.brand_mentioned
+            competitors_mentioned = found.competitors_mentioned
             
             logger.debug(f"Brand '{brand_domain}' mentioned: {brand_mentioned}")
             
-            # Find position if mentioned
-            citation_position = None
-            if brand_mentioned:
-                # Check in source citations
-                for idx, citation in enumerate(citations):
-                    if brand_domain.lower() in citation.lower() or brand_name.lower() in citation.lower():
+            # Find position if mentioned: list rank in the answer, else source citation index
+            citation_position = found.brand_rank
+            if brand_mentioned and citation_position is None:
+                brand_matcher = get_matcher([brand_domain])
+                for idx, source in enumerate(sources):
+                    if brand_matcher.first_mentions(source):
                         citation_position = idx + 1
                         logger.debug(f"Found brand in citation position {citation_position}")
                         break
-                
-                # If not in citations, estimate position in text
-                if not citation_position:
-                    position_in_text = content_lower.find(brand_domain.lower())
-                    if position_in_text == -1:
-                        position_in_text = content_lower.find(brand_name.lower())
-                    if position_in_text >= 0:
-                        words_before = content_lower[:position_in_text].split()
-                        citation_position = len(words_before) // 30 + 1
-                        logger.debug(f"Estimated brand position from text: {citation_position}")
+            logger.debug(f"Brand position: {citation_position}")
             
-            # Check competitor mentions (flexible matching)
-            competitors_mentioned = []
-            for comp in competitors:
-                comp_name = comp.split('.')[0]  # e.g., "hubspot" from "hubspot.com"
-                if comp.lower() in content_lower or comp_name.lower() in content_lower:
-                    competitors_mentioned.append(comp)
-                    logger.debug(f"Found competitor: {comp}")
+            logger.debug(f"Found competitors: {competitors_mentioned}")
             
             logger.info(f"✅ Extraction complete: Brand={brand_mentioned}, Competitors={len(competitors_mentioned)}, Citations={len(citations)}")
             
@@ -168,7 +200,10 @@ class PerplexityClient:
                 citation_position=citation_position,
                 context=content[:500],
                 competitors_mentioned=competitors_mentioned,
-                raw_response=content
+                raw_response=content,
+                mentions=found.spans,
+                sources=sources,
+                source_domains=[registrable_domain(source) for source in sources]
             )
             
         except Exception as e:
@@ -0,0 +1,143 @@
+"""Registrable domains via a public-suffix trie"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Suffixes common in AI answers and their sources. Set `public_suffix_list_path`
+# to a copy of https://publicsuffix.org/list/public_suffix_list.dat for full coverage.
+_BUILTIN_RULES = """
+com net org edu gov mil int info biz io ai co app dev me so tv cc ly gg sh to fm
+xyz tech cloud site online store shop blog news page link live pro digital agency
+us uk de fr es it nl be ch at se no dk fi pl pt ie cz ru ua in cn jp kr tw hk sg
+au nz ca mx br ar cl za ng ke il tr ae sa eu asia
+co.uk org.uk ac.uk gov.uk ltd.uk plc.uk me.uk net.uk
+com.au net.au org.au edu.au gov.au
+co.nz org.nz net.nz govt.nz
+co.jp ne.jp or.jp ac.jp go.jp
+co.kr or.kr ac.kr
+com.cn net.cn org.cn gov.cn edu.cn
+com.hk org.hk edu.hk
+com.tw org.tw edu.tw
+com.sg edu.sg gov.sg
+co.in net.in org.in ac.in gov.in firm.in
+com.br net.br org.br gov.br
+com.mx org.mx gob.mx
+com.ar org.ar gob.ar
+co.za org.za gov.za ac.za
+com.tr org.tr gov.tr edu.tr
+co.il org.il ac.il gov.il
+com.ua org.ua
+github.io gitlab.io herokuapp.com vercel.app netlify.app pages.dev web.app firebaseapp.com
+azurewebsites.net cloudfront.net blogspot.com wordpress.com substack.com notion.site
+s3.amazonaws.com appspot.com
+*.ck !www.ck
+"""
+
+
+class PublicSuffixTrie:
+    """
+    Trie over reversed domain labels holding public-suffix rules
+
+    Supports the Public Suffix List syntax: plain rules ("co.uk"), wildcards
+    ("*.ck") and exceptions ("!www.ck"). Unknown top-level domains count as
+    one-label suffixes (the list's implicit "*" rule).
+    """
+
+    _RULE = "$"  # Marks a node where a rule ends
+    _EXCEPTION = "!"
+
+    def __init__(self, rules: Iterable[str]):
+        self._root: Dict[str, dict] = {}
+        self.size = 0
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            exception = rule.startswith("!")
+            node = self._root
+            for label in reversed(rule.lstrip("!").split(".")):
+                node = node.setdefault(label, {})
+            node[self._EXCEPTION if exception else self._RULE] = True
+            self.size += 1
+
+    def suffix_length(self, labels: list) -> int:
+        """
+        Number of trailing labels forming the public suffix
+
+        Args:
+            labels: Host labels, left to right
+
+        Returns:
+            Label count of the longest matching suffix (at least 1)
+        """
+        node = self._root
+        length = 1  # Implicit "*" rule
+        for depth, label in enumerate(reversed(labels), start=1):
+            child = node.get(label)
+            wildcard = node.get("*")
+            if child is not None and child.get(self._EXCEPTION):
+                # Exception rules make the parent the suffix
+                return depth - 1
+            if wildcard is not None and wildcard.get(self._RULE):
+                length = max(length, depth)
+            if child is None:
+                break
+            if child.get(self._RULE):
+                length = max(length, depth)
+            node = child
+        return length
+
+
+@lru_cache(maxsize=1)
+def get_public_suffix_trie() -> PublicSuffixTrie:
+    """Trie built from `public_suffix_list_path`, or the built-in rules"""
+    path = settings.public_suffix_list_path
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                trie = PublicSuffixTrie(f)
+            logger.info(f"🌐 Loaded {trie.size} public suffix rules from {path}")
+            return trie
+        except OSError as e:
+            logger.warning(f"⚠️  Could not read public suffix list ({e}); using built-in rules")
+    return PublicSuffixTrie(_BUILTIN_RULES.split())
+
+
+def host_of(url: str) -> str:
+    """Lowercased host of a URL or bare host name"""
+    url = url.strip()
+    if "://" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host.strip(".")
+
+
+@lru_cache(maxsize=65536)
+def registrable_domain(url_or_host: str) -> Optional[str]:
+    """
+    Registrable domain of a URL or host ("https://app.hubspot.com/x" -> "hubspot.com")
+
+    Args:
+        url_or_host: Full URL, host name or bare domain
+
+    Returns:
+        Public suffix plus one label, or None for IPs, suffixes and invalid hosts
+    """
+    host = host_of(url_or_host)
+    labels = host.split(".")
+    if len(labels) < 2 or not all(labels) or labels[-1].isdigit():
+        return None
+    suffix = get_public_suffix_trie().suffix_length(labels)
+    if suffix >= len(labels):
+        return None
+    return ".".join(labels[-(suffix + 1):])
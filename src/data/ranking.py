@@ -0,0 +1,172 @@
+"""Exact ranks from the list structure of markdown responses"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# "1. ", "2) ", "- ", "* ", "+ ", "• " at the start of a line
+_NUMBERED = re.compile(r"([ \t]*)\d{1,3}[.)][ \t]+\S")
+_BULLET = re.compile(r"([ \t]*)[-*+•][ \t]+\S")
+_HEADING = re.compile(r"(#{1,6})[ \t]+\S")
+# "**1. HubSpot**", "**HubSpot**: ..." - lines led by bold text act as headings
+_BOLD_HEADING = re.compile(r"\*\*[^*\n]+\*\*")
+_BOLD_LEVEL = 7  # Below the six markdown heading depths
+
+
+class ListItem(NamedTuple):
+    """One entry of the response's primary list"""
+    start: int  # Character offset of the item's first line
+    end: int  # Character offset one past the item
+    rank: int  # 1-based position in the list
+
+
+class _Line(NamedTuple):
+    start: int
+    end: int
+    kind: Optional[str]  # "numbered", "bullet", "heading" or None
+    level: int  # Indentation width, or heading depth
+    blank: bool
+
+
+def _scan_lines(text: str) -> List[_Line]:
+    lines = []
+    offset = 0
+    for raw in text.splitlines(keepends=True):
+        end = offset + len(raw)
+        kind, level = None, 0
+        match = _NUMBERED.match(raw)
+        if match:
+            kind, level = "numbered", len(match.group(1).expandtabs(4))
+        else:
+            match = _BULLET.match(raw)
+            if match:
+                kind, level = "bullet", len(match.group(1).expandtabs(4))
+            else:
+                match = _HEADING.match(raw)
+                if match:
+                    kind, level = "heading", len(match.group(1))
+                elif _BOLD_HEADING.match(raw):
+                    kind, level = "heading", _BOLD_LEVEL
+        lines.append(_Line(offset, end, kind, level, not raw.strip()))
+        offset = end
+    return lines
+
+
+def parse_list_items(text: str) -> List[ListItem]:
+    """
+    Items of the list that ranks the response's recommendations
+
+    The primary list is the headings at the most used depth when there are
+    at least two and they come before any numbered list (as in
+    "### 1. HubSpot" or "**1. HubSpot**" sections; lines led by bold text
+    count as headings below "######"), else the outermost numbered list,
+    else the outermost bullet list. Nested lists and paragraphs belong to
+    the enclosing item; an item ends at the next primary item, at a
+    markdown heading (for list items) or a heading at a higher level (for
+    heading items), or at unindented text after a blank line.
+
+    Args:
+        text: Response text
+
+    Returns:
+        Items in document order, empty when the response has no list
+    """
+    lines = _scan_lines(text)
+
+    kind, level = None, 0
+    numbered = [line.level for line in lines if line.kind == "numbered"]
+    headings = [line.level for line in lines if line.kind == "heading"]
+    bullets = [line.level for line in lines if line.kind == "bullet"]
+    if headings:
+        # Most used depth; the shallower one on ties
+        depth = min(set(headings), key=lambda d: (-headings.count(d), d))
+        first_heading = next(line.start for line in lines if line.kind == "heading" and line.level == depth)
+        first_numbered = next((line.start for line in lines if line.kind == "numbered"), len(text))
+        # Heading sections rank the answer when numbered lists only appear inside them
+        if headings.count(depth) >= 2 and first_heading < first_numbered:
+            kind, level = "heading", depth
+    if kind is None and numbered:
+        kind, level = "numbered", min(numbered)
+    if kind is None and bullets:
+        kind, level = "bullet", min(bullets)
+    if kind is None:
+        return []
+
+    items: List[ListItem] = []
+    open_start: Optional[int] = None
+    after_blank = False
+
+    def close(end: int) -> None:
+        nonlocal open_start
+        if open_start is not None:
+            items.append(ListItem(open_start, end, len(items) + 1))
+            open_start = None
+
+    for line in lines:
+        if line.kind == kind and line.level == level:
+            close(line.start)
+            open_start = line.start
+        elif open_start is not None:
+            if kind == "heading":
+                ends_item = line.kind == "heading" and line.level < level
+            else:
+                bold = line.kind == "heading" and line.level == _BOLD_LEVEL
+                ends_item = (line.kind == "heading" and not bold) or (
+                    after_blank and not line.blank and (line.kind is None or bold)
+                    and not text[line.start:line.start + 1].isspace()
+                )
+            if ends_item:
+                close(line.start)
+        after_blank = line.blank
+    close(len(text))
+    return items
+
+
+def assign_ranks(text: str, starts: Sequence[int], domains: Sequence[str]) -> List[Optional[int]]:
+    """
+    Rank for each mention
+
+    Mentions inside a list item take the item's rank. Responses without a
+    list rank domains by order of first appearance. Mentions outside the
+    list of a list-structured response (introduction, closing notes) are
+    not ranked.
+
+    Args:
+        text: Response text
+        starts: Character offsets of the mentions, ascending
+        domains: Domain of each mention
+
+    Returns:
+        Rank per mention (None when unranked)
+    """
+    items = parse_list_items(text)
+    if not items:
+        order: Dict[str, int] = {}
+        return [order.setdefault(domain, len(order) + 1) for domain in domains]
+
+    ranks: List[Optional[int]] = []
+    idx = 0
+    for start in starts:
+        # Offsets ascend, so the item pointer only moves forward
+        while idx < len(items) and items[idx].end <= start:
+            idx += 1
+        item = items[idx] if idx < len(items) else None
+        ranks.append(item.rank if item is not None and item.start <= start else None)
+    return ranks
+
+
+def first_ranks(domains: Sequence[str], ranks: Sequence[Optional[int]]) -> Dict[str, Optional[int]]:
+    """
+    Rank per mentioned domain: its first ranked mention, else None
+
+    Args:
+        domains: Domain of each mention, in text order
+        ranks: Rank of each mention
+
+    Returns:
+        Domain -> rank for every domain mentioned at least once
+    """
+    best: Dict[str, Optional[int]] = {}
+    for domain, rank in zip(domains, ranks):
+        if best.get(domain) is None:
+            best[domain] = rank
+    return best
@@ -0,0 +1,292 @@
+"""Process-wide adaptive rate limiting per upstream provider"""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+from src.config import settings
+from src.data.deadline import DeadlineExceeded, current_deadline
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budget accounting"""
+    return len(text) // 4 + 1
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse OpenAI-style reset durations ("1s", "6m0s", "20ms") or plain seconds
+
+    Args:
+        value: Header value
+
+    Returns:
+        Duration in seconds, or None if unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling token bucket sized to a per-minute budget"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def resize(self, per_minute: float) -> None:
+        """Adopt a new budget reported by the provider"""
+        self._refill()
+        self.capacity = float(per_minute)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def cap(self, remaining: float) -> None:
+        """Never believe we have more budget than the provider says is left"""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class ProviderRateLimiter:
+    """
+    Concurrency cap plus RPM/TPM token buckets for one provider
+
+    Callers wrap each upstream request in `acquire()`. The limiter adapts to
+    `x-ratelimit-*` headers and `Retry-After` reported by the provider and
+    records queue depth and wait-time metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._budget_lock = asyncio.Lock()
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._blocked_until = 0.0
+
+        # Metrics
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.total_requests = 0
+        self.throttled_requests = 0
+        self.rate_limited_responses = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator["ProviderRateLimiter"]:
+        """
+        Wait for a concurrency slot and request/token budget
+
+        Args:
+            tokens: Estimated tokens the request will consume (prompt + completion)
+
+        Yields:
+            The limiter, so callers can report response headers
+        """
+        start = time.monotonic()
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._wait_for_budget(tokens)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        wait = time.monotonic() - start
+        self.total_requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > 1.0:
+            logger.debug(f"⏳ {self.name}: waited {wait:.2f}s for rate limit budget")
+
+        self.in_flight += 1
+        try:
+            yield self
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        """Block until both buckets (and any Retry-After window) allow the request"""
+        async with self._budget_lock:
+            throttled = False
+            while True:
+                delay = self._blocked_until - time.monotonic()
+                if self._requests:
+                    delay = max(delay, self._requests.delay_for(1))
+                if self._tokens and tokens:
+                    delay = max(delay, self._tokens.delay_for(tokens))
+                if delay <= 0:
+                    break
+                deadline = current_deadline()
+                if deadline is not None and delay >= deadline.remaining():
+                    raise DeadlineExceeded(
+                        f"{self.name}: rate limit budget not available before the deadline"
+                    )
+                throttled = True
+                await asyncio.sleep(delay)
+
+            if throttled:
+                self.throttled_requests += 1
+            if self._requests:
+                self._requests.consume(1)
+            if self._tokens and tokens:
+                self._tokens.consume(tokens)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Adapt budgets to the provider's rate limit headers
+
+        Args:
+            headers: Response headers (any case-insensitive mapping)
+        """
+        if not headers:
+            return
+
+        for kind, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+            limit = self._header_number(headers, f"x-ratelimit-limit-{kind}")
+            remaining = self._header_number(headers, f"x-ratelimit-remaining-{kind}")
+            reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+
+            if bucket is not None:
+                if limit and limit != bucket.capacity:
+                    logger.info(f"📏 {self.name}: provider reports {kind} limit {limit:.0f}/min")
+                    bucket.resize(limit)
+                if remaining is not None:
+                    bucket.cap(remaining)
+            if remaining is not None and remaining <= 0 and reset:
+                self._block_for(reset)
+
+        retry_after = self._retry_after(headers)
+        if retry_after:
+            self._block_for(retry_after)
+
+    def record_rate_limited(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Register a 429 response and pause the provider accordingly
+
+        Args:
+            headers: Headers of the 429 response, if available
+        """
+        self.rate_limited_responses += 1
+        self.update_from_headers(headers)
+        if not headers or self._retry_after(headers) is None:
+            self._block_for(1.0)
+
+    def _block_for(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    @staticmethod
+    def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _retry_after(cls, headers: Mapping[str, str]) -> Optional[float]:
+        retry_after_ms = cls._header_number(headers, "retry-after-ms")
+        if retry_after_ms is not None:
+            return retry_after_ms / 1000.0
+        return cls._header_number(headers, "retry-after")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "total_requests": self.total_requests,
+            "throttled_requests": self.throttled_requests,
+            "rate_limited_responses": self.rate_limited_responses,
+            "avg_wait_seconds": self.total_wait / self.total_requests if self.total_requests else 0.0,
+            "max_wait_seconds": self.max_wait,
+            "requests_per_minute": self._requests.capacity if self._requests else None,
+            "tokens_per_minute": self._tokens.capacity if self._tokens else None,
+            "blocked_for_seconds": max(0.0, self._blocked_until - time.monotonic())
+        }
+
+
+# Global limiters, one per provider endpoint; each is that provider's concurrency pool
+_PROVIDER_BUDGETS = {
+    "openai_chat": (settings.openai_chat_rpm, settings.openai_chat_tpm),
+    "openai_embeddings": (settings.openai_embeddings_rpm, settings.openai_embeddings_tpm),
+    "perplexity": (settings.perplexity_rpm, settings.perplexity_tpm),
+    "anthropic": (settings.anthropic_rpm, settings.anthropic_tpm),
+    "google_ai": (settings.google_ai_rpm, settings.google_ai_tpm),
+}
+
+rate_limiters: Dict[str, ProviderRateLimiter] = {
+    name: ProviderRateLimiter(
+        name,
+        max_concurrency=settings.collector_concurrency.get(name, settings.max_concurrent_requests),
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm
+    )
+    for name, (rpm, tpm) in _PROVIDER_BUDGETS.items()
+}
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """
+    Get the global limiter for a provider
+
+    Args:
+        provider: Limiter name ("openai_chat", "openai_embeddings", "perplexity", ...)
+
+    Returns:
+        ProviderRateLimiter instance
+    """
+    return rate_limiters[provider]
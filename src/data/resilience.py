@@ -0,0 +1,358 @@
+"""Retry, backoff and circuit-breaker policy for platform collectors"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+import httpx
+import openai
+
+from src.config import settings
+from src.data.cassette import CassetteMissError
+from src.data.deadline import DeadlineExceeded, current_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformQueryError(Exception):
+    """An upstream platform query failed after the resilience policy gave up"""
+
+    def __init__(
+        self,
+        provider: str,
+        message: str,
+        retryable: bool = False,
+        attempts: int = 0,
+        circuit_open: bool = False
+    ):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.retryable = retryable
+        self.attempts = attempts
+        self.circuit_open = circuit_open
+
+
+class CircuitOpenError(PlatformQueryError):
+    """Raised without calling upstream while a provider's circuit is open"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            provider,
+            f"circuit open after repeated failures (retry in {retry_in:.0f}s)",
+            retryable=True,
+            circuit_open=True
+        )
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether an upstream error is transient
+
+    Timeouts, connection failures, 429s, 5xx responses and malformed
+    response bodies are retried; authentication and request errors are not.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, CassetteMissError) or isinstance(error.__cause__, CassetteMissError):
+        # Replaying offline: a missing recording will not appear on retry
+        return False
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    if isinstance(error, json.JSONDecodeError):
+        return True
+    return False
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of overall traffic
+
+    Every request deposits `ratio` tokens; every retry spends one. This keeps
+    retries from multiplying load while a provider is struggling.
+    """
+
+    def __init__(self, ratio: float, min_tokens: float = 3.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker
+
+    After `failure_threshold` consecutive transient failures the circuit
+    opens and calls fail fast for `reset_timeout` seconds. Then a single
+    trial call is let through; its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may proceed right now"""
+        if self.state == self.OPEN:
+            if self.retry_in() > 0:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial slot without recording an outcome"""
+        self._trial_in_flight = False
+
+
+class ResiliencePolicy:
+    """Retry policy, retry budget and circuit breaker for one provider"""
+
+    def __init__(
+        self,
+        provider: str,
+        retry: RetryPolicy,
+        budget: RetryBudget,
+        breaker: CircuitBreaker
+    ):
+        self.provider = provider
+        self.retry = retry
+        self.budget = budget
+        self.breaker = breaker
+        self.retries = 0
+        self.failures = 0
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an upstream call under the policy
+
+        Args:
+            fn: Zero-argument coroutine factory performing one attempt
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: The provider is currently failing fast
+            PlatformQueryError: All permitted attempts failed
+        """
+        self.budget.deposit()
+        attempt = 0
+
+        while True:
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired():
+                self.failures += 1
+                raise PlatformQueryError(
+                    self.provider, "analysis deadline exceeded", attempts=attempt
+                ) from DeadlineExceeded()
+
+            if not self.breaker.allow():
+                self.failures += 1
+                error = CircuitOpenError(self.provider, self.breaker.retry_in())
+                error.attempts = attempt
+                raise error
+
+            attempt += 1
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.breaker.release_trial()
+                raise
+            except Exception as e:
+                if deadline is not None and deadline.expired():
+                    # Cut off by our own deadline, not a provider failure
+                    self.breaker.release_trial()
+                    self.failures += 1
+                    raise PlatformQueryError(
+                        self.provider, f"analysis deadline exceeded ({type(e).__name__})",
+                        attempts=attempt
+                    ) from DeadlineExceeded()
+
+                retryable = is_retryable(e)
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release_trial()
+
+                error_name = type(e).__name__
+                delay = self.retry.backoff(attempt)
+                give_up = (
+                    not retryable
+                    or attempt >= self.retry.max_attempts
+                    # No point sleeping past the analysis deadline
+                    or (deadline is not None and deadline.remaining() <= delay)
+                    or not self.budget.withdraw()
+                )
+                if give_up:
+                    self.failures += 1
+                    logger.error(
+                        f"❌ {self.provider} failed after {attempt} attempt(s) ({error_name}): {e}"
+                    )
+                    raise PlatformQueryError(
+                        self.provider,
+                        f"{error_name}: {e}",
+                        retryable=retryable,
+                        attempts=attempt
+                    ) from e
+
+                self.retries += 1
+                logger.warning(
+                    f"⚠️  {self.provider} attempt {attempt} failed ({error_name}) - "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and retry counters for monitoring"""
+        return {
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "times_opened": self.breaker.times_opened,
+            "retries": self.retries,
+            "failures": self.failures,
+            "retry_budget_tokens": round(self.budget.tokens, 2),
+            "retry_budget_exhausted": self.budget.exhausted
+        }
+
+
+def _build_policy(provider: str) -> ResiliencePolicy:
+    """Create a provider policy from defaults plus settings.resilience_overrides"""
+    options: Dict[str, Any] = {
+        "max_attempts": settings.retry_max_attempts,
+        "base_delay": settings.retry_base_delay,
+        "max_delay": settings.retry_max_delay,
+        "budget_ratio": settings.retry_budget_ratio,
+        "failure_threshold": settings.circuit_failure_threshold,
+        "reset_timeout": settings.circuit_reset_timeout
+    }
+    options.update(settings.resilience_overrides.get(provider, {}))
+
+    return ResiliencePolicy(
+        provider,
+        retry=RetryPolicy(
+            max_attempts=int(options["max_attempts"]),
+            base_delay=float(options["base_delay"]),
+            max_delay=float(options["max_delay"])
+        ),
+        budget=RetryBudget(ratio=float(options["budget_ratio"])),
+        breaker=CircuitBreaker(
+            failure_threshold=int(options["failure_threshold"]),
+            reset_timeout=float(options["reset_timeout"])
+        )
+    )
+
+
+# Global policies, one per provider (same names as the rate limiters)
+resilience_policies: Dict[str, ResiliencePolicy] = {
+    provider: _build_policy(provider)
+    for provider in ("openai_chat", "openai_embeddings", "perplexity", "anthropic", "google_ai")
+}
+
+
+def get_resilience_policy(provider: str) -> ResiliencePolicy:
+    """
+    Get the global resilience policy for a provider
+
+    Args:
+        provider: Provider name
+
+    Returns:
+        ResiliencePolicy instance
+    """
+    return resilience_policies[provider]
+
+
+def describe_error(error: BaseException) -> Dict[str, Any]:
+    """
+    Structured description of a collection failure for AnalysisResult.errors
+
+    Args:
+        error: Exception raised by a platform query
+
+    Returns:
+        Error fields (type, message, retryable, attempts, circuit_open)
+    """
+    if isinstance(error, PlatformQueryError):
+        return {
+            "error": str(error),
+            "error_type": type(error.__cause__ or error).__name__,
+            "retryable": error.retryable,
+            "attempts": error.attempts,
+            "circuit_open": error.circuit_open
+        }
+    return {
+        "error": str(error) or type(error).__name__,
+        "error_type": type(error).__name__,
+        "retryable": is_retryable(error),
+        "attempts": None,
+        "circuit_open": False
+    }
@@ -0,0 +1,121 @@
+"""Confidence intervals on mention rates and adaptive (sequential) sampling"""
+
+import math
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def confidence_z(confidence: float) -> float:
+    """Two-sided normal quantile for a confidence level (0.95 -> 1.96)"""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion
+
+    Well-behaved at small sample sizes and at rates of 0 or 1, where the
+    normal approximation collapses to a zero-width interval.
+
+    Args:
+        successes: Citations mentioning the domain
+        trials: Citations collected
+        confidence: Confidence level
+
+    Returns:
+        (low, high); (0.0, 1.0) with no trials
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+    z = confidence_z(confidence)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class SequentialSampler:
+    """
+    Decides how many more platform calls an adaptive analysis makes
+
+    Collection proceeds in waves of (query, platform) calls. After each wave
+    the Wilson interval of every tracked domain's mention rate is checked;
+    sampling stops once all are narrower than the target width or the call
+    budget is spent.
+    """
+
+    def __init__(
+        self,
+        pairs: Sequence[T],
+        wave_size: int,
+        max_calls: int,
+        target_width: float,
+        confidence: float = 0.95
+    ):
+        """
+        Args:
+            pairs: (query, platform) combinations to cycle through
+            wave_size: Calls issued per wave
+            max_calls: Total call budget
+            target_width: Stop once every interval is at most this wide
+            confidence: Confidence level of the intervals
+        """
+        self.pairs = list(pairs)
+        self.wave_size = max(1, wave_size)
+        self.max_calls = max_calls
+        self.target_width = target_width
+        self.confidence = confidence
+        self.calls = 0
+        self.waves = 0
+        self._cursor = 0
+
+    def next_wave(self) -> List[Tuple[T, bool]]:
+        """
+        Calls for the next wave
+
+        Returns:
+            (pair, repeat) items; `repeat` is True once a pair is sampled
+            again and must bypass the response cache and request coalescing,
+            so each repeat is an independent upstream call
+        """
+        size = min(self.wave_size, self.max_calls - self.calls)
+        if not self.pairs or size <= 0:
+            return []
+        wave = []
+        for _ in range(size):
+            wave.append((self.pairs[self._cursor % len(self.pairs)], self._cursor >= len(self.pairs)))
+            self._cursor += 1
+        self.calls += len(wave)
+        self.waves += 1
+        return wave
+
+    def intervals(self, counts: Dict[str, int], trials: int) -> Dict[str, Tuple[float, float]]:
+        """Wilson interval per domain from mention counts"""
+        return {domain: wilson_interval(k, trials, self.confidence) for domain, k in counts.items()}
+
+    def converged(self, counts: Dict[str, int], trials: int) -> bool:
+        """Whether every domain's interval is within the target width"""
+        return all(
+            high - low <= self.target_width
+            for low, high in self.intervals(counts, trials).values()
+        )
+
+    def exhausted(self) -> bool:
+        return self.calls >= self.max_calls
+
+    def stats(self, counts: Dict[str, int], trials: int) -> Dict[str, object]:
+        """Summary for the reasoning trace"""
+        return {
+            "waves": self.waves,
+            "calls": self.calls,
+            "max_calls": self.max_calls,
+            "target_width": self.target_width,
+            "converged": self.converged(counts, trials),
+            "intervals": {
+                domain: [round(low, 3), round(high, 3)]
+                for domain, (low, high) in self.intervals(counts, trials).items()
+            }
+        }
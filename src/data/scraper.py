@@ -1,10 +1,12 @@
 """Web scraping utilities for content analysis"""
 
-import httpx
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 import re
 
+from src.config import settings
+from src.data.http import get_http_client, request_timeout
+
 
 class WebScraper:
     """Scraper for analyzing web content"""
@@ -25,10 +27,12 @@ class WebScraper:
             HTML content
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                return response.text
+            client = get_http_client()
+            response = await client.get(
+                url, headers=self.headers, timeout=request_timeout(settings.scraper_timeout)
+            )
+            response.raise_for_status()
+            return response.text
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
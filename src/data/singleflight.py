@@ -0,0 +1,103 @@
+"""Single-flight coalescing of identical in-flight platform queries"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from src.data.deadline import DeadlineExceeded, current_deadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight upstream call and the number of callers awaiting it"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key
+
+    The first caller for a key starts the upstream coroutine; callers that
+    arrive while it is still running await the same task and receive the
+    same result or exception. The upstream task is only cancelled once every
+    caller waiting on it has been cancelled.
+
+    The shared task runs outside any analysis deadline, since its callers
+    may belong to analyses with different budgets; each caller instead
+    stops waiting at its own deadline.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Identity of the request (same key = same upstream response)
+            fn: Zero-argument coroutine factory performing the upstream call
+
+        Returns:
+            The shared result of fn()
+
+        Raises:
+            DeadlineExceeded: The caller's deadline passed before the result arrived
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(self._run_unscoped(fn)))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, k=key, c=call: self._forget(k, c))
+            self.started += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight request {key[:12]}")
+
+        call.waiters += 1
+        deadline = current_deadline()
+        try:
+            # Shield so one caller's cancellation doesn't cancel the shared task
+            if deadline is None:
+                return await asyncio.shield(call.task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(call.task), timeout=deadline.remaining())
+            except asyncio.TimeoutError:
+                if call.task.done():
+                    raise  # The upstream call's own timeout
+                raise DeadlineExceeded("analysis deadline exceeded waiting for a shared request") from None
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last interested caller went away: stop the upstream request
+                self._forget(key, call)
+                call.task.cancel()
+
+    @staticmethod
+    async def _run_unscoped(fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn without the first caller's deadline"""
+        with deadline_scope(None):
+            return await fn()
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """Drop a finished or abandoned call so later callers start fresh"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring"""
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.started,
+            "coalesced_calls": self.coalesced
+        }
+
+
+# Global instance shared by all platform clients
+platform_flights = SingleFlight()
@@ -0,0 +1,225 @@
+"""Index of the source domains AI platforms cite, per query and day"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.config import settings
+from src.models.schemas import CitationData
+
+logger = logging.getLogger(__name__)
+
+_DAY = 86400
+
+
+def _query_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SourceIndex:
+    """
+    SQLite rollup of cited source domains
+
+    Each citation's sources are counted into one row per
+    (query, platform, domain, day), so "top cited domains for a query over
+    the last N days" is an indexed range scan over a few rows per day rather
+    than a pass over stored responses. Example URLs are kept per domain.
+    """
+
+    def __init__(self, path: str, retention_days: int):
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.recorded = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the index on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS source_counts ("
+                "query TEXT NOT NULL, platform TEXT NOT NULL, domain TEXT NOT NULL, "
+                "day INTEGER NOT NULL, citations INTEGER NOT NULL, best_rank INTEGER NOT NULL, "
+                "PRIMARY KEY (query, day, platform, domain))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_source_counts_day ON source_counts (day)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS source_urls ("
+                "domain TEXT NOT NULL, url TEXT NOT NULL, last_seen REAL NOT NULL, "
+                "PRIMARY KEY (domain, url))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _write(self, rows: List[tuple], urls: List[tuple], now: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO source_counts (query, platform, domain, day, citations, best_rank) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (query, day, platform, domain) DO UPDATE SET "
+                "citations = citations + excluded.citations, "
+                "best_rank = MIN(best_rank, excluded.best_rank)",
+                rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO source_urls (domain, url, last_seen) VALUES (?, ?, ?)",
+                urls
+            )
+            cutoff = now - self.retention_days * _DAY
+            conn.execute("DELETE FROM source_counts WHERE day < ?", (int(cutoff // _DAY),))
+            conn.execute("DELETE FROM source_urls WHERE last_seen < ?", (cutoff,))
+            conn.commit()
+
+    async def record(self, citations: Sequence[CitationData]) -> int:
+        """
+        Count the source domains of collected citations
+
+        Args:
+            citations: Citations with `sources` / `source_domains`
+
+        Returns:
+            Number of (citation, domain) pairs recorded
+        """
+        now = time.time()
+        day = int(now // _DAY)
+        counts: Counter = Counter()
+        best: Dict[tuple, int] = {}
+        urls = []
+        for citation in citations:
+            seen = set()
+            for rank, (url, domain) in enumerate(zip(citation.sources, citation.source_domains), start=1):
+                if not domain:
+                    continue
+                urls.append((domain, url, now))
+                if domain in seen:
+                    continue
+                # A domain counts once per response, at its first source position
+                seen.add(domain)
+                key = (_query_key(citation.query), citation.platform.value, domain)
+                counts[key] += 1
+                best[key] = min(best.get(key, rank), rank)
+        if not counts:
+            return 0
+
+        rows = [(query, platform, domain, day, n, best[(query, platform, domain)])
+                for (query, platform, domain), n in counts.items()]
+        try:
+            await asyncio.to_thread(self._write, rows, urls, now)
+        except Exception as e:
+            logger.warning(f"⚠️  Source index write failed: {e}")
+            return 0
+        recorded = sum(counts.values())
+        self.recorded += recorded
+        return recorded
+
+    def _top(
+        self,
+        query: Optional[str],
+        platform: Optional[str],
+        days: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        clauses = ["day >= ?"]
+        params: List[Any] = [int(time.time() // _DAY) - days + 1]
+        if query:
+            clauses.append("query = ?")
+            params.append(_query_key(query))
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        where = " AND ".join(clauses)
+
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT domain, SUM(citations) AS total, MIN(best_rank), COUNT(DISTINCT query) "
+                f"FROM source_counts WHERE {where} "
+                f"GROUP BY domain ORDER BY total DESC, domain LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            domains = [row[0] for row in rows]
+            if not domains:
+                return []
+            marks = ",".join("?" * len(domains))
+            per_platform = conn.execute(
+                f"SELECT domain, platform, SUM(citations) FROM source_counts "
+                f"WHERE {where} AND domain IN ({marks}) GROUP BY domain, platform",
+                (*params, *domains)
+            ).fetchall()
+            examples = conn.execute(
+                f"SELECT domain, url FROM source_urls WHERE domain IN ({marks}) "
+                f"ORDER BY last_seen DESC",
+                domains
+            ).fetchall()
+
+        platforms: Dict[str, Dict[str, int]] = {}
+        for domain, name, total in per_platform:
+            platforms.setdefault(domain, {})[name] = total
+        urls: Dict[str, List[str]] = {}
+        for domain, url in examples:
+            if len(urls.setdefault(domain, [])) < 3:
+                urls[domain].append(url)
+
+        return [
+            {
+                "domain": domain,
+                "citations": total,
+                "best_rank": best_rank,
+                "queries": queries,
+                "platforms": platforms.get(domain, {}),
+                "example_urls": urls.get(domain, [])
+            }
+            for domain, total, best_rank, queries in rows
+        ]
+
+    async def top_domains(
+        self,
+        query: Optional[str] = None,
+        platform: Optional[str] = None,
+        days: int = 30,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Most cited source domains
+
+        Args:
+            query: Restrict to one query (case and spacing insensitive)
+            platform: Restrict to one platform ("perplexity", ...)
+            days: Look-back window in days, today included
+            limit: Maximum domains returned
+
+        Returns:
+            Domains with citation counts, best source position, number of
+            queries citing them, per-platform counts and example URLs
+        """
+        try:
+            return await asyncio.to_thread(self._top, query, platform, days, limit)
+        except Exception as e:
+            logger.warning(f"⚠️  Source index read failed: {e}")
+            return []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.source_index_enabled,
+            "recorded": self.recorded,
+            "retention_days": self.retention_days
+        }
+
+
+# Global source index (SQLite file is opened lazily)
+source_index = SourceIndex(
+    path=settings.source_index_path,
+    retention_days=settings.source_index_retention_days
+)
@@ -0,0 +1,411 @@
+"""
+Synthetic OpenAI/Perplexity-compatible stand-in server for load testing
+
+Serves `/chat/completions` and `/embeddings` (with and without the `/v1`
+prefix) in the OpenAI/Perplexity wire format, plus Anthropic `/v1/messages`
+and Google `/v1beta/models/{model}:generateContent`. Answers are generated from a
+seeded brand corpus, latency follows a log-normal distribution, and 429s,
+timeouts and malformed JSON are injected at configurable rates.
+
+Run it as a module and point the backend at it:
+
+    python -m src.data.stub_server --port 8900 --error-429-rate 0.05
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+    PERPLEXITY_BASE_URL=http://127.0.0.1:8900
+    PERPLEXITY_API_KEY=stub
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8900
+    GOOGLE_AI_BASE_URL=http://127.0.0.1:8900
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import logging
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
+
+
+# Seeded corpus: topic keywords -> brands commonly cited for that topic
+BRAND_CORPUS: Dict[str, Dict[str, List[str]]] = {
+    "crm": {
+        "keywords": ["crm", "sales", "customer", "pipeline", "lead"],
+        "brands": ["hubspot.com", "salesforce.com", "pipedrive.com", "zoho.com", "freshworks.com"]
+    },
+    "project_management": {
+        "keywords": ["project", "task", "team", "collaboration", "kanban"],
+        "brands": ["asana.com", "monday.com", "trello.com", "clickup.com", "notion.so"]
+    },
+    "email_marketing": {
+        "keywords": ["email", "newsletter", "campaign", "marketing"],
+        "brands": ["mailchimp.com", "klaviyo.com", "sendgrid.com", "convertkit.com", "brevo.com"]
+    },
+    "seo": {
+        "keywords": ["seo", "search", "ranking", "keyword", "backlink", "geo"],
+        "brands": ["semrush.com", "ahrefs.com", "moz.com", "similarweb.com", "screamingfrog.co.uk"]
+    },
+    "analytics": {
+        "keywords": ["analytics", "data", "dashboard", "metrics", "tracking"],
+        "brands": ["mixpanel.com", "amplitude.com", "hotjar.com", "heap.io", "posthog.com"]
+    },
+    "ecommerce": {
+        "keywords": ["store", "shop", "ecommerce", "checkout", "payment"],
+        "brands": ["shopify.com", "bigcommerce.com", "woocommerce.com", "stripe.com", "squarespace.com"]
+    }
+}
+
+SENTENCE_TEMPLATES = [
+    "{name} ({domain}) is a popular choice and is known for {strength}.",
+    "Many teams recommend {name} because of its {strength}.",
+    "{name} stands out for {strength}; see https://{domain} for details.",
+    "If you care about {strength}, {name} is worth evaluating.",
+    "{name} is frequently compared with alternatives thanks to {strength}."
+]
+
+STRENGTHS = [
+    "ease of use", "strong integrations", "competitive pricing", "enterprise features",
+    "reporting and analytics", "customer support", "automation capabilities",
+    "a generous free tier", "scalability", "a large ecosystem"
+]
+
+
+class StubConfig:
+    """Latency, fault-injection and corpus settings for the stand-in server"""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        latency_median_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        error_429_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 60.0,
+        malformed_rate: float = 0.0,
+        extra_brands: Optional[List[str]] = None,
+        brand_rate: float = 0.5
+    ):
+        self.seed = seed
+        self.latency_median_ms = latency_median_ms
+        self.latency_sigma = latency_sigma
+        self.error_429_rate = error_429_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.malformed_rate = malformed_rate
+        self.extra_brands = extra_brands or []
+        self.brand_rate = brand_rate
+
+
+class ResponseGenerator:
+    """
+    Deterministic brand-bearing answers from the seeded corpus
+
+    The same prompt and sample index always produce the same answer for a
+    given seed, so runs are comparable while samples of one prompt differ.
+    """
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+
+    def _rng(self, *parts: Any) -> random.Random:
+        digest = hashlib.sha256(
+            "|".join(str(part) for part in (self.config.seed,) + parts).encode("utf-8")
+        ).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _brands_for(self, prompt: str, rng: random.Random) -> List[str]:
+        prompt_lower = prompt.lower()
+        matched = [
+            topic for topic in BRAND_CORPUS.values()
+            if any(keyword in prompt_lower for keyword in topic["keywords"])
+        ]
+        topic = matched[0] if matched else rng.choice(list(BRAND_CORPUS.values()))
+        pool = list(topic["brands"])
+
+        # Brands named in the prompt, or configured as extras, appear at brand_rate
+        named = [word.strip(".,?!()\"'") for word in prompt_lower.split() if "." in word]
+        for brand in [b for b in named if b and "." in b.strip(".")] + self.config.extra_brands:
+            if brand not in pool and rng.random() < self.config.brand_rate:
+                pool.append(brand)
+
+        rng.shuffle(pool)
+        return pool[:rng.randint(3, min(6, len(pool)))]
+
+    def answer(self, prompt: str, sample_index: int = 0) -> Dict[str, Any]:
+        """
+        Generate one answer
+
+        Args:
+            prompt: Last user message
+            sample_index: Index of the sample among `n` completions
+
+        Returns:
+            Dict with the answer text and cited source URLs
+        """
+        rng = self._rng(prompt, sample_index)
+        brands = self._brands_for(prompt, rng)
+
+        lines = [f"Here are some options worth considering for \"{prompt.strip()[:120]}\":", ""]
+        for rank, domain in enumerate(brands, 1):
+            name = domain.split(".")[0].capitalize()
+            sentence = rng.choice(SENTENCE_TEMPLATES).format(
+                name=name, domain=domain, strength=rng.choice(STRENGTHS)
+            )
+            lines.append(f"{rank}. **{name}** - {sentence}")
+        lines.extend(["", "The best fit depends on your team size, budget and existing tools."])
+
+        citations = [
+            f"https://{domain}/{rng.choice(['pricing', 'features', 'blog/guide', 'compare'])}"
+            for domain in brands
+        ]
+        return {"content": "\n".join(lines), "citations": citations}
+
+    def embedding(self, text: str, dimensions: int = 1536) -> List[float]:
+        """Deterministic unit-length pseudo-embedding"""
+        rng = self._rng("embedding", text)
+        vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    """
+    Build the stand-in FastAPI app
+
+    Args:
+        config: Latency, fault-injection and corpus settings
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="GEO Agent Provider Stub")
+    generator = ResponseGenerator(config)
+    fault_rng = random.Random(config.seed)
+    request_ids = itertools.count(1)
+    counters = {"requests": 0, "rate_limited": 0, "timeouts": 0, "malformed": 0}
+
+    def rate_limit_headers() -> Dict[str, str]:
+        return {
+            "x-ratelimit-limit-requests": "10000",
+            "x-ratelimit-remaining-requests": "9999",
+            "x-ratelimit-reset-requests": "6ms",
+            "x-ratelimit-limit-tokens": "2000000",
+            "x-ratelimit-remaining-tokens": "1999000",
+            "x-ratelimit-reset-tokens": "30ms"
+        }
+
+    async def simulate_upstream() -> Optional[Response]:
+        """Sleep for a sampled latency, then maybe return an injected fault"""
+        counters["requests"] += 1
+        latency = fault_rng.lognormvariate(
+            math.log(max(config.latency_median_ms, 1.0) / 1000.0), config.latency_sigma
+        )
+        roll = fault_rng.random()
+
+        if roll < config.timeout_rate:
+            counters["timeouts"] += 1
+            await asyncio.sleep(config.timeout_seconds)
+            return JSONResponse(
+                {"error": {"message": "Upstream timed out", "type": "timeout"}},
+                status_code=504
+            )
+        roll -= config.timeout_rate
+
+        await asyncio.sleep(latency)
+
+        if roll < config.error_429_rate:
+            counters["rate_limited"] += 1
+            headers = rate_limit_headers()
+            headers.update({"retry-after-ms": "500", "x-ratelimit-remaining-requests": "0"})
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                status_code=429,
+                headers=headers
+            )
+        roll -= config.error_429_rate
+
+        if roll < config.malformed_rate:
+            counters["malformed"] += 1
+            return Response(
+                content='{"id": "chatcmpl-stub", "choices": [{"message": {"content": "trunc',
+                media_type="application/json",
+                headers=rate_limit_headers()
+            )
+
+        return None
+
+    async def chat_completions(request: Request) -> Response:
+        payload = await request.json()
+        fault = await simulate_upstream()
+        if fault is not None:
+            return fault
+
+        messages = payload.get("messages", [])
+        prompt = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        if not isinstance(prompt, str):
+            prompt = " ".join(part.get("text", "") for part in prompt if isinstance(part, dict))
+
+        choices = []
+        citations: List[str] = []
+        for index in range(int(payload.get("n") or 1)):
+            answer = generator.answer(prompt, index)
+            if index == 0:
+                citations = answer["citations"]
+            choices.append({
+                "index": index,
+                "message": {"role": "assistant", "content": answer["content"]},
+                "finish_reason": "stop",
+                "logprobs": None
+            })
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4 + 1
+        completion_tokens = sum(len(c["message"]["content"]) for c in choices) // 4 + 1
+        body = {
+            "id": f"chatcmpl-stub-{next(request_ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": choices,
+            "citations": citations,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+        return JSONResponse(body, headers=rate_limit_headers())
+
+    async def embeddings(request: Request) -> Response:
+        payload = await request.json()
+        fault = await simulate_upstream()
+        if fault is not None:
+            return fault
+
+        inputs = payload.get("input", "")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dimensions = int(payload.get("dimensions") or 1536)
+        tokens = sum(len(str(text)) // 4 + 1 for text in inputs)
+        body = {
+            "object": "list",
+            "model": payload.get("model", "stub"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": generator.embedding(str(text), dimensions)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+        return JSONResponse(body, headers=rate_limit_headers())
+
+    async def anthropic_messages(request: Request) -> Response:
+        payload = await request.json()
+        fault = await simulate_upstream()
+        if fault is not None:
+            return fault
+
+        message = next(
+            (m for m in reversed(payload.get("messages", [])) if m.get("role") == "user"), {}
+        )
+        prompt = message.get("content", "")
+        if not isinstance(prompt, str):
+            prompt = " ".join(block.get("text", "") for block in prompt if isinstance(block, dict))
+        content = generator.answer(prompt)["content"]
+        return JSONResponse({
+            "id": f"msg_stub_{next(request_ids)}",
+            "type": "message",
+            "role": "assistant",
+            "model": payload.get("model", "stub"),
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": len(prompt) // 4 + 1, "output_tokens": len(content) // 4 + 1}
+        }, headers=rate_limit_headers())
+
+    async def google_generate_content(model_action: str, request: Request) -> Response:
+        payload = await request.json()
+        fault = await simulate_upstream()
+        if fault is not None:
+            return fault
+
+        contents = payload.get("contents", [])
+        parts = contents[-1].get("parts", []) if contents else []
+        prompt = " ".join(part.get("text", "") for part in parts)
+        content = generator.answer(prompt)["content"]
+        return JSONResponse({
+            "candidates": [{
+                "index": 0,
+                "content": {"role": "model", "parts": [{"text": content}]},
+                "finishReason": "STOP"
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4 + 1,
+                "candidatesTokenCount": len(content) // 4 + 1
+            },
+            "modelVersion": model_action.split(":")[0]
+        }, headers=rate_limit_headers())
+
+    for prefix in ("", "/v1"):
+        app.add_api_route(f"{prefix}/chat/completions", chat_completions, methods=["POST"])
+        app.add_api_route(f"{prefix}/embeddings", embeddings, methods=["POST"])
+    app.add_api_route("/v1/messages", anthropic_messages, methods=["POST"])
+    app.add_api_route("/v1beta/models/{model_action}", google_generate_content, methods=["POST"])
+
+    @app.get("/health")
+    async def health():
+        """Liveness and injected-fault counters"""
+        return {"status": "ok", **counters}
+
+    return app
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="OpenAI/Perplexity-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=42, help="Corpus and fault RNG seed")
+    parser.add_argument("--latency-median-ms", type=float, default=800.0,
+                        help="Median of the log-normal response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Log-normal shape; larger values give a heavier tail")
+    parser.add_argument("--error-429-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 429")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="Fraction of requests that hang for --timeout-seconds")
+    parser.add_argument("--timeout-seconds", type=float, default=60.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with truncated JSON")
+    parser.add_argument("--brands", default="",
+                        help="Comma-separated extra domains mixed into answers (e.g. acme.com)")
+    parser.add_argument("--brand-rate", type=float, default=0.5,
+                        help="Probability an extra or prompt-named brand appears in an answer")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        seed=args.seed,
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        error_429_rate=args.error_429_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        malformed_rate=args.malformed_rate,
+        extra_brands=[b.strip().lower() for b in args.brands.split(",") if b.strip()],
+        brand_rate=args.brand_rate
+    )
+
+    import uvicorn
+
+    print(f"🧪 Provider stub on http://{args.host}:{args.port} (seed={args.seed})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from contextlib import asynccontextmanager
 
 from src.api.routes import router
 from src.config import settings
+from src.data.discovery import discovery_tracker
+from src.data.http import start_http_client, close_http_client
 from src import __version__
 
 
@@ -17,9 +19,14 @@ async def lifespan(app: FastAPI):
     print(f"📊 Server: http://{settings.host}:{settings.port}")
     print(f"📖 API Docs: http://{settings.host}:{settings.port}/docs")
     
+    # Shared keep-alive transport for all outbound platform requests
+    await start_http_client()
+    
     yield
     
     # Shutdown
+    await close_http_client()
+    await discovery_tracker.save(force=True)
     print("👋 Shutting down GEO Expert Agent")
 
 
@@ -0,0 +1,160 @@
+"""Brand alias registry: names, products and misspellings per tracked domain"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.config import settings
+from src.models.schemas import BrandAliases
+
+logger = logging.getLogger(__name__)
+
+_KINDS = ("names", "products", "misspellings")
+
+
+def normalize_domain(domain: str) -> str:
+    domain = domain.lower().strip()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+class AliasRegistry:
+    """
+    Persistent domain -> aliases registry
+
+    Stored in SQLite next to the memory store and mirrored in memory, so
+    extractors read aliases without touching disk. `version` increases on
+    every change; compiled matchers are cached per version and rebuilt only
+    after aliases change. Writes run in a worker thread, off the event loop.
+
+    The mirror and `version` are process-local: changes made by another
+    process sharing the SQLite file (e.g. a second API worker) are not
+    seen until this process restarts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._aliases: Optional[Dict[str, BrandAliases]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the registry on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS brand_aliases ("
+                "domain TEXT NOT NULL, alias TEXT NOT NULL, kind TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (domain, kind, alias))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _loaded(self) -> Dict[str, BrandAliases]:
+        """In-memory mirror, read from SQLite once"""
+        if self._aliases is None:
+            with self._lock:
+                if self._aliases is None:
+                    aliases: Dict[str, BrandAliases] = {}
+                    try:
+                        rows = self._connect().execute(
+                            "SELECT domain, kind, alias FROM brand_aliases ORDER BY rowid"
+                        ).fetchall()
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️  Could not load brand aliases: {e}")
+                        rows = []
+                    for domain, kind, alias in rows:
+                        entry = aliases.setdefault(domain, BrandAliases(domain=domain))
+                        getattr(entry, kind).append(alias)
+                    self._aliases = aliases
+        return self._aliases
+
+    def get(self, domain: str) -> BrandAliases:
+        """Registered aliases of a domain (empty lists when none)"""
+        domain = normalize_domain(domain)
+        entry = self._loaded().get(domain)
+        return entry.model_copy(deep=True) if entry else BrandAliases(domain=domain)
+
+    def aliases_for(self, domains: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Registered aliases per domain, for MentionMatcher
+
+        Args:
+            domains: Tracked domains
+
+        Returns:
+            domain -> aliases, only for domains with registered aliases
+        """
+        loaded = self._loaded()
+        result = {}
+        for domain in domains:
+            entry = loaded.get(normalize_domain(domain))
+            if entry is not None:
+                result[domain] = entry.all_aliases()
+        return result
+
+    def all(self) -> List[BrandAliases]:
+        return [entry.model_copy(deep=True) for entry in self._loaded().values()]
+
+    def _write(self, domain: str, entry: BrandAliases) -> None:
+        """Replace a domain's rows and its mirror entry (blocking)"""
+        loaded = self._loaded()
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM brand_aliases WHERE domain = ?", (domain,))
+            conn.executemany(
+                "INSERT INTO brand_aliases (domain, alias, kind, updated_at) VALUES (?, ?, ?, ?)",
+                [(domain, alias, kind, now) for kind in _KINDS for alias in getattr(entry, kind)]
+            )
+            conn.commit()
+            if entry.all_aliases():
+                loaded[domain] = entry
+            else:
+                loaded.pop(domain, None)
+            self.version += 1
+
+    async def set(self, aliases: BrandAliases) -> BrandAliases:
+        """
+        Replace a domain's aliases
+
+        Args:
+            aliases: New names, products and misspellings
+
+        Returns:
+            Stored entry (lowercased, deduplicated)
+        """
+        domain = normalize_domain(aliases.domain)
+        entry = BrandAliases(domain=domain)
+        seen = set()
+        for kind in _KINDS:
+            for alias in getattr(aliases, kind):
+                alias = " ".join(alias.lower().split())
+                if alias and alias not in seen:
+                    seen.add(alias)
+                    getattr(entry, kind).append(alias)
+
+        await asyncio.to_thread(self._write, domain, entry)
+        logger.info(f"🏷️  Aliases for {domain}: {len(entry.all_aliases())}")
+        return entry.model_copy(deep=True)
+
+    async def delete(self, domain: str) -> bool:
+        """Remove a domain's aliases; returns whether it had any"""
+        domain = normalize_domain(domain)
+        if domain not in await asyncio.to_thread(self._loaded):
+            return False
+        await self.set(BrandAliases(domain=domain))
+        return True
+
+
+# Global alias registry (SQLite file is opened lazily)
+alias_registry = AliasRegistry(
+    path=settings.alias_registry_path or os.path.join(settings.chroma_db_path, "aliases.sqlite")
+)
@@ -24,6 +24,40 @@ class AnalysisRequest(BaseModel):
         description="Platforms to analyze"
     )
     num_queries: int = Field(default=10, description="Number of queries to test")
+    fresh: bool = Field(
+        default=False,
+        description="Bypass the platform response cache and re-query every platform"
+    )
+    samples_per_query: int = Field(
+        default=1,
+        ge=1,
+        le=10,
+        description="ChatGPT completions sampled per prompt in one API call (n)"
+    )
+    deadline_ms: Optional[int] = Field(
+        default=None,
+        ge=1000,
+        description="Time budget for the whole analysis; on expiry a partial result is returned"
+    )
+    adaptive_sampling: bool = Field(
+        default=False,
+        description="Collect in waves and stop once every mention-rate interval is narrow enough"
+    )
+    target_interval_width: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="Adaptive sampling: stop when all confidence intervals are at most this wide"
+    )
+    max_platform_calls: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Adaptive sampling: upper bound on platform calls for the analysis"
+    )
+    skip_saturated_variations: bool = Field(
+        default=False,
+        description="Stop querying further variations on a platform once its answers are near-duplicates"
+    )
     
     class Config:
         json_schema_extra = {
@@ -37,6 +71,31 @@ class AnalysisRequest(BaseModel):
         }
 
 
+class MentionSpan(BaseModel):
+    """Where a tracked domain (or one of its aliases) appears in a response"""
+    domain: str
+    alias: str
+    start: int = Field(..., ge=0, description="Character offset in raw_response")
+    end: int = Field(..., ge=0, description="Character offset one past the match")
+    word_index: int = Field(..., ge=0, description="Number of words before the match")
+    rank: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Position of the list item containing the mention (order of appearance without a list)"
+    )
+
+
+class BrandAliases(BaseModel):
+    """Names a tracked domain is recognised by in AI answers, besides the domain itself"""
+    domain: str
+    names: List[str] = Field(default_factory=list, description="Company and brand names")
+    products: List[str] = Field(default_factory=list, description="Product names")
+    misspellings: List[str] = Field(default_factory=list, description="Common misspellings")
+
+    def all_aliases(self) -> List[str]:
+        return self.names + self.products + self.misspellings
+
+
 class CitationData(BaseModel):
     """Citation data for a specific query"""
     query: str
@@ -46,6 +105,31 @@ class CitationData(BaseModel):
     context: Optional[str] = None
     competitors_mentioned: List[str] = Field(default_factory=list)
     raw_response: str
+    sample_index: int = 0
+    mentions: List[MentionSpan] = Field(
+        default_factory=list,
+        description="Brand and competitor mentions, in order, extracted at collection time"
+    )
+    sources: List[str] = Field(
+        default_factory=list,
+        description="Source URLs the platform cited (Perplexity)"
+    )
+    duplicate_cluster: Optional[int] = Field(
+        default=None,
+        description="Near-duplicate cluster within the analysis (None when not clustered)"
+    )
+    near_duplicate: bool = Field(
+        default=False,
+        description="Whether an earlier response of the analysis is nearly identical"
+    )
+    source_domains: List[Optional[str]] = Field(
+        default_factory=list,
+        description="Registrable domain of each source URL (None when it has none)"
+    )
+
+    def first_mention(self, domain: str) -> Optional[MentionSpan]:
+        """Earliest mention of a domain, or None"""
+        return next((span for span in self.mentions if span.domain == domain), None)
 
 
 class VisibilityScore(BaseModel):
@@ -55,6 +139,9 @@ class VisibilityScore(BaseModel):
     mention_rate: float
     avg_position: Optional[float] = None
     platforms: Dict[str, int]
+    mention_rate_low: Optional[float] = None  # Wilson confidence interval on mention_rate
+    mention_rate_high: Optional[float] = None
+    dedup_mention_rate: Optional[float] = None  # Mention rate over distinct (non-duplicate) responses
     
     
 class CompetitorComparison(BaseModel):
@@ -65,6 +152,14 @@ class CompetitorComparison(BaseModel):
     top_competitor: Optional[str] = None
 
 
+class DiscoveredCompetitor(BaseModel):
+    """Frequently mentioned entity that is not among the tracked domains"""
+    entity: str
+    kind: Literal["domain", "name"]
+    estimated_mentions: int = Field(..., description="Responses mentioning it (count-min estimate)")
+    response_share: float = Field(..., ge=0.0, le=1.0)
+
+
 class Hypothesis(BaseModel):
     """Hypothesis explaining visibility patterns"""
     title: str
@@ -120,6 +215,18 @@ class AnalysisResult(BaseModel):
         default_factory=dict,
         description="Self-critique evaluation results and quality scores"
     )
+    partial: bool = Field(
+        default=False,
+        description="True if the deadline cut off queries or analysis steps"
+    )
+    coverage: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Planned vs completed platform queries and skipped steps"
+    )
+    discovered_competitors: List[DiscoveredCompetitor] = Field(
+        default_factory=list,
+        description="Untracked domains and brands frequently seen in answers to this query"
+    )
     
     
 class CompareRequest(BaseModel):
@@ -127,6 +234,7 @@ class CompareRequest(BaseModel):
     query: str
     domains: List[str] = Field(..., min_length=2, max_length=5)
     platforms: List[Platform] = Field(default=[Platform.CHATGPT, Platform.PERPLEXITY])
+    fresh: bool = Field(default=False, description="Bypass the platform response cache")
     
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,13 @@
+"""Test settings: placeholder API keys and throwaway storage paths"""
+
+import os
+import tempfile
+
+_STORAGE = tempfile.mkdtemp(prefix="geo-tests-")
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("PERPLEXITY_API_KEY", "test")
+os.environ.setdefault("RESPONSE_CACHE_PATH", os.path.join(_STORAGE, "responses.sqlite"))
+os.environ.setdefault("SOURCE_INDEX_PATH", os.path.join(_STORAGE, "sources.sqlite"))
+os.environ.setdefault("ALIAS_REGISTRY_PATH", os.path.join(_STORAGE, "aliases.sqlite"))
+os.environ.setdefault("CHROMA_DB_PATH", os.path.join(_STORAGE, "chroma"))
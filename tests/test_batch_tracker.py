@@ -0,0 +1,34 @@
+import json
+import os
+
+from src.agents.batch_tracker import BatchTracker
+from src.config import settings
+from src.data.batch import LocalBatchBackend
+from src.models.schemas import AnalysisRequest
+
+
+def target(brand, query="best crm software", num_queries=3):
+    return AnalysisRequest(
+        query=query, brand_domain=brand, competitors=["zoho.com"], num_queries=num_queries, samples_per_query=2
+    )
+
+
+async def test_targets_sharing_a_query_share_batch_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "batch_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    tracker = BatchTracker(backend="local")
+    tracker.backend = LocalBatchBackend(directory=str(tmp_path / "local"))
+
+    targets = [target("hubspot.com"), target("pipedrive.com"), target("hubspot.com", query="top help desk tools")]
+    run_id = await tracker.submit(targets)
+
+    with open(os.path.join(tmp_path, run_id, "input.jsonl"), encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    assert len(lines) == 6
+    assert len({line["body"]["messages"][-1]["content"] for line in lines}) == 6
+
+    report = await tracker.collect(run_id, poll_interval=0.0)
+    # Each target still scores every answer to its own prompts
+    collected = [entry["citations_collected"] for entry in report["targets"]]
+    assert collected == [6, 6, 6]
+    assert all(not entry["errors"] for entry in report["targets"])
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from src.config import settings
+from src.data import collectors, perplexity
+from src.data.collectors import (
+    ChatGPTCollector,
+    ClaudeCollector,
+    CollectorRegistry,
+    GoogleAICollector,
+    HTTPTextCollector,
+    PerplexityCollector,
+    PlatformCollector,
+    collector_registry,
+)
+from src.data.openai_client import OpenAIClient
+from src.data.perplexity import PerplexityClient
+from src.data.stub_server import StubConfig, create_app
+from src.models.schemas import Platform
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Route the shared HTTP client to an in-process stub server"""
+    app = create_app(StubConfig(latency_median_ms=1, latency_sigma=0.0, extra_brands=["acme.com"], brand_rate=1.0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+    monkeypatch.setattr(collectors, "get_http_client", lambda: client)
+    monkeypatch.setattr(settings, "anthropic_base_url", "http://stub")
+    monkeypatch.setattr(settings, "google_ai_base_url", "http://stub")
+    return client
+
+
+def test_built_in_collectors_are_registered():
+    assert set(collector_registry.platforms()) == set(Platform)
+    for platform in Platform:
+        assert collector_registry.get(platform).platform == platform
+    stats = collector_registry.stats()
+    assert stats["claude"]["provider"] == "anthropic"
+    assert stats["google_ai"]["cost_per_call_usd"] > 0
+
+
+def test_register_replaces_platform_collector():
+    registry = CollectorRegistry()
+    first, second = ClaudeCollector(), ClaudeCollector()
+    registry.register(first)
+    registry.register(second)
+    assert registry.platforms() == [Platform.CLAUDE]
+    assert registry.get(Platform.CLAUDE) is second
+    assert registry.get(Platform.CHATGPT) is None
+
+
+def test_collector_bases_are_abstract():
+    with pytest.raises(TypeError):
+        PlatformCollector()
+
+    class MissingParser(HTTPTextCollector):
+        platform = Platform.CLAUDE
+        provider = "anthropic"
+        model = "stub"
+
+        def build_request(self, query):
+            return "http://stub", {}, {}
+
+    with pytest.raises(TypeError):
+        MissingParser()
+
+
+@pytest.mark.parametrize("collector_class", [ClaudeCollector, GoogleAICollector])
+async def test_http_text_collector_against_stub(stub, collector_class):
+    collector = collector_class()
+    competitors = ["hubspot.com", "salesforce.com", "pipedrive.com", "zoho.com", "freshworks.com"]
+    citations = await collector.collect("best crm software", "acme.com", competitors, fresh=True)
+    assert len(citations) == 1
+    citation = citations[0]
+    assert citation.platform == collector.platform
+    assert citation.raw_response.startswith("Here are some options")
+    assert citation.brand_mentioned == ("acme.com" in citation.raw_response)
+    # Stub answers list three or more of the CRM corpus brands
+    assert len(citation.competitors_mentioned) + citation.brand_mentioned >= 3
+    assert all(span.rank is not None for span in citation.mentions)
+
+
+
+def stub_collector(kind, client, monkeypatch):
+    """Collector of one platform whose upstream is the stub app behind `client`"""
+    if kind == "chatgpt":
+        collector = ChatGPTCollector(OpenAIClient())
+        collector.client.client = AsyncOpenAI(api_key="test", base_url="http://stub/v1", http_client=client)
+        return collector
+    if kind == "perplexity":
+        monkeypatch.setattr(perplexity, "get_http_client", lambda: client)
+        return PerplexityCollector(PerplexityClient(api_key="test"))
+    monkeypatch.setattr(collectors, "get_http_client", lambda: client)
+    monkeypatch.setattr(settings, "anthropic_base_url", "http://stub")
+    return ClaudeCollector()
+
+
+@pytest.mark.parametrize("kind", ["chatgpt", "perplexity", "claude"])
+@pytest.mark.parametrize("fresh, expected_calls", [(True, 4), (False, 1)])
+async def test_fresh_samples_are_separate_upstream_calls(monkeypatch, kind, fresh, expected_calls):
+    app = create_app(StubConfig(latency_median_ms=20, latency_sigma=0.0))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    collector = stub_collector(kind, client, monkeypatch)
+
+    # Concurrent repeats of one (query, platform) pair, as an adaptive wave issues them
+    results = await asyncio.gather(*(
+        collector.collect("best crm software", "acme.com", [], fresh=fresh) for _ in range(4)
+    ))
+    assert sum(len(citations) for citations in results) == 4
+    health = (await client.get("/health")).json()
+    assert health["requests"] == expected_calls
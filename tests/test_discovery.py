@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from src.data.discovery import CountMinSketch, DiscoveryTracker, HeavyHitters, extract_entities
+from src.models.schemas import CitationData, Platform
+
+
+def citation(text, sources=()):
+    return CitationData(
+        query="best crm", platform=Platform.PERPLEXITY, brand_mentioned=False,
+        raw_response=text, sources=list(sources)
+    )
+
+
+def tracker(path=None, save_interval=1):
+    return DiscoveryTracker(
+        k=10, width=256, depth=4, query_width=64, max_queries=2, path=path, save_interval=save_interval
+    )
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("see https://www.HubSpot.com/pricing today", {"hubspot.com"}),
+    ("both bbc.co.uk and docs.github.io", {"bbc.co.uk", "docs.github.io"}),
+    ("The best option is Pipedrive Sales Hub.", {"pipedrive sales hub"}),
+    ("Overall Zoho and Monday are solid", {"zoho", "monday"}),
+    ("Additionally, consider these tools.", set()),
+    ("Use an API or SQL", set()),
+    ("", set()),
+])
+def test_extract_entities(text, expected):
+    assert extract_entities(text) == expected
+
+
+def test_count_min_sketch_never_underestimates():
+    sketch = CountMinSketch(width=16, depth=3)
+    counts = {f"item{i}": i for i in range(1, 40)}
+    for item, count in counts.items():
+        sketch.add(item, count)
+    assert all(sketch.estimate(item) >= count for item, count in counts.items())
+
+
+def test_heavy_hitters_keep_most_frequent():
+    hitters = HeavyHitters(k=3, width=1024, depth=4)
+    for item, count in [("a", 10), ("b", 7), ("c", 5), ("d", 1), ("e", 2)]:
+        for _ in range(count):
+            hitters.add(item)
+    assert [item for item, _ in hitters.top()] == ["a", "b", "c"]
+    assert hitters.top(1) == [("a", 10)]
+
+
+def test_heavy_hitters_round_trip():
+    hitters = HeavyHitters(k=3, width=64, depth=2)
+    hitters.add_document({"a", "b"})
+    restored = HeavyHitters.from_dict(json.loads(json.dumps(hitters.to_dict())))
+    assert restored.top() == hitters.top()
+    assert restored.observations == 1
+    assert restored.sketch.estimate("a") == 1
+
+
+def test_discovered_leaves_out_tracked_domains():
+    discovery = tracker()
+    discovery.observe("best crm", [
+        citation("HubSpot and Pipedrive lead, see pipedrive.com", ["https://zoho.com/crm"]),
+        citation("Pipedrive is simple", ["https://zoho.com/crm"]),
+    ])
+    found = {entry.entity: entry for entry in discovery.discovered("Best  CRM", tracked=["hubspot.com"])}
+    assert "hubspot" not in found
+    assert "pipedrive" not in found  # Its domain is listed instead
+    assert found["pipedrive.com"].kind == "domain"
+    assert found["zoho.com"].response_share == 1.0
+    assert discovery.discovered("unknown query") == []
+
+
+def test_per_query_sketches_are_bounded():
+    discovery = tracker()
+    for query in ("one", "two", "three"):
+        discovery.observe(query, [citation("Pipedrive")])
+    assert list(discovery.queries) == ["two", "three"]
+    assert discovery.overall.observations == 3
+
+
+async def test_save_waits_for_interval(tmp_path):
+    path = tmp_path / "sketch.json"
+    discovery = tracker(str(path), save_interval=2)
+    discovery.observe("best crm", [citation("Pipedrive")])
+    assert not await discovery.save()
+    assert not path.exists()
+
+    discovery.observe("best crm", [citation("Pipedrive")])
+    assert await discovery.save()
+    assert discovery.unsaved == 0
+
+    restored = tracker(str(path))
+    assert restored.overall.top() == discovery.overall.top()
+    assert list(restored.queries) == ["best crm"]
+
+
+async def test_forced_save_writes_pending_analyses(tmp_path):
+    path = tmp_path / "sketch.json"
+    discovery = tracker(str(path), save_interval=100)
+    assert not await discovery.save(force=True)  # Nothing observed yet
+
+    discovery.observe("best crm", [citation("Pipedrive")])
+    assert await discovery.save(force=True)
+    assert tracker(str(path)).overall.observations == 1
+
+
+async def test_save_without_path_is_a_no_op():
+    discovery = tracker()
+    discovery.observe("best crm", [citation("Pipedrive")])
+    assert not await discovery.save(force=True)
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from src.data.hedging import HedgeBudget, HedgePolicy, LatencyTracker
+
+
+def policy(samples=(), budget_tokens=1.0):
+    hedge = HedgePolicy(
+        "test", HedgeBudget(ratio=0.0, min_tokens=budget_tokens), percentile=0.5, min_samples=3, window=10
+    )
+    for seconds in samples:
+        hedge.latencies.record(seconds)
+    return hedge
+
+
+def test_percentile_nearest_rank():
+    tracker = LatencyTracker(window=4)
+    assert tracker.percentile(0.5) is None
+    for seconds in (5.0, 1.0, 2.0, 3.0, 4.0):
+        tracker.record(seconds)
+    # Window keeps the last four samples
+    assert len(tracker) == 4
+    assert tracker.percentile(0.5) == 2.0
+    assert tracker.percentile(0.99) == 4.0
+
+
+def test_no_hedge_until_warmed_up():
+    assert policy([0.01, 0.01]).hedge_delay() is None
+    assert policy([0.01, 0.02, 0.03]).hedge_delay() == 0.02
+
+
+async def test_slow_call_is_hedged_and_fast_copy_wins():
+    hedge = policy([0.01] * 3)
+    delays = [1.0, 0.0]
+    cancelled = []
+
+    async def fn():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedge.call(fn) == 0.0
+    assert hedge.hedges == 1
+    assert hedge.hedge_wins == 1
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+
+async def test_exhausted_budget_skips_hedge():
+    hedge = policy([0.01] * 3, budget_tokens=0.0)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert await hedge.call(fn) == "ok"
+    assert len(calls) == 1
+    assert hedge.budget.exhausted == 1
+
+
+async def test_error_raised_when_every_attempt_fails():
+    hedge = policy([0.01] * 3)
+
+    async def fn():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        await hedge.call(fn)
+
+
+async def test_only_successful_requests_are_timed():
+    hedge = policy()
+
+    async def ok():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def failed():
+        raise RuntimeError("down")
+
+    await hedge.call(ok)
+    with pytest.raises(RuntimeError):
+        await hedge.call(failed)
+    assert len(hedge.latencies) == 1
+    assert hedge.latencies.percentile(0.5) >= 0.01
@@ -0,0 +1,25 @@
+import pytest
+
+from src.config import settings
+from src.data.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.data.http import request_timeout
+
+
+def test_request_timeout_keeps_connect_limit():
+    timeout = request_timeout(30.0)
+    assert timeout.read == timeout.write == timeout.pool == 30.0
+    assert timeout.connect == settings.http_connect_timeout
+
+
+def test_request_timeout_is_clamped_to_deadline():
+    with deadline_scope(Deadline(500)):
+        timeout = request_timeout(30.0)
+    assert 0 < timeout.read <= 0.5
+    assert timeout.connect <= timeout.read
+
+
+def test_request_timeout_after_deadline_raises():
+    deadline = Deadline(1000)
+    deadline.expires_at = 0.0
+    with deadline_scope(deadline), pytest.raises(DeadlineExceeded):
+        request_timeout(30.0)
@@ -0,0 +1,95 @@
+from src.agents.json_stream import JSONArrayStream
+
+
+def feed_all(chunks):
+    parser = JSONArrayStream()
+    return [parser.feed(chunk) for chunk in chunks], parser
+
+
+def test_fenced_array():
+    results, parser = feed_all(['```json\n[{"a": 1}, {"b": 2}]\n```'])
+    assert results == [[{"a": 1}, {"b": 2}]]
+    assert parser.finished
+    assert parser.count == 2
+
+
+def test_fence_before_bracket_with_whitespace():
+    results, parser = feed_all(["```JSON\n  [\n", '  {"a": 1}\n]'])
+    assert results == [[], [{"a": 1}]]
+    assert parser.finished
+
+
+def test_bare_array():
+    results, _ = feed_all(['[{"a": 1}]'])
+    assert results == [[{"a": 1}]]
+
+
+def test_prose_with_brackets_before_fence():
+    results, parser = feed_all(['Here are [3] ideas:\n```json\n[{"a":1},', '{"b":"x]"}]'])
+    assert results == [[{"a": 1}], [{"b": "x]"}]]
+    assert parser.finished
+
+
+def test_prose_brackets_without_objects_are_skipped():
+    results, parser = feed_all(["Pick [1, 2] or [ ], then:\n", '[{"a": 1}]'])
+    assert results == [[], [{"a": 1}]]
+    assert parser.finished
+
+
+def test_bracketed_prose_that_yields_nothing_resets():
+    results, parser = feed_all(['Template [{name}] below:\n[{"a": 1}]'])
+    assert results == [[{"a": 1}]]
+    assert parser.finished
+
+
+def test_empty_fenced_array_keeps_scanning():
+    results, parser = feed_all(['```json\n[]\n```\nActually:\n[{"a": 1}]'])
+    assert results == [[{"a": 1}]]
+    assert parser.finished
+
+
+def test_bracket_at_chunk_end_waits_for_next_character():
+    results, parser = feed_all(["Answer: [", ' {"a": 1}]'])
+    assert results == [[], [{"a": 1}]]
+    assert parser.finished
+
+
+def test_object_split_across_chunks():
+    text = '[{"title": "One", "nested": {"k": [1, 2]}}, {"title": "Two"}]'
+    parser = JSONArrayStream()
+    items = []
+    for char in text:
+        items.extend(parser.feed(char))
+    assert items == [{"title": "One", "nested": {"k": [1, 2]}}, {"title": "Two"}]
+    assert parser.finished
+
+
+def test_brackets_and_braces_inside_strings():
+    results, _ = feed_all(['[{"a": "}]{[", "b": "quote \\" ]"}, ', '{"c": "\\\\"}]'])
+    assert results == [[{"a": "}]{[", "b": 'quote " ]'}], [{"c": "\\"}]]
+
+
+def test_malformed_object_is_skipped():
+    results, parser = feed_all(['[{"a": 1,}, {"b": 2}]'])
+    assert results == [[{"b": 2}]]
+    assert parser.count == 1
+
+
+def test_text_after_array_is_ignored():
+    results, parser = feed_all(['[{"a": 1}]\n[{"b": 2}]'])
+    assert results == [[{"a": 1}]]
+    assert parser.finished
+
+
+def test_consumed_text_is_not_rescanned():
+    text = "Some prose first. " * 20 + "```json\n[" + ", ".join(f'{{"n": {i}}}' for i in range(200)) + "]"
+    parser = JSONArrayStream()
+    items = []
+    longest = 0
+    for char in text:
+        items.extend(parser.feed(char))
+        longest = max(longest, len(parser._carry) + sum(map(len, parser._object_parts)))
+    assert [item["n"] for item in items] == list(range(200))
+    # Only a short tail and the open object are held for scanning
+    assert longest <= 2 * 64
+    assert parser.text == text
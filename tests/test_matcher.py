@@ -0,0 +1,104 @@
+import pytest
+
+from src.data.matcher import MentionMatcher, default_aliases, extract_mentions, get_matcher
+from src.memory.aliases import AliasRegistry
+from src.models.schemas import BrandAliases
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = AliasRegistry(str(tmp_path / "aliases.sqlite"))
+    monkeypatch.setattr("src.data.matcher.alias_registry", registry)
+    return registry
+
+
+def test_default_aliases():
+    assert default_aliases("www.HubSpot.com") == ["hubspot.com", "hubspot"]
+    assert default_aliases("localhost") == ["localhost"]
+
+
+@pytest.mark.parametrize("text, found", [
+    ("Try Acme today", True),
+    ("acme.com is popular", True),
+    ("(Acme), then", True),
+    ("Acme.", True),
+    ("Acmeology is different", False),
+    ("superacme is different", False),
+    ("acme-corp is different", False),
+    ("acme.io is a different site", False),
+    ("pre-acme era", False),
+])
+def test_word_boundaries(text, found):
+    matcher = MentionMatcher({"acme.com": default_aliases("acme.com")})
+    assert bool(matcher.scan(text)) is found
+
+
+def test_longest_overlapping_alias_wins():
+    matcher = MentionMatcher({
+        "hubspot.com": ["hubspot", "hubspot crm"],
+        "crm.io": ["crm"],
+    })
+    matches = matcher.scan("HubSpot CRM beats plain CRM")
+    assert [(m.domain, m.alias) for m in matches] == [
+        ("hubspot.com", "hubspot crm"),
+        ("crm.io", "crm"),
+    ]
+
+
+def test_offsets_and_word_index():
+    text = "First, try Acme. Later acme.com again"
+    matches = MentionMatcher({"acme.com": default_aliases("acme.com")}).scan(text)
+    assert [(m.start, m.end, m.word_index) for m in matches] == [(11, 15, 2), (23, 31, 4)]
+    for match in matches:
+        assert text[match.start:match.end].lower() == match.alias
+        assert match.word_index == len(text[:match.start].split())
+
+
+def test_first_mentions_per_domain():
+    matcher = MentionMatcher({"a.com": ["alpha"], "b.com": ["beta"]})
+    first = matcher.first_mentions("beta, alpha, beta, alpha")
+    assert {domain: match.start for domain, match in first.items()} == {"a.com": 6, "b.com": 0}
+
+
+def test_ranks_follow_list_structure():
+    text = "Top tools:\n1. Beta CRM\n2. Acme, similar to Beta\n3. Gamma\n"
+    result = extract_mentions(text, "acme.com", ["beta.com", "gamma.com"], aliases={})
+    assert [(span.domain, span.rank) for span in result.spans] == [
+        ("beta.com", 1), ("acme.com", 2), ("beta.com", 2), ("gamma.com", 3)
+    ]
+    assert result.brand_mentioned
+    assert result.brand_rank == 2
+    assert result.competitors_mentioned == ["beta.com", "gamma.com"]
+
+
+def test_ranks_without_list_follow_first_appearance():
+    result = extract_mentions("Gamma or Acme, or gamma again", "acme.com", ["gamma.com"], aliases={})
+    assert [(span.domain, span.rank) for span in result.spans] == [
+        ("gamma.com", 1), ("acme.com", 2), ("gamma.com", 1)
+    ]
+    assert result.brand_rank == 2
+
+
+def test_explicit_aliases_are_added():
+    result = extract_mentions("Try Widgetron", "acme.com", [], aliases={"acme.com": ["Widgetron"]})
+    assert result.brand_mentioned
+    assert result.spans[0].alias == "widgetron"
+
+
+def test_matcher_is_cached_per_domain_set(registry):
+    assert get_matcher(["acme.com", "beta.com"]) is get_matcher(["acme.com", "beta.com"])
+    assert get_matcher(["acme.com"]) is not get_matcher(["acme.com", "beta.com"])
+
+
+async def test_registry_change_invalidates_cached_matcher(registry):
+    before = get_matcher(["acme.com"])
+    assert not before.scan("Widgetron is great")
+
+    await registry.set(BrandAliases(domain="acme.com", products=["Widgetron"]))
+    after = get_matcher(["acme.com"])
+    assert after is not before
+    assert [m.alias for m in after.scan("Widgetron is great")] == ["widgetron"]
+
+    assert await registry.delete("acme.com")
+    assert not await registry.delete("acme.com")
+    assert not get_matcher(["acme.com"]).scan("Widgetron is great")
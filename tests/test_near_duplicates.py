@@ -0,0 +1,92 @@
+import pytest
+
+from src.data.near_duplicates import DuplicateClusters, LSHIndex, MinHasher, shingles, similarity
+from src.models.schemas import CitationData, Platform
+
+ANSWER = (
+    "The best CRM tools for small businesses are HubSpot, Salesforce and Pipedrive. "
+    "HubSpot offers a generous free tier, Salesforce scales to large teams, and "
+    "Pipedrive focuses on visual sales pipelines for growing companies."
+)
+REWORDED = ANSWER.replace("generous free tier", "generous free plan")
+OTHER = (
+    "For project management, teams often choose Asana, Trello or Jira depending on "
+    "whether they need simple boards, flexible task lists or detailed issue tracking."
+)
+
+
+@pytest.fixture
+def hasher():
+    return MinHasher(num_perm=128, shingle_size=3)
+
+
+def citation(text):
+    return CitationData(query="best crm", platform=Platform.CHATGPT, brand_mentioned=False, raw_response=text)
+
+
+def test_shingles_are_case_insensitive_and_distinct():
+    assert len(shingles("A b c a B C", 3)) == 3
+    assert len(shingles("two words", 3)) == 1
+    assert len(shingles("", 3)) == 0
+
+
+def test_signature_similarity_tracks_overlap(hasher):
+    base = hasher.signature(ANSWER)
+    assert similarity(base, hasher.signature(ANSWER.upper())) == 1.0
+    assert similarity(base, hasher.signature(REWORDED)) > 0.7
+    assert similarity(base, hasher.signature(OTHER)) < 0.2
+
+
+def test_clusters_and_effective_sample_size(hasher):
+    clusters = DuplicateClusters(hasher, bands=32, threshold=0.7)
+    responses = [citation(ANSWER), citation(OTHER), citation(REWORDED), citation(ANSWER)]
+    assert [clusters.add(c) for c in responses] == [False, False, True, True]
+    assert [c.duplicate_cluster for c in responses] == [0, 1, 0, 0]
+    assert [c.near_duplicate for c in responses] == [False, False, True, True]
+    assert clusters.effective_sample_size == 2
+    stats = clusters.stats()
+    assert stats["responses"] == 4
+    assert stats["largest_cluster"] == 3
+    assert stats["duplicate_share"] == 0.5
+
+
+def test_empty_responses_are_not_clustered(hasher):
+    clusters = DuplicateClusters(hasher, bands=32, threshold=0.7)
+    responses = [citation(""), citation("  ...  "), citation(ANSWER), citation("")]
+    assert [clusters.add(c) for c in responses] == [False, False, False, False]
+    assert [c.duplicate_cluster for c in responses] == [None, None, 0, None]
+    assert not any(c.near_duplicate for c in responses)
+    assert clusters.effective_sample_size == 1
+    assert clusters.stats()["empty_responses"] == 3
+
+
+def test_lsh_nearest_and_eviction(hasher):
+    index = LSHIndex(num_perm=128, bands=32, max_items=2)
+    first = index.insert(hasher.signature(ANSWER))
+    index.insert(hasher.signature(OTHER))
+    match = index.nearest(hasher.signature(REWORDED), threshold=0.7)
+    assert match is not None and match[0] == first
+
+    # A third item evicts the oldest
+    index.insert(hasher.signature("Something else entirely about databases and indexes"))
+    assert len(index) == 2
+    assert index.nearest(hasher.signature(ANSWER), threshold=0.7) is None
+    assert index.nearest(hasher.signature(OTHER), threshold=0.7) is not None
+
+
+def test_history_matches_across_analyses(hasher):
+    history = LSHIndex(num_perm=128, bands=32, max_items=100)
+    earlier = DuplicateClusters(hasher, bands=32, threshold=0.7, history=history)
+    earlier.add(citation(ANSWER))
+    earlier.add(citation(ANSWER))
+    # Not flushed yet: an analysis never matches its own responses in history
+    assert earlier.history_duplicates == 0
+    earlier.flush_history()
+    assert len(history) == 2
+
+    later = DuplicateClusters(hasher, bands=32, threshold=0.7, history=history)
+    reworded = citation(REWORDED)
+    assert not later.add(reworded)
+    assert not reworded.near_duplicate
+    later.add(citation(OTHER))
+    assert later.history_duplicates == 1
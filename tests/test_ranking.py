@@ -0,0 +1,99 @@
+import pytest
+
+from src.data.ranking import assign_ranks, first_ranks, parse_list_items
+
+NUMBERED = """Here are the best CRMs:
+
+1. Alpha - simple pipelines
+2. Bravo - enterprise features
+3) Charlie - free tier
+
+Delta is worth a mention too.
+"""
+
+BULLETED = """Options:
+- Alpha
+* Bravo, much like Alpha
++ Charlie
+• Delta
+"""
+
+MARKDOWN_HEADINGS = """Intro mentions Echo.
+
+### 1. Alpha
+Great for startups.
+
+### 2. Bravo
+- Pros: Charlie integration
+- Cons: price
+
+## Summary
+Delta wins overall.
+"""
+
+BOLD_HEADINGS = """Top picks:
+
+**1. Alpha**
+Easy to use.
+
+**2. Bravo**: strong reporting, unlike Charlie.
+
+**3. Delta**
+"""
+
+NESTED = """1. Alpha
+   - works with Echo
+   - cheaper than Bravo
+2. Charlie
+    1. Delta plugin
+3. Foxtrot
+"""
+
+NUMBERED_WITH_BOLD_NOTES = """1. Alpha
+**Pros:** Bravo import
+2. Charlie
+
+**Note:** Delta is not ranked
+"""
+
+NO_LIST = "Alpha and Bravo are fine, but Alpha is better than Charlie."
+
+
+@pytest.mark.parametrize("text, expected", [
+    (NUMBERED, {"Alpha": 1, "Bravo": 2, "Charlie": 3, "Delta": None}),
+    (BULLETED, {"Alpha": 1, "Bravo": 2, "Charlie": 3, "Delta": 4}),
+    (MARKDOWN_HEADINGS, {"Echo": None, "Alpha": 1, "Bravo": 2, "Charlie": 2, "Delta": None}),
+    (BOLD_HEADINGS, {"Alpha": 1, "Bravo": 2, "Charlie": 2, "Delta": 3}),
+    (NESTED, {"Alpha": 1, "Echo": 1, "Bravo": 1, "Charlie": 2, "Delta": 2, "Foxtrot": 3}),
+    (NUMBERED_WITH_BOLD_NOTES, {"Alpha": 1, "Bravo": 1, "Charlie": 2, "Delta": None}),
+    (NO_LIST, {"Alpha": 1, "Bravo": 2, "Charlie": 3}),
+], ids=["numbered", "bulleted", "markdown-headings", "bold-headings", "nested", "bold-notes", "no-list"])
+def test_ranks(text, expected):
+    names = sorted(expected, key=text.index)
+    ranks = assign_ranks(text, [text.index(name) for name in names], names)
+    assert dict(zip(names, ranks)) == expected
+
+
+@pytest.mark.parametrize("text, count", [
+    (NUMBERED, 3),
+    (BULLETED, 4),
+    (MARKDOWN_HEADINGS, 2),
+    (BOLD_HEADINGS, 3),
+    (NESTED, 3),
+    (NO_LIST, 0),
+    ("", 0),
+])
+def test_item_count(text, count):
+    items = parse_list_items(text)
+    assert [item.rank for item in items] == list(range(1, count + 1))
+    assert all(item.start < item.end for item in items)
+
+
+def test_repeated_mentions_use_every_offset():
+    text = "1. Alpha\n2. Bravo, then Alpha again\n"
+    starts = [text.index("Alpha"), text.index("Bravo"), text.rindex("Alpha")]
+    assert assign_ranks(text, starts, ["a", "b", "a"]) == [1, 2, 2]
+
+
+def test_first_ranks_prefer_first_ranked_mention():
+    assert first_ranks(["a", "b", "a", "c"], [None, 2, 3, None]) == {"a": 3, "b": 2, "c": None}
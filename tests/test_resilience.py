@@ -0,0 +1,221 @@
+import asyncio
+import json
+import types
+
+import httpx
+import pytest
+
+from src.data import resilience
+from src.data.cassette import CassetteMissError
+from src.data.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.data.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    PlatformQueryError,
+    ResiliencePolicy,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable,
+)
+
+
+class FakeClock:
+    """Stands in for the `time`, `asyncio` and `random` modules inside resilience"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+    @staticmethod
+    def uniform(low, high):
+        return high  # Always the full jitter ceiling
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, "time", fake)
+    monkeypatch.setattr(resilience, "random", fake)
+    monkeypatch.setattr(
+        resilience, "asyncio", types.SimpleNamespace(sleep=fake.sleep, CancelledError=asyncio.CancelledError)
+    )
+    return fake
+
+
+def status_error(status):
+    request = httpx.Request("GET", "https://example.com")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def make_policy(max_attempts=3, threshold=5, reset_timeout=30.0, tokens=3.0):
+    return ResiliencePolicy(
+        "test",
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0.5, max_delay=2.0),
+        budget=RetryBudget(ratio=0.0, min_tokens=tokens),
+        breaker=CircuitBreaker(failure_threshold=threshold, reset_timeout=reset_timeout)
+    )
+
+
+def failing(errors, result="ok"):
+    """Coroutine factory raising `errors` in turn, then returning `result`"""
+    errors = list(errors)
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+@pytest.mark.parametrize("error, expected", [
+    (httpx.ConnectTimeout("slow"), True),
+    (httpx.ConnectError("refused"), True),
+    (status_error(429), True),
+    (status_error(503), True),
+    (status_error(400), False),
+    (status_error(401), False),
+    (json.JSONDecodeError("bad", "", 0), True),
+    (DeadlineExceeded(), False),
+    (CassetteMissError("missing"), False),
+    (ValueError("bug"), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_backoff_is_capped_exponential(clock):
+    policy = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=2.0)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 2.0, 2.0]
+
+
+async def test_retries_with_backoff_then_succeeds(clock):
+    policy = make_policy()
+    fn = failing([status_error(503), httpx.ReadTimeout("slow")])
+    assert await policy.call(fn) == "ok"
+    assert len(fn.calls) == 3
+    assert clock.sleeps == [0.5, 1.0]
+    assert policy.retries == 2
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_non_retryable_error_fails_immediately(clock):
+    policy = make_policy()
+    fn = failing([status_error(401)])
+    with pytest.raises(PlatformQueryError) as info:
+        await policy.call(fn)
+    assert info.value.attempts == 1
+    assert not info.value.retryable
+    assert clock.sleeps == []
+    assert policy.breaker.consecutive_failures == 0
+
+
+async def test_gives_up_after_max_attempts(clock):
+    policy = make_policy(max_attempts=2)
+    fn = failing([status_error(500)] * 5)
+    with pytest.raises(PlatformQueryError) as info:
+        await policy.call(fn)
+    assert info.value.attempts == 2
+    assert info.value.retryable
+    assert len(fn.calls) == 2
+
+
+async def test_retry_budget_exhaustion_stops_retries(clock):
+    policy = make_policy(max_attempts=10, tokens=1.0)
+    fn = failing([status_error(500)] * 5)
+    with pytest.raises(PlatformQueryError) as info:
+        await policy.call(fn)
+    # One token buys one retry
+    assert info.value.attempts == 2
+    assert policy.budget.exhausted == 1
+
+
+def test_retry_budget_deposits_are_capped():
+    budget = RetryBudget(ratio=0.5, min_tokens=0.0, max_tokens=1.0)
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    for _ in range(5):
+        budget.deposit()
+    assert budget.tokens == 1.0
+    assert budget.withdraw()
+    assert budget.exhausted == 2
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30.0
+
+    clock.now += 30.0
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial call at a time
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert breaker.times_opened == 1
+
+
+def test_failed_trial_reopens_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() == 10.0
+    assert breaker.times_opened == 2
+
+
+def test_released_trial_lets_next_call_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+async def test_open_circuit_fails_fast(clock):
+    policy = make_policy(max_attempts=1, threshold=1)
+    with pytest.raises(PlatformQueryError):
+        await policy.call(failing([status_error(503)]))
+
+    fn = failing([])
+    with pytest.raises(CircuitOpenError) as info:
+        await policy.call(fn)
+    assert info.value.circuit_open
+    assert fn.calls == []
+
+    clock.now += 30.0
+    assert await policy.call(fn) == "ok"
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_expired_deadline_is_not_a_provider_failure(clock):
+    policy = make_policy()
+    deadline = Deadline(1000)
+    deadline.expires_at = 0.0
+    with deadline_scope(deadline):
+        with pytest.raises(PlatformQueryError) as info:
+            await policy.call(failing([]))
+    assert isinstance(info.value.__cause__, DeadlineExceeded)
+    assert policy.breaker.consecutive_failures == 0
@@ -0,0 +1,26 @@
+import pytest
+
+from src.data.sampling import SequentialSampler, wilson_interval
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(0, 10)
+    assert low == pytest.approx(0.0) and 0.2 < high < 0.35
+    low, high = wilson_interval(5, 10)
+    assert low == pytest.approx(1 - high)
+
+
+def test_waves_cycle_pairs_and_flag_repeats():
+    sampler = SequentialSampler(["a", "b"], wave_size=3, max_calls=5, target_width=0.1)
+    assert sampler.next_wave() == [("a", False), ("b", False), ("a", True)]
+    assert sampler.next_wave() == [("b", True), ("a", True)]
+    assert sampler.next_wave() == []
+    assert sampler.exhausted()
+    assert sampler.waves == 2
+
+
+def test_convergence_uses_interval_width():
+    sampler = SequentialSampler(["a"], wave_size=1, max_calls=10, target_width=0.3)
+    assert not sampler.converged({"x.com": 2}, 4)
+    assert sampler.converged({"x.com": 20}, 40)
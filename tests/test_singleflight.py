@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from src.data.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from src.data.singleflight import SingleFlight
+
+
+def upstream(result="ok", error=None):
+    """Coroutine factory that blocks until `release` is set"""
+    state = {"calls": 0, "cancelled": False, "release": asyncio.Event()}
+
+    async def fn():
+        state["calls"] += 1
+        try:
+            await state["release"].wait()
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        if error is not None:
+            raise error
+        return result
+
+    return fn, state
+
+
+async def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    fn, state = upstream()
+    callers = [asyncio.create_task(flights.do("key", fn)) for _ in range(5)]
+    await asyncio.sleep(0)
+    state["release"].set()
+
+    assert await asyncio.gather(*callers) == ["ok"] * 5
+    assert state["calls"] == 1
+    assert flights.stats() == {"in_flight": 0, "upstream_calls": 1, "coalesced_calls": 4}
+
+
+async def test_different_keys_run_separately():
+    flights = SingleFlight()
+    fn, state = upstream()
+    callers = [asyncio.create_task(flights.do(key, fn)) for key in ("a", "b")]
+    await asyncio.sleep(0)
+    state["release"].set()
+    await asyncio.gather(*callers)
+    assert state["calls"] == 2
+
+
+async def test_finished_call_is_not_reused():
+    flights = SingleFlight()
+    fn, state = upstream()
+    state["release"].set()
+    await flights.do("key", fn)
+    await flights.do("key", fn)
+    assert state["calls"] == 2
+
+
+async def test_exception_reaches_every_waiter():
+    flights = SingleFlight()
+    fn, state = upstream(error=RuntimeError("upstream down"))
+    callers = [asyncio.create_task(flights.do("key", fn)) for _ in range(3)]
+    await asyncio.sleep(0)
+    state["release"].set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert state["calls"] == 1
+    assert flights.stats()["in_flight"] == 0
+
+
+async def test_cancelling_one_waiter_keeps_the_call_running():
+    flights = SingleFlight()
+    fn, state = upstream()
+    first = asyncio.create_task(flights.do("key", fn))
+    second = asyncio.create_task(flights.do("key", fn))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    state["release"].set()
+
+    assert await second == "ok"
+    assert not state["cancelled"]
+    assert state["calls"] == 1
+
+
+async def test_cancelling_all_waiters_cancels_the_call():
+    flights = SingleFlight()
+    fn, state = upstream()
+    callers = [asyncio.create_task(flights.do("key", fn)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert state["cancelled"]
+    assert flights.stats()["in_flight"] == 0
+
+    # A later caller starts a fresh upstream call
+    fresh = asyncio.create_task(flights.do("key", fn))
+    await asyncio.sleep(0)
+    state["release"].set()
+    assert await fresh == "ok"
+    assert state["calls"] == 2
+
+
+async def test_callers_with_different_deadlines():
+    flights = SingleFlight()
+    seen_deadlines = []
+    cancelled = []
+
+    async def fn():
+        seen_deadlines.append(current_deadline())
+        try:
+            await asyncio.sleep(0.15)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "ok"
+
+    async def caller(budget_ms):
+        with deadline_scope(Deadline(budget_ms) if budget_ms else None):
+            return await flights.do("key", fn)
+
+    # The short-deadline caller starts the flight; the other joins it
+    short = asyncio.create_task(caller(50))
+    await asyncio.sleep(0)
+    unbounded = asyncio.create_task(caller(None))
+
+    with pytest.raises(DeadlineExceeded):
+        await short
+    assert not unbounded.done()
+    assert await unbounded == "ok"
+
+    # The shared call ran without the first caller's deadline and was not cut short
+    assert seen_deadlines == [None]
+    assert not cancelled
+    assert flights.stats()["coalesced_calls"] == 1
+
+
+async def test_last_caller_past_its_deadline_cancels_the_call():
+    flights = SingleFlight()
+    fn, state = upstream()
+    with deadline_scope(Deadline(20)):
+        with pytest.raises(DeadlineExceeded):
+            await flights.do("key", fn)
+    await asyncio.sleep(0)
+    assert state["cancelled"]
+    assert flights.stats()["in_flight"] == 0